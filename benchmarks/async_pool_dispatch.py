@@ -0,0 +1,123 @@
+"""
+Micro-benchmark for AsyncPool job dispatch.
+
+Compares the current event-driven dispatcher with the previous one, where
+every idle worker polled the queue with ``asyncio.wait_for(..., timeout=0.1)``.
+
+Measures:
+- CPU time burned by an idle pool over a fixed wall-clock interval
+- submit-to-start latency of jobs submitted to an idle pool
+
+Usage:
+    python benchmarks/async_pool_dispatch.py [--pool-size N] [--idle SEC] [--jobs N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from octoscrape.concurrency import AsyncPool
+
+
+class PollingAsyncPool:
+    """Copy of the previous AsyncPool with polling workers, kept for comparison."""
+
+    def __init__(self, concurrency: int):
+        self._concurrency = concurrency
+        self._sem = asyncio.Semaphore(concurrency)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._stopped = True
+
+    async def __aenter__(self):
+        self._stopped = False
+        for _ in range(self._concurrency):
+            self._workers.append(asyncio.create_task(self._worker()))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.drain()
+        self._stopped = True
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        return False
+
+    async def submit(self, coro):
+        await self._queue.put(coro)
+
+    async def drain(self):
+        await self._queue.join()
+
+    async def _worker(self):
+        try:
+            while not self._stopped:
+                try:
+                    coro = await asyncio.wait_for(self._queue.get(), timeout=0.1)
+                except asyncio.TimeoutError:
+                    continue
+
+                async with self._sem:
+                    try:
+                        await asyncio.create_task(coro)
+                    finally:
+                        self._queue.task_done()
+        except asyncio.CancelledError:
+            pass
+
+
+async def idle_cpu(pool_cls: type, pool_size: int, idle: float) -> float:
+    """CPU seconds consumed by an idle pool during `idle` wall seconds."""
+
+    async with pool_cls(pool_size):
+        await asyncio.sleep(0.2)  # let workers settle
+        started = time.process_time()
+        await asyncio.sleep(idle)
+        return time.process_time() - started
+
+
+async def submit_latency(pool_cls: type, pool_size: int, jobs: int) -> list[float]:
+    """Submit-to-start latency (seconds) for jobs trickled into an idle pool."""
+
+    loop = asyncio.get_running_loop()
+    latencies: list[float] = []
+
+    async def job(submitted: float):
+        latencies.append(loop.time() - submitted)
+
+    async with pool_cls(pool_size) as pool:
+        for _ in range(jobs):
+            await pool.submit(job(loop.time()))
+            await asyncio.sleep(0.001)
+        await pool.drain()
+
+    return latencies
+
+
+def report(name: str, cpu: float, idle: float, latencies: list[float]):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<10} idle cpu: {cpu / idle * 100:6.2f}%  "
+        f"latency mean: {statistics.mean(latencies) * 1e6:8.1f}us  "
+        f"p99: {p99 * 1e6:8.1f}us"
+    )
+
+
+async def main(pool_size: int, idle: float, jobs: int):
+    print(f"pool_size={pool_size} idle={idle}s jobs={jobs}")
+    for name, cls in (("polling", PollingAsyncPool), ("event", AsyncPool)):
+        cpu = await idle_cpu(cls, pool_size, idle)
+        latencies = await submit_latency(cls, pool_size, jobs)
+        report(name, cpu, idle, latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool-size", type=int, default=200)
+    parser.add_argument("--idle", type=float, default=2.0)
+    parser.add_argument("--jobs", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pool_size, args.idle, args.jobs))
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for the import time of the octoscrape packages.
+
+Each import runs in a fresh interpreter, in a directory without config.yaml,
+so nothing is cached between runs and no configuration can be loaded.
+The "eager" row touches the browser managers after the import, which loads
+what importing the package used to load.
+
+Measures:
+- wall time of ``python -c "import ..."``, minus an empty interpreter start
+- the browser, HTTP and YAML libraries each import pulls in
+
+Usage:
+    python benchmarks/import_time.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("playwright", "camoufox", "browserforge", "yaml", "httpx")
+
+CASES = {
+    "config": "import octoscrape.config",
+    "browser_manager": "import octoscrape.browser_manager",
+    "scraper": "import octoscrape.scraper",
+    "shell": "import octoscrape.shell",
+    "eager": (
+        "import octoscrape.browser_manager as bm; "
+        "bm.CamoufoxBrowserManager; bm.PlaywrightBrowserManager"
+    ),
+}
+
+REPORT = (
+    "; import sys, json; "
+    f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+)
+
+
+def run(code: str, cwd: str) -> tuple[float, list[str]]:
+    """Wall time of running `code` in a fresh interpreter, and heavy modules."""
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code + REPORT],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        return elapsed, ["<failed: " + result.stderr.strip().splitlines()[-1] + ">"]
+    return elapsed, json.loads(result.stdout)
+
+
+def measure(code: str, runs: int, cwd: str) -> tuple[float, list[str]]:
+    times = []
+    for _ in range(runs):
+        elapsed, loaded = run(code, cwd)
+        times.append(elapsed)
+    return statistics.median(times), loaded
+
+
+def main(runs: int):
+    print(f"runs={runs} python={sys.version.split()[0]}")
+    with tempfile.TemporaryDirectory() as cwd:
+        baseline, _ = measure("pass", runs, cwd)
+        for name, code in CASES.items():
+            elapsed, loaded = measure(code, runs, cwd)
+            print(
+                f"{name:<16} {(elapsed - baseline) * 1e3:8.1f}ms  "
+                f"loads: {', '.join(loaded) or '-'}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    main(args.runs)
@@ -1,15 +1,83 @@
-from .camoufox import CamoufoxBrowserManager
+import importlib
+
 from .interface import IBrowserManager
-from .playwright import PlaywrightBrowserManager
 
-camoufox_manager = CamoufoxBrowserManager()
-playwright_manager = PlaywrightBrowserManager()
+# attributes loaded on first access, so importing the package does not pull in
+# the browser libraries
+_LAZY = {
+    "CamoufoxBrowserManager": ".camoufox",
+    "launch_camoufox": ".camoufox",
+    "PlaywrightBrowserManager": ".playwright",
+    "launch_firefox": ".playwright",
+    "launch_playwright": ".playwright",
+    "launch_browser": ".playwright",
+    "BrowserEngine": ".engines",
+    "EnginePools": ".engines",
+    "get_engine": ".engines",
+    "register_engine": ".engines",
+    "BrowserPool": ".pool",
+    "BrowserHealth": ".health",
+    "BrowserSupervisor": ".health",
+    "HealthLimits": ".health",
+    "BrowserServer": ".server",
+    "FingerprintCache": ".fingerprints",
+    "FingerprintStats": ".fingerprints",
+    "StorageStateStore": ".storage_state",
+    "storage_state_for": ".storage_state",
+    "ContextPool": ".context_pool",
+    "ContextPoolStats": ".context_pool",
+    "PagePool": ".page_pool",
+    "PagePoolStats": ".page_pool",
+}
+
+# singleton managers, created on first access
+_MANAGERS = {
+    "camoufox_manager": "CamoufoxBrowserManager",
+    "playwright_manager": "PlaywrightBrowserManager",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    elif name in _MANAGERS:
+        value = __getattr__(_MANAGERS[name])()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 
 __all__ = [
     "IBrowserManager",
     "CamoufoxBrowserManager",
     "PlaywrightBrowserManager",
+    "BrowserPool",
+    "BrowserEngine",
+    "EnginePools",
+    "BrowserHealth",
+    "BrowserSupervisor",
+    "HealthLimits",
+    "BrowserServer",
+    "FingerprintCache",
+    "FingerprintStats",
+    "StorageStateStore",
+    "ContextPool",
+    "ContextPoolStats",
+    "PagePool",
+    "PagePoolStats",
+    "launch_camoufox",
+    "launch_firefox",
+    "launch_playwright",
+    "launch_browser",
+    "get_engine",
+    "register_engine",
+    "storage_state_for",
     "camoufox_manager",
     "playwright_manager"
-]
\ No newline at end of file
+]
@@ -1,12 +1,58 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator
 
 from browserforge.fingerprints import Screen
 from camoufox.async_api import AsyncCamoufox, Browser
 
-from ..config import common_config
+from .. import config
+from .fingerprints import shared_fingerprints
+from .health import BrowserHealth, BrowserSupervisor, HealthLimits
 from .interface import IBrowserManager
+from .playwright import FIREFOX_PREFS
+from .server import connect_server
+
+
+def camoufox_options() -> dict[str, Any]:
+    """
+    Camoufox launch options from the common config.
+
+    The fingerprint comes from the shared fingerprint cache, when enabled.
+    """
+
+    fingerprints = shared_fingerprints()
+    return {
+        "headless": config.common_config.headless,
+        "os": ["windows", "linux", "macos"],
+        "screen": Screen(
+            max_width=config.common_config.max_window_width,
+            max_height=config.common_config.max_window_height,
+        ),
+        "fingerprint": None if fingerprints is None else fingerprints.take(),
+        "firefox_user_prefs": dict(FIREFOX_PREFS),
+    }
+
+
+@asynccontextmanager
+async def launch_camoufox(**options) -> AsyncIterator[Browser]:
+    """
+    Launch a Camoufox browser configured by the common config.
+
+    With `browser_server`, connects to the Camoufox server shared by the
+    processes of the host instead (see BrowserServer).
+
+    Args:
+        options: Launch options; defaults to camoufox_options().
+    """
+
+    if config.common_config.browser_server:
+        async with connect_server("camoufox") as browser:
+            yield browser
+        return
+
+    async with AsyncCamoufox(**(options or camoufox_options())) as browser:
+        yield browser
 
 
 class CamoufoxBrowserManager(IBrowserManager):
@@ -17,6 +63,10 @@ class CamoufoxBrowserManager(IBrowserManager):
     - ensuring only one browser instance exists at a time
     - managing browser creation and cleanup via async context manager
     - providing safe access to the active browser instance
+    - recycling the browser past the health limits of the common config, and
+      replacing it after a crash (see BrowserSupervisor)
+    - with `browser_idle_timeout`, launching the browser on the first lease
+      and closing it once idle
     """
 
     __instance: CamoufoxBrowserManager | None = None
@@ -25,33 +75,78 @@ class CamoufoxBrowserManager(IBrowserManager):
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
             cls.__instance.__browser = None
+            cls.__instance.__supervisor = None
         return cls.__instance
 
     @asynccontextmanager
     async def create_browser(self):
-        if self.initialized:
+        if self.initialized or self.__supervisor is not None:
             raise RuntimeError("The browser already exists")
 
-        async with AsyncCamoufox(
-            headless=common_config.headless,
-            os=["windows", "linux", "macos"],
-            screen=Screen(
-                max_width=common_config.max_window_width,
-                max_height=common_config.max_window_height,
-            ),
-        ) as browser:
-            self.__browser = browser
+        supervisor = BrowserSupervisor(
+            launch_camoufox,
+            HealthLimits.from_config(config.common_config),
+            on_swap=self.__swapped,
+            idle_timeout=config.common_config.browser_idle_timeout,
+        )
+        async with supervisor.run():
+            self.__supervisor = supervisor
             try:
                 yield
             finally:
+                self.__supervisor = None
                 self.__browser = None
 
     @property
     def browser(self) -> Browser:
+        """
+        The current browser.
+
+        With `browser_idle_timeout`, no browser runs before the first lease()
+        or after an idle shutdown, and this raises; use lease() instead.
+
+        Raises:
+            RuntimeError: If no browser runs.
+        """
+
         if not self.initialized:
+            if self.__supervisor is not None:
+                raise RuntimeError(
+                    "Camoufox browser is idle, lease() launches it "
+                    "(browser_idle_timeout)."
+                )
             raise RuntimeError("Camoufox browser has not been created yet.")
         return self.__browser
 
     @property
     def initialized(self) -> bool:
         return self.__browser is not None
+
+    def health(self) -> BrowserHealth:
+        """
+        Snapshot of the pages, uptime and memory of the current browser.
+
+        Raises:
+            RuntimeError: If the browser has not been created yet.
+        """
+        return self.__running().health()
+
+    def lease(self) -> AsyncContextManager[Browser]:
+        """
+        Borrow the browser; a recycled browser is closed after its leases.
+
+        With `browser_idle_timeout`, launches the browser if it is not running.
+        """
+        return self.__running().lease()
+
+    async def recycle(self):
+        """Replace the browser with a fresh one, draining the current one."""
+        await self.__running().recycle()
+
+    def __running(self) -> BrowserSupervisor:
+        if self.__supervisor is None:
+            raise RuntimeError("Camoufox browser has not been created yet.")
+        return self.__supervisor
+
+    def __swapped(self, browser: Browser | None):
+        self.__browser = browser
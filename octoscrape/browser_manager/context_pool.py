@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, NamedTuple
+from urllib.parse import urlsplit
+
+from ..routing import Router
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Frame, Page, Route
+
+logger = logging.getLogger(__name__)
+
+# clears the storage of the page origin and restores its initial localStorage;
+# pages without storage access (about:blank, sandboxed frames) are skipped
+_RESET_STORAGE = """items => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+        for (const { name, value } of items) localStorage.setItem(name, value);
+    } catch (e) {}
+}"""
+
+
+class ContextPoolStats(NamedTuple):
+    """Point-in-time snapshot of ContextPool counters."""
+
+    created: int
+    reused: int
+    retired: int
+    idle: int
+
+
+class _PooledContext:
+    """A browser context of the pool with its usage bookkeeping."""
+
+    __slots__ = ("browser", "context", "key", "state", "uses", "created", "origins")
+
+    def __init__(
+        self,
+        browser: Browser,
+        context: BrowserContext,
+        key: tuple,
+        state: dict[str, Any] | None,
+        created: float,
+    ):
+        self.browser = browser
+        self.context = context
+        self.key = key
+        self.state = state
+        self.uses = 0
+        self.created = created
+        # origins the frames of the context navigated to during the lease
+        self.origins: set[str] = set()
+
+    def watch(self, page: Page):
+        """Record the origins the frames of a page navigate to."""
+        page.on("framenavigated", self.__navigated)
+
+    def __navigated(self, frame: Frame):
+        origin = _origin(frame.url)
+        if origin is not None:
+            self.origins.add(origin)
+
+
+def _load_state(storage_state: str | Path | dict | None) -> dict[str, Any] | None:
+    if storage_state is None or isinstance(storage_state, dict):
+        return storage_state
+    with open(storage_state, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _origin(url: str) -> str | None:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+async def _blank(route: Route):
+    await route.fulfill(status=200, content_type="text/html", body="")
+
+
+def _freeze(value: Any) -> str | None:
+    return None if value is None else json.dumps(value, sort_keys=True)
+
+
+class ContextPool:
+    """
+    Pool of warm browser contexts.
+
+    Contexts are pooled per browser and per (viewport, proxy, storage state,
+    router), so a leased context always has the settings it was asked for. On release
+    the pages of the context are closed and, unless `reset_storage` is False,
+    its cookies, permissions and the localStorage of the origins it visited are
+    reset to the initial storage state. Contexts that reached `max_uses` or
+    `max_age` are retired, as are contexts whose block raised an exception.
+
+    Args:
+        max_uses (int | None): Leases after which a context is retired.
+            None means unlimited.
+        max_age (float | None): Seconds after which a context is retired.
+            None means unlimited.
+        max_idle (int): Idle contexts kept per settings; extra ones are closed.
+        reset_storage (bool): Reset cookies, permissions and localStorage
+            between leases. False keeps them, e.g. to stay logged in.
+
+    Example:
+        pool = ContextPool(max_uses=50)
+        async with pool.context(browser, proxy=proxy) as context:
+            page = await context.new_page()
+    """
+
+    def __init__(
+        self,
+        max_uses: int | None = 100,
+        max_age: float | None = 600.0,
+        max_idle: int = 4,
+        reset_storage: bool = True,
+    ):
+        if max_uses is not None and max_uses < 1:
+            raise ValueError("max_uses must be at least 1.")
+
+        self.__max_uses = max_uses
+        self.__max_age = max_age
+        self.__max_idle = max_idle
+        self.__reset_storage = reset_storage
+        self.__idle: dict[tuple, deque[_PooledContext]] = {}
+        self.__closing: set[asyncio.Task] = set()
+
+        self.__created = 0
+        self.__reused = 0
+        self.__retired = 0
+
+    def stats(self) -> ContextPoolStats:
+        return ContextPoolStats(
+            created=self.__created,
+            reused=self.__reused,
+            retired=self.__retired,
+            idle=sum(len(idle) for idle in self.__idle.values()),
+        )
+
+    @asynccontextmanager
+    async def context(
+        self,
+        browser: Browser,
+        viewport: dict[str, int] | None = None,
+        proxy: dict[str, str] | None = None,
+        storage_state: str | Path | dict | None = None,
+        router: Router | None = None,
+    ) -> AsyncIterator[BrowserContext]:
+        """
+        Lease a context with the given settings, creating it if none is idle.
+
+        Args:
+            browser: Browser the context belongs to.
+            viewport, proxy, storage_state: Passed to Browser.new_context().
+            router: Router installed on the context when it is created.
+        """
+
+        state = _load_state(storage_state)
+        key = (
+            id(browser),
+            _freeze(viewport),
+            _freeze(proxy),
+            _freeze(state),
+            id(router),
+        )
+
+        pooled = await self.__take(key, browser)
+        if pooled is None:
+            context = await browser.new_context(
+                viewport=viewport, proxy=proxy, storage_state=state
+            )
+            if router is not None:
+                await router.install(context)
+            loop = asyncio.get_running_loop()
+            pooled = _PooledContext(browser, context, key, state, loop.time())
+            context.on("page", pooled.watch)
+            self.__created += 1
+        else:
+            self.__reused += 1
+        pooled.uses += 1
+
+        try:
+            yield pooled.context
+        except BaseException:
+            # the context may be in any state, and awaiting here could be cut
+            # short by a cancellation, so close it in the background
+            task = asyncio.get_running_loop().create_task(self.__retire(pooled))
+            self.__closing.add(task)
+            task.add_done_callback(self.__closing.discard)
+            raise
+        await self.__release(pooled, browser)
+
+    async def close(self):
+        """Close all idle contexts."""
+
+        idle, self.__idle = self.__idle, {}
+        for contexts in idle.values():
+            for pooled in contexts:
+                await self.__retire(pooled)
+        await asyncio.gather(*self.__closing, return_exceptions=True)
+
+    async def __take(self, key: tuple, browser: Browser) -> _PooledContext | None:
+        idle = self.__idle.get(key, None)
+        while idle:
+            pooled = idle.pop()  # the most recently used one is the warmest
+            if self.__reusable(pooled, browser):
+                return pooled
+            await self.__retire(pooled)
+        return None
+
+    def __reusable(self, pooled: _PooledContext, browser: Browser) -> bool:
+        # ids of closed browsers can be reused, compare the objects too
+        if pooled.browser is not browser or not browser.is_connected():
+            return False
+        if self.__max_uses is not None and pooled.uses >= self.__max_uses:
+            return False
+        age = asyncio.get_running_loop().time() - pooled.created
+        return self.__max_age is None or age < self.__max_age
+
+    async def __release(self, pooled: _PooledContext, browser: Browser):
+        await self.__sweep()
+        idle = self.__idle.setdefault(pooled.key, deque())
+        if self.__reusable(pooled, browser) and len(idle) < self.__max_idle:
+            try:
+                await self.__reset(pooled)
+                idle.append(pooled)
+                return
+            except Exception:
+                logger.warning("Failed to reset a pooled context", exc_info=True)
+        await self.__retire(pooled)
+
+    async def __sweep(self):
+        """
+        Retire the expired idle contexts of all settings.
+
+        Settings that are not asked for anymore, e.g. a storage state that was
+        refreshed since, would otherwise keep their idle contexts open.
+        """
+
+        for key, idle in list(self.__idle.items()):
+            # the oldest contexts are on the left
+            while idle and not self.__reusable(idle[0], idle[0].browser):
+                await self.__retire(idle.popleft())
+            if not idle and self.__idle.get(key, None) is idle:
+                del self.__idle[key]
+
+    async def __reset(self, pooled: _PooledContext):
+        """Bring a context back to its initial state."""
+
+        context = pooled.context
+        if self.__reset_storage:
+            await context.clear_cookies()
+            await context.clear_permissions()
+            state = pooled.state or {}
+            if state.get("cookies"):
+                await context.add_cookies(state["cookies"])
+            await self.__reset_origins(pooled)
+        pooled.origins.clear()
+
+        for page in list(context.pages):
+            await page.close()
+
+    async def __reset_origins(self, pooled: _PooledContext):
+        """
+        Reset the localStorage of the visited origins, from the pages still on
+        them or else from a page that loads them blank.
+        """
+
+        if not pooled.origins:
+            return
+
+        initial = {
+            o["origin"]: o.get("localStorage", [])
+            for o in (pooled.state or {}).get("origins", [])
+        }
+        origins = set(pooled.origins)
+        for page in pooled.context.pages:
+            origin = _origin(page.url)
+            if origin in origins:
+                await page.evaluate(_RESET_STORAGE, initial.get(origin, []))
+                origins.discard(origin)
+        if not origins:
+            return
+
+        page = await pooled.context.new_page()
+        await page.route("**/*", _blank)
+        for origin in sorted(origins):
+            await page.goto(origin)
+            await page.evaluate(_RESET_STORAGE, initial.get(origin, []))
+
+    async def __retire(self, pooled: _PooledContext):
+        self.__retired += 1
+        try:
+            await pooled.context.close()
+        except Exception:
+            logger.warning("Failed to close a pooled context", exc_info=True)
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncContextManager, AsyncIterator, Callable
+
+from .. import config
+from .health import HealthLimits
+from .pool import BrowserPool
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser
+
+logger = logging.getLogger(__name__)
+
+
+def _merge(defaults: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    """Merge launch options; nested dicts are merged and lists extended."""
+
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        default = merged.get(key, None)
+        if isinstance(default, dict) and isinstance(value, dict):
+            merged[key] = _merge(default, value)
+        elif isinstance(default, list) and isinstance(value, list):
+            merged[key] = default + value
+        else:
+            merged[key] = value
+    return merged
+
+
+class BrowserEngine:
+    """
+    A browser engine scrapers can run on, with its launch options.
+
+    The default options of the engines are tuned for scraping (see
+    FIREFOX_PREFS and CHROMIUM_ARGS). The `browser_engines` section of the
+    common config adds to them per engine, e.g. {"chromium": {"channel":
+    "chromium"}}; lists of flags are extended and preferences merged.
+
+    Args:
+        name (str): Name of the engine in the `browser` setting of a scraper.
+        launcher (Callable[..., AsyncContextManager[Browser]]): Launches a
+            browser of the engine with the given options.
+        options (Callable[[], dict]): Default launch options, built at every
+            launch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        launcher: Callable[..., AsyncContextManager[Browser]],
+        options: Callable[[], dict[str, Any]],
+    ):
+        self.__name = name
+        self.__launcher = launcher
+        self.__options = options
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def options(self) -> dict[str, Any]:
+        """Launch options: the defaults with the common config on top."""
+
+        overrides = config.common_config.browser_engines.get(self.__name, {})
+        return _merge(self.__options(), overrides)
+
+    def launch(self) -> AsyncContextManager[Browser]:
+        """Launch a browser of the engine; usable as a BrowserPool launcher."""
+        return self.__launcher(**self.options())
+
+
+def _lazy(module: str, name: str) -> Callable:
+    """Function of a submodule, imported when called."""
+
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module, __package__), name)(
+            *args, **kwargs
+        )
+
+    return call
+
+
+_engines: dict[str, BrowserEngine] = {}
+
+
+def register_engine(engine: BrowserEngine):
+    """Add an engine to the registry, replacing one of the same name."""
+    _engines[engine.name] = engine
+
+
+def get_engine(name: str) -> BrowserEngine:
+    """
+    Return a registered engine.
+
+    Raises:
+        ValueError: If no engine has that name.
+    """
+
+    try:
+        return _engines[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown browser engine {name!r}, expected one of {sorted(_engines)}"
+        ) from None
+
+
+register_engine(
+    BrowserEngine(
+        "firefox",
+        _lazy(".playwright", "launch_firefox"),
+        _lazy(".playwright", "firefox_options"),
+    )
+)
+register_engine(
+    BrowserEngine(
+        "chromium",
+        partial(_lazy(".playwright", "launch_browser"), "chromium"),
+        _lazy(".playwright", "chromium_options"),
+    )
+)
+register_engine(
+    BrowserEngine(
+        "webkit",
+        partial(_lazy(".playwright", "launch_browser"), "webkit"),
+        _lazy(".playwright", "webkit_options"),
+    )
+)
+register_engine(
+    BrowserEngine(
+        "camoufox",
+        _lazy(".camoufox", "launch_camoufox"),
+        _lazy(".camoufox", "camoufox_options"),
+    )
+)
+
+
+class EnginePools:
+    """
+    One BrowserPool per browser engine, each launched on first use.
+
+    Scrapers on different engines share the process without launching
+    browsers they do not use. Every browser runs under a BrowserSupervisor
+    with the health limits of the common config, so it is recycled past them
+    and relaunched after a crash.
+
+    With `idle_timeout`, the pool of an engine is closed once it has had no
+    lease for that many seconds, and launched again by the next lease.
+
+    Args:
+        size (int): Browsers per engine.
+        max_contexts (int | None): Leases allowed per browser at the same time.
+            None means unlimited.
+        idle_timeout (float | None): Seconds without a lease after which the
+            pool of an engine is closed. None keeps it until close().
+
+    Example:
+        pools = EnginePools(size=2)
+        async with pools.lease("chromium") as browser:
+            context = await browser.new_context()
+        await pools.close()
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_contexts: int | None = None,
+        idle_timeout: float | None = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+
+        self.__size = size
+        self.__max_contexts = max_contexts
+        self.__idle_timeout = idle_timeout
+        self.__pools: dict[str, BrowserPool] = {}
+        self.__stacks: dict[str, AsyncExitStack] = {}
+        self.__locks: dict[str, asyncio.Lock] = {}
+        self.__leases: dict[str, int] = {}
+        self.__idle: dict[str, asyncio.Task] = {}
+
+    @property
+    def engines(self) -> list[str]:
+        """Names of the engines launched so far."""
+        return list(self.__pools)
+
+    @asynccontextmanager
+    async def lease(self, engine: str) -> AsyncIterator[Browser]:
+        """
+        Borrow a browser of an engine, launching its pool if needed.
+
+        Raises:
+            ValueError: If the engine is not registered.
+        """
+
+        idle = self.__idle.pop(engine, None)
+        if idle is not None:
+            idle.cancel()
+        self.__leases[engine] = self.__leases.get(engine, 0) + 1
+        try:
+            pool = await self.pool(engine)
+            async with pool.lease() as browser:
+                yield browser
+        finally:
+            self.__leases[engine] -= 1
+            if not self.__leases[engine]:
+                del self.__leases[engine]
+                if self.__idle_timeout is not None and engine in self.__pools:
+                    task = asyncio.get_running_loop().create_task(
+                        self.__close_idle(engine)
+                    )
+                    self.__idle[engine] = task
+
+    async def pool(self, engine: str) -> BrowserPool:
+        """Return the started pool of an engine, launching it if needed."""
+
+        pool = self.__pools.get(engine, None)
+        if pool is not None:
+            return pool
+
+        launcher = get_engine(engine).launch
+        async with self.__locks.setdefault(engine, asyncio.Lock()):
+            if engine in self.__pools:
+                return self.__pools[engine]
+
+            pool = BrowserPool(
+                launcher,
+                self.__size,
+                self.__max_contexts,
+                HealthLimits.from_config(config.common_config),
+            )
+            stack = AsyncExitStack()
+            await stack.enter_async_context(pool.create_browser())
+            logger.info(f"Launched the {engine} browser pool")
+            self.__stacks[engine] = stack
+            self.__pools[engine] = pool
+            return pool
+
+    async def close(self):
+        """Close the browsers of all engines; the pools can be launched again."""
+
+        idle, self.__idle = self.__idle, {}
+        for task in idle.values():
+            task.cancel()
+        await asyncio.gather(*idle.values(), return_exceptions=True)
+
+        stacks, self.__stacks = self.__stacks, {}
+        self.__pools = {}
+        self.__locks = {}
+        for engine, stack in stacks.items():
+            await self.__close_stack(engine, stack)
+
+    async def __close_idle(self, engine: str):
+        await asyncio.sleep(self.__idle_timeout)
+        if self.__leases.get(engine, 0) or engine not in self.__pools:
+            return
+
+        # from here on a new lease launches a new pool instead of cancelling
+        self.__idle.pop(engine, None)
+        del self.__pools[engine]
+        stack = self.__stacks.pop(engine)
+        logger.info(
+            f"Closing the {engine} browser pool after {self.__idle_timeout:.0f}s idle"
+        )
+        await self.__close_stack(engine, stack)
+
+    async def __close_stack(self, engine: str, stack: AsyncExitStack):
+        try:
+            await stack.aclose()
+        except Exception:
+            logger.warning(f"Error while closing the {engine} pool", exc_info=True)
+
+
+_shared_pools: EnginePools | None = None
+
+
+def shared_engine_pools() -> EnginePools:
+    """Return the process-wide engine pools configured by the common config."""
+
+    global _shared_pools
+    if _shared_pools is None:
+        common = config.common_config
+        _shared_pools = EnginePools(
+            common.browsers_per_engine,
+            common.browser_max_contexts,
+            common.browser_idle_timeout,
+        )
+    return _shared_pools
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, NamedTuple
+
+from .. import config
+
+if TYPE_CHECKING:
+    from browserforge.fingerprints import Fingerprint, Screen
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OS = ("windows", "linux", "macos")
+
+
+class FingerprintStats(NamedTuple):
+    """Point-in-time snapshot of FingerprintCache counters."""
+
+    hits: int
+    misses: int
+    generated: int
+    retired: int
+    ready: int
+
+
+class _Entry:
+    """A stored fingerprint with its rotation bookkeeping."""
+
+    __slots__ = ("data", "uses", "created")
+
+    def __init__(self, data: dict[str, Any], uses: int, created: float):
+        self.data = data
+        self.uses = uses
+        self.created = created
+
+
+def generate_fingerprint(
+    systems: Iterable[str] = DEFAULT_OS, screen: Screen | None = None
+) -> Fingerprint:
+    """Generate a Firefox fingerprint, as Camoufox does when given none."""
+
+    from browserforge.fingerprints import FingerprintGenerator
+
+    generator = FingerprintGenerator(browser="firefox", os=tuple(systems))
+    return generator.generate(screen=screen)
+
+
+def _dump(fingerprint: Fingerprint) -> dict[str, Any]:
+    return dataclasses.asdict(fingerprint)
+
+
+def _load(data: dict[str, Any]) -> Fingerprint:
+    from browserforge.fingerprints import (
+        Fingerprint,
+        NavigatorFingerprint,
+        ScreenFingerprint,
+        VideoCard,
+    )
+
+    video_card = data.get("videoCard", None)
+    return Fingerprint(
+        **{
+            **data,
+            "screen": ScreenFingerprint(**data["screen"]),
+            "navigator": NavigatorFingerprint(**data["navigator"]),
+            "videoCard": VideoCard(**video_card) if video_card else None,
+        }
+    )
+
+
+class FingerprintCache:
+    """
+    Set of pre-generated browser fingerprints, rotated and persisted to disk.
+
+    A background thread keeps `size` fingerprints ready, so take() returns one
+    without generating it. Fingerprints are handed out in turn; one is retired
+    after `max_uses` launches or `max_age` seconds and a fresh one takes its
+    place. The set is saved to `path` by the same thread and reloaded on the
+    next start, so a restarted process reuses it.
+
+    Args:
+        path (str | Path | None): JSON file of the set; None keeps it in memory.
+        size (int): Number of fingerprints kept ready.
+        max_uses (int): Launches a fingerprint is used for before it is retired.
+        max_age (float): Seconds a fingerprint is used for before it is retired.
+        generate (Callable[[], Fingerprint] | None): Generates a fingerprint.
+            Defaults to generate_fingerprint() with the default constraints.
+
+    Example:
+        fingerprints = FingerprintCache(".cache/fingerprints.json", size=8)
+        fingerprints.start()
+        async with AsyncCamoufox(fingerprint=fingerprints.take()) as browser:
+            ...
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        size: int = 8,
+        max_uses: int = 20,
+        max_age: float = 86400.0,
+        generate: Callable[[], Fingerprint] | None = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        if max_uses < 1:
+            raise ValueError("max_uses must be at least 1.")
+
+        self.__path = None if path is None else Path(path)
+        self.__size = size
+        self.__max_uses = max_uses
+        self.__max_age = max_age
+        self.__generate = generate or generate_fingerprint
+
+        self.__lock = threading.Condition()
+        self.__entries: deque[_Entry] = deque(self.__read())
+        self.__dirty = False
+        self.__closed = False
+        self.__thread: threading.Thread | None = None
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__generated = 0
+        self.__retired = 0
+
+    def start(self):
+        """Start filling the set in the background; no-op if started."""
+
+        with self.__lock:
+            if self.__thread is not None:
+                return
+            self.__closed = False
+            self.__thread = threading.Thread(
+                target=self.__fill, name="fingerprint-cache", daemon=True
+            )
+            self.__thread.start()
+
+    def close(self):
+        """Stop the background thread and save the set."""
+
+        with self.__lock:
+            thread, self.__thread = self.__thread, None
+            self.__closed = True
+            self.__lock.notify_all()
+        if thread is not None:
+            thread.join()
+        self.__save()
+
+    def take(self) -> Fingerprint:
+        """
+        Return the next fingerprint of the set.
+
+        Generates one on the spot only when none is ready, e.g. right after the
+        first start with an empty set.
+        """
+
+        with self.__lock:
+            entry = self.__next()
+            if entry is not None:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+            self.__dirty = True
+            self.__lock.notify_all()
+
+        if entry is not None:
+            return _load(entry.data)
+
+        fingerprint = self.__generate()
+        entry = _Entry(_dump(fingerprint), 1, time.time())
+        with self.__lock:
+            self.__generated += 1
+            if entry.uses < self.__max_uses and len(self.__entries) < self.__size:
+                self.__entries.append(entry)
+        return fingerprint
+
+    def stats(self) -> FingerprintStats:
+        with self.__lock:
+            return FingerprintStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                generated=self.__generated,
+                retired=self.__retired,
+                ready=len(self.__entries),
+            )
+
+    def __expired(self, entry: _Entry) -> bool:
+        return (
+            entry.uses >= self.__max_uses
+            or time.time() - entry.created >= self.__max_age
+        )
+
+    def __next(self) -> _Entry | None:
+        """Rotate the set and return the entry to use. Call with the lock held."""
+
+        while self.__entries:
+            entry = self.__entries.popleft()
+            if self.__expired(entry):
+                self.__retired += 1
+                continue
+
+            entry.uses += 1
+            if self.__expired(entry):
+                self.__retired += 1
+            else:
+                self.__entries.append(entry)
+            return entry
+        return None
+
+    def __fill(self):
+        while True:
+            with self.__lock:
+                self.__lock.wait_for(
+                    lambda: self.__closed
+                    or self.__dirty
+                    or len(self.__entries) < self.__size
+                )
+                if self.__closed:
+                    return
+                missing = len(self.__entries) < self.__size
+                self.__dirty = False
+
+            if missing:
+                try:
+                    data = _dump(self.__generate())
+                except Exception:
+                    logger.error("Failed to generate a fingerprint", exc_info=True)
+                    time.sleep(1.0)
+                    continue
+                with self.__lock:
+                    self.__entries.append(_Entry(data, 0, time.time()))
+                    self.__generated += 1
+            self.__save()
+
+    def __read(self) -> list[_Entry]:
+        if self.__path is None or not self.__path.exists():
+            return []
+        try:
+            with open(self.__path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            entries = [_Entry(e["data"], e["uses"], e["created"]) for e in stored]
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable fingerprints {self.__path}")
+            return []
+        return [e for e in entries if not self.__expired(e)][: self.__size]
+
+    def __save(self):
+        if self.__path is None:
+            return
+        with self.__lock:
+            stored = [
+                {"data": e.data, "uses": e.uses, "created": e.created}
+                for e in self.__entries
+            ]
+
+        try:
+            self.__path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.__path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            os.replace(tmp, self.__path)
+        except OSError:
+            logger.warning(f"Failed to save fingerprints {self.__path}", exc_info=True)
+
+
+_shared_fingerprints: FingerprintCache | None = None
+
+
+def shared_fingerprints() -> FingerprintCache | None:
+    """
+    Return the process-wide fingerprint cache configured by the common config.
+
+    Returns:
+        The started cache, or None if `fingerprints_size` is 0.
+    """
+
+    global _shared_fingerprints
+    common = config.common_config
+    if _shared_fingerprints is None and common.fingerprints_size > 0:
+        from browserforge.fingerprints import Screen
+
+        screen = Screen(
+            max_width=common.max_window_width, max_height=common.max_window_height
+        )
+        _shared_fingerprints = FingerprintCache(
+            common.fingerprints_path,
+            size=common.fingerprints_size,
+            max_uses=common.fingerprints_max_uses,
+            max_age=common.fingerprints_max_age,
+            generate=lambda: generate_fingerprint(screen=screen),
+        )
+        _shared_fingerprints.start()
+    return _shared_fingerprints
@@ -0,0 +1,504 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from typing import (
+    TYPE_CHECKING,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    NamedTuple,
+)
+
+from ..config import CommonConfig
+
+try:
+    import psutil
+except ImportError:  # optional dependency, see the "monitor" extra
+    psutil = None
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# seconds between two checks of a draining browser
+_DRAIN_POLL = 0.1
+
+
+class BrowserHealth(NamedTuple):
+    """
+    Point-in-time snapshot of the browser run by a BrowserSupervisor.
+
+    `rss` is the memory of the browser processes in bytes, None when psutil is
+    not installed. `recycles` and `crashes` count since the supervisor started.
+    """
+
+    pages: int
+    uptime: float
+    rss: int | None
+    leases: int
+    connected: bool
+    recycles: int
+    crashes: int
+
+
+class HealthLimits:
+    """
+    Thresholds past which a browser is recycled. None disables a threshold.
+
+    Args:
+        max_pages (int | None): Pages opened in the browser.
+        max_uptime (float | None): Seconds since the browser was launched.
+        max_rss (int | None): Memory of the browser processes, in bytes.
+        interval (float): Seconds between two checks.
+        drain_timeout (float): Seconds a retired browser gets to finish its
+            leases and close its pages before it is closed anyway.
+    """
+
+    def __init__(
+        self,
+        max_pages: int | None = None,
+        max_uptime: float | None = None,
+        max_rss: int | None = None,
+        interval: float = 10.0,
+        drain_timeout: float = 120.0,
+    ):
+        self.max_pages = max_pages
+        self.max_uptime = max_uptime
+        self.max_rss = max_rss
+        self.interval = interval
+        self.drain_timeout = drain_timeout
+
+    @classmethod
+    def from_config(cls, common: CommonConfig) -> HealthLimits:
+        max_rss = common.browser_max_rss
+        return cls(
+            max_pages=common.browser_max_pages,
+            max_uptime=common.browser_max_uptime,
+            max_rss=None if max_rss is None else max_rss * 2**20,
+            interval=common.health_check_interval,
+            drain_timeout=common.browser_drain_timeout,
+        )
+
+    def exceeded(self, health: BrowserHealth) -> str | None:
+        """Return the threshold the browser crossed, if any."""
+
+        if self.max_pages is not None and health.pages >= self.max_pages:
+            return f"{health.pages} pages"
+        if self.max_uptime is not None and health.uptime >= self.max_uptime:
+            return f"{health.uptime:.0f}s uptime"
+        if (
+            self.max_rss is not None
+            and health.rss is not None
+            and health.rss >= self.max_rss
+        ):
+            return f"{health.rss / 2**20:.0f}MB RSS"
+        return None
+
+
+def _children() -> set[int]:
+    """
+    Pids of the processes started by this process directly.
+
+    A launch starts one Playwright driver, with the browser under it; the
+    processes that browsers already running start later are not children.
+    """
+
+    if psutil is None:
+        return set()
+    try:
+        return {p.pid for p in psutil.Process().children(recursive=False)}
+    except psutil.Error:
+        return set()
+
+
+# the processes of a launch are the children it adds, so launches measured
+# that way run one at a time
+_launch_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _launch_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _launch_locks.get(loop, None)
+    if lock is None:
+        lock = _launch_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def _rss(pids: set[int]) -> int | None:
+    """Resident memory of processes and of their children, in bytes."""
+
+    if psutil is None or not pids:
+        return None
+
+    processes = {}
+    for pid in pids:
+        try:
+            process = psutil.Process(pid)
+            processes[pid] = process
+            for child in process.children(recursive=True):
+                processes[child.pid] = child
+        except psutil.Error:
+            continue
+
+    total = 0
+    for process in processes.values():
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+class _Generation:
+    """One launched browser with its usage bookkeeping."""
+
+    def __init__(self, browser: Browser, stack: AsyncExitStack, pids: set[int]):
+        self.browser = browser
+        self.stack = stack
+        self.pids = pids
+        self.started = time.monotonic()
+        self.pages = 0
+        self.leases = 0
+        self.retired = False
+        self.tracked: weakref.WeakSet[BrowserContext] = weakref.WeakSet()
+
+    def count_page(self, _page):
+        self.pages += 1
+
+    def track(self):
+        """Count the pages of contexts opened since the last call."""
+
+        for context in self.browser.contexts:
+            if context not in self.tracked:
+                self.tracked.add(context)
+                self.pages += len(context.pages)
+                context.on("page", self.count_page)
+
+    def busy(self) -> bool:
+        if self.leases > 0:
+            return True
+        if not self.browser.is_connected():
+            return False
+        return any(context.pages for context in self.browser.contexts)
+
+
+class BrowserSupervisor:
+    """
+    Runs one browser and replaces it when it crashes or wears out.
+
+    The browser is checked every `limits.interval` seconds: the pages opened
+    in it, its uptime and the memory of its processes. Past a threshold, a
+    successor is launched first, then swapped in, and the old browser is
+    closed once its leases are released and its pages closed, or after
+    `limits.drain_timeout`. `browser` always returns a browser while the
+    supervisor runs, so callers never wait for a launch.
+
+    A crash is logged as soon as the browser disconnects and a replacement is
+    launched, retried with backoff until it succeeds.
+
+    With `idle_timeout`, the browser is launched on demand instead: run()
+    launches nothing, the first lease() launches the browser, and a burst of
+    leases waits for that single launch. Once the browser has had no lease
+    and no open page for `idle_timeout` seconds, it is closed at the next
+    check, and the next lease launches a new one. `browser` raises while no
+    browser runs.
+
+    Pages are counted for the contexts seen at a check or a lease release;
+    RSS needs psutil (`pip install octoscrape[monitor]`) and counts the
+    processes started by the launch and their children. With psutil, the
+    supervisors of a loop launch one browser at a time to tell them apart.
+
+    Args:
+        launcher (Callable[[], AsyncContextManager[Browser]]): Launches one
+            browser, e.g. launch_camoufox or launch_firefox.
+        limits (HealthLimits): Thresholds and check interval.
+        on_swap (Callable[[Browser | None], None] | None): Called with every
+            browser that becomes current, the first one included, and with
+            None when an idle browser is closed.
+        idle_timeout (float | None): Seconds without use after which the
+            browser is closed. None launches it at once and keeps it running.
+    """
+
+    def __init__(
+        self,
+        launcher: Callable[[], AsyncContextManager[Browser]],
+        limits: HealthLimits | None = None,
+        on_swap: Callable[[Browser | None], None] | None = None,
+        idle_timeout: float | None = None,
+    ):
+        self.__launcher = launcher
+        self.__limits = limits or HealthLimits()
+        self.__on_swap = on_swap
+        self.__idle_timeout = idle_timeout
+        self.__active = False
+        self.__current: _Generation | None = None
+        self.__last_used = 0.0
+        self.__launching: asyncio.Task | None = None
+        self.__recycling: asyncio.Task | None = None
+        self.__draining: set[asyncio.Task] = set()
+        self.__recycles = 0
+        self.__crashes = 0
+
+    @property
+    def browser(self) -> Browser:
+        """
+        The current browser.
+
+        Raises:
+            RuntimeError: If no browser runs; with `idle_timeout`, also before
+                the first lease and after an idle shutdown.
+        """
+
+        if self.__current is None:
+            if self.__active:
+                raise RuntimeError(
+                    "Supervised browser is idle, lease() launches it "
+                    "(browser_idle_timeout)."
+                )
+            raise RuntimeError("Supervised browser has not been created yet.")
+        return self.__current.browser
+
+    @property
+    def running(self) -> bool:
+        """Whether a browser runs; with `idle_timeout`, not while idle."""
+        return self.__current is not None
+
+    @property
+    def active(self) -> bool:
+        """Whether the supervisor runs, launched browser or not."""
+        return self.__active
+
+    @asynccontextmanager
+    async def run(self):
+        """Supervise the browser for the duration of the block.
+
+        The browser is launched at once, or on the first lease with
+        `idle_timeout`.
+        """
+
+        if self.__active:
+            raise RuntimeError("The browser already exists")
+
+        if self.__idle_timeout is None:
+            self.__swap(await self.__launch())
+        self.__active = True
+        monitor = asyncio.get_running_loop().create_task(self.__monitor())
+        try:
+            yield self
+        finally:
+            self.__active = False
+            tasks = [monitor, *self.__draining]
+            for task in (self.__recycling, self.__launching):
+                if task is not None:
+                    tasks.append(task)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            current, self.__current = self.__current, None
+            await self.__close(current)
+
+    def health(self) -> BrowserHealth:
+        generation = self.__current
+        if generation is None:
+            raise RuntimeError("Supervised browser has not been created yet.")
+
+        generation.track()
+        return BrowserHealth(
+            pages=generation.pages,
+            uptime=time.monotonic() - generation.started,
+            rss=_rss(generation.pids),
+            leases=generation.leases,
+            connected=generation.browser.is_connected(),
+            recycles=self.__recycles,
+            crashes=self.__crashes,
+        )
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Browser]:
+        """
+        Borrow the current browser for the duration of the block.
+
+        A recycled browser is only closed once its leases are released, so a
+        lease is the way to keep a browser across a swap. With `idle_timeout`,
+        launches the browser if none runs.
+        """
+
+        generation = self.__current
+        if generation is None:
+            if not self.__active or self.__idle_timeout is None:
+                raise RuntimeError("Supervised browser has not been created yet.")
+            generation = await self.__launched()
+
+        generation.leases += 1
+        try:
+            yield generation.browser
+        finally:
+            generation.leases -= 1
+            generation.track()
+            self.__last_used = time.monotonic()
+
+    async def recycle(self, reason: str = "request"):
+        """Replace the browser now; waits for the successor to be swapped in."""
+
+        if self.__current is None:
+            return  # nothing to replace while idle
+        if self.__recycling is None:
+            self.__start_recycling(reason, retry=False)
+        await asyncio.shield(self.__recycling)
+
+    async def __launched(self) -> _Generation:
+        """Wait for the on-demand launch, starting it unless one is under way."""
+
+        if self.__launching is None:
+            task = asyncio.get_running_loop().create_task(self.__launch_on_demand())
+            self.__launching = task
+
+            def done(_):
+                if self.__launching is task:
+                    self.__launching = None
+
+            task.add_done_callback(done)
+        # a cancelled lease must not cancel the launch the others wait for
+        return await asyncio.shield(self.__launching)
+
+    async def __launch_on_demand(self) -> _Generation:
+        logger.info("Launching the browser on demand")
+        generation = await self.__launch()
+        if not self.__active:
+            await self.__close(generation)  # the supervisor stopped meanwhile
+            raise RuntimeError("Supervised browser has been closed.")
+        self.__swap(generation)
+        self.__last_used = time.monotonic()
+        return generation
+
+    def __idle(self, generation: _Generation) -> bool:
+        if self.__idle_timeout is None:
+            return False
+        if generation.busy():
+            self.__last_used = time.monotonic()
+            return False
+        return time.monotonic() - self.__last_used >= self.__idle_timeout
+
+    async def __shutdown_idle(self, generation: _Generation):
+        logger.info(f"Closing the browser after {self.__idle_timeout:.0f}s idle")
+        self.__current = None
+        if self.__on_swap is not None:
+            self.__on_swap(None)
+        await self.__close(generation)
+
+    async def __monitor(self):
+        while True:
+            await asyncio.sleep(self.__limits.interval)
+            generation = self.__current
+            if generation is None or self.__recycling is not None:
+                continue
+            if self.__idle(generation):
+                await self.__shutdown_idle(generation)
+                continue
+            try:
+                reason = self.__limits.exceeded(self.health())
+            except Exception:
+                logger.warning("Browser health check failed", exc_info=True)
+                continue
+            if reason is not None:
+                self.__start_recycling(reason, retry=False)
+
+    def __start_recycling(self, reason: str, retry: bool):
+        task = asyncio.get_running_loop().create_task(self.__recycle(reason, retry))
+        self.__recycling = task
+
+        def done(_):
+            if self.__recycling is task:
+                self.__recycling = None
+
+        task.add_done_callback(done)
+
+    async def __recycle(self, reason: str, retry: bool):
+        """Launch a successor, swap it in and drain the old browser."""
+
+        logger.info(f"Recycling the browser after {reason}")
+        delay = 1.0
+        while True:
+            try:
+                fresh = await self.__launch()
+                break
+            except Exception:
+                logger.error("Failed to launch a replacement browser", exc_info=True)
+                current = self.__current
+                if current is None:
+                    return
+                if not retry and current.browser.is_connected():
+                    return  # the next check tries again
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+        old = self.__current
+        if old is None:
+            await self.__close(fresh)  # the supervisor stopped meanwhile
+            return
+        self.__swap(fresh)
+        self.__recycles += 1
+
+        task = asyncio.get_running_loop().create_task(self.__drain(old))
+        self.__draining.add(task)
+        task.add_done_callback(self.__draining.discard)
+
+    async def __drain(self, generation: _Generation):
+        deadline = time.monotonic() + self.__limits.drain_timeout
+        try:
+            while generation.busy() and time.monotonic() < deadline:
+                await asyncio.sleep(_DRAIN_POLL)
+            if generation.busy():
+                logger.warning("Closing a recycled browser that is still in use")
+        finally:
+            await self.__close(generation)
+
+    def __swap(self, generation: _Generation):
+        self.__current = generation
+        if self.__on_swap is not None:
+            self.__on_swap(generation.browser)
+
+    async def __launch(self) -> _Generation:
+        stack = AsyncExitStack()
+        # concurrent launches would each count the processes of the others
+        async with _launch_lock() if psutil is not None else nullcontext():
+            before = _children()
+            try:
+                browser = await stack.enter_async_context(self.__launcher())
+            except BaseException:
+                await stack.aclose()
+                raise
+            pids = _children() - before
+
+        generation = _Generation(browser, stack, pids)
+        browser.on("disconnected", lambda _: self.__on_disconnected(generation))
+        return generation
+
+    async def __close(self, generation: _Generation | None):
+        if generation is None or generation.retired:
+            return
+        generation.retired = True
+        try:
+            await generation.stack.aclose()
+        except Exception:
+            logger.warning("Error while closing a browser", exc_info=True)
+
+    def __on_disconnected(self, generation: _Generation):
+        if generation.retired or generation is not self.__current:
+            return  # closed by the supervisor, or already replaced
+
+        self.__crashes += 1
+        logger.error(
+            f"The browser crashed after {generation.pages} pages and "
+            f"{time.monotonic() - generation.started:.0f}s"
+        )
+        if self.__recycling is None:
+            self.__start_recycling("a crash", retry=True)
@@ -1,7 +1,11 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
-from playwright.async_api import Browser
+if TYPE_CHECKING:
+    from playwright.async_api import Browser
 
 
 class IBrowserManager(ABC):
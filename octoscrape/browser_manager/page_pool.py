@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+
+class PagePoolStats(NamedTuple):
+    """
+    Point-in-time snapshot of PagePool counters.
+
+    `hits` are leases served by a ready page, `misses` had to open one;
+    `recycled` pages went back to the pool, `discarded` ones were closed.
+    """
+
+    hits: int
+    misses: int
+    recycled: int
+    discarded: int
+    idle: int
+
+
+class _PooledPage:
+    __slots__ = ("page", "uses", "listeners")
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.uses = 0
+        # handlers added through PagePool.listen() during the lease
+        self.listeners: list[tuple[str, Callable[..., Any]]] = []
+
+
+class _ContextPages:
+    __slots__ = ("idle", "refill")
+
+    def __init__(self):
+        self.idle: deque[_PooledPage] = deque()
+        self.refill: asyncio.Task | None = None
+
+
+class PagePool:
+    """
+    Pool of blank pages kept ready per browser context.
+
+    A leased page is returned to the pool at the end of the block: its routes,
+    extra HTTP headers and the event handlers added with listen() are removed
+    and it navigates to about:blank. Pages whose block raised, that fail to
+    recycle, reached `max_uses` or exceed `size` are closed. After a lease
+    takes a ready page, the pool opens a replacement in the background.
+
+    Pages are kept as long as their context lives, so the pool pays off with
+    long-lived contexts. Before a context leased from ContextPool goes back,
+    call release() so no refill opens pages in it for the next lessee.
+
+    Args:
+        size (int): Ready pages kept per context.
+        max_uses (int | None): Leases after which a page is closed.
+            None means unlimited.
+
+    Example:
+        pages = PagePool(size=4)
+        async with pages.page(context) as page:
+            pages.listen(page, "response", on_response)
+            await page.goto(url)
+    """
+
+    def __init__(self, size: int = 2, max_uses: int | None = 50):
+        if size < 0:
+            raise ValueError("size must not be negative.")
+        if max_uses is not None and max_uses < 1:
+            raise ValueError("max_uses must be at least 1.")
+
+        self.__size = size
+        self.__max_uses = max_uses
+        self.__contexts: dict[BrowserContext, _ContextPages] = {}
+        self.__leased: dict[Page, _PooledPage] = {}
+        self.__closing: set[asyncio.Task] = set()
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__recycled = 0
+        self.__discarded = 0
+
+    def stats(self) -> PagePoolStats:
+        return PagePoolStats(
+            hits=self.__hits,
+            misses=self.__misses,
+            recycled=self.__recycled,
+            discarded=self.__discarded,
+            idle=sum(len(pages.idle) for pages in self.__contexts.values()),
+        )
+
+    async def prewarm(self, context: BrowserContext):
+        """Open pages in a context until `size` of them are ready."""
+
+        await self.__fill(context, self.__pages(context))
+
+    async def release(self, context: BrowserContext):
+        """
+        Stop keeping pages of a context, e.g. before it goes back to a
+        ContextPool: its refill is cancelled and its ready pages are closed.
+        """
+
+        pages = self.__contexts.pop(context, None)
+        if pages is None:
+            return
+        if pages.refill is not None:
+            pages.refill.cancel()
+            await asyncio.gather(pages.refill, return_exceptions=True)
+        for pooled in pages.idle:
+            await self.__close(pooled)
+
+    @asynccontextmanager
+    async def page(self, context: BrowserContext) -> AsyncIterator[Page]:
+        """Lease a blank page of `context`, opening one if none is ready."""
+
+        pages = self.__pages(context)
+        pooled = None
+        while pages.idle:
+            candidate = pages.idle.popleft()
+            if not candidate.page.is_closed():
+                pooled = candidate
+                break
+
+        if pooled is None:
+            self.__misses += 1
+            pooled = _PooledPage(await context.new_page())
+        else:
+            self.__hits += 1
+            self.__schedule_refill(context, pages)
+        pooled.uses += 1
+
+        self.__leased[pooled.page] = pooled
+        try:
+            yield pooled.page
+        except BaseException:
+            self.__leased.pop(pooled.page, None)
+            # awaiting here could be cut short by a cancellation
+            task = asyncio.get_running_loop().create_task(self.__close(pooled))
+            self.__closing.add(task)
+            task.add_done_callback(self.__closing.discard)
+            raise
+        self.__leased.pop(pooled.page, None)
+        await self.__release(pages, pooled)
+
+    def listen(self, page: Page, event: str, handler: Callable[..., Any]):
+        """
+        Add an event handler to a leased page for the rest of the lease.
+
+        Handlers added with page.on() directly stay on the page when it goes
+        back to the pool.
+
+        Raises:
+            ValueError: If the page is not leased from this pool.
+        """
+
+        pooled = self.__leased.get(page, None)
+        if pooled is None:
+            raise ValueError("The page is not leased from this pool.")
+        page.on(event, handler)
+        pooled.listeners.append((event, handler))
+
+    async def close(self):
+        """Close all ready pages and stop background refills."""
+
+        contexts, self.__contexts = self.__contexts, {}
+        for pages in contexts.values():
+            if pages.refill is not None:
+                pages.refill.cancel()
+                await asyncio.gather(pages.refill, return_exceptions=True)
+            for pooled in pages.idle:
+                await self.__close(pooled)
+        await asyncio.gather(*self.__closing, return_exceptions=True)
+
+    def __pages(self, context: BrowserContext) -> _ContextPages:
+        pages = self.__contexts.get(context, None)
+        if pages is None:
+            pages = _ContextPages()
+            self.__contexts[context] = pages
+            context.on("close", lambda _: self.__forget(context))
+        return pages
+
+    def __forget(self, context: BrowserContext):
+        pages = self.__contexts.pop(context, None)
+        if pages is not None and pages.refill is not None:
+            pages.refill.cancel()
+
+    def __schedule_refill(self, context: BrowserContext, pages: _ContextPages):
+        if pages.refill is not None or len(pages.idle) >= self.__size:
+            return
+
+        async def refill():
+            try:
+                await self.__fill(context, pages)
+            except Exception:
+                logger.warning("Failed to refill the page pool", exc_info=True)
+            finally:
+                pages.refill = None
+
+        pages.refill = asyncio.get_running_loop().create_task(refill())
+
+    async def __fill(self, context: BrowserContext, pages: _ContextPages):
+        # stop as soon as the context is released or closed
+        while (
+            self.__contexts.get(context, None) is pages
+            and len(pages.idle) < self.__size
+        ):
+            page = await context.new_page()
+            if self.__contexts.get(context, None) is not pages:
+                await page.close()
+                return
+            pages.idle.append(_PooledPage(page))
+
+    async def __release(self, pages: _ContextPages, pooled: _PooledPage):
+        if (
+            self.__contexts.get(pooled.page.context, None) is pages
+            and len(pages.idle) < self.__size
+            and (self.__max_uses is None or pooled.uses < self.__max_uses)
+        ):
+            try:
+                if await self.__recycle(pooled):
+                    pages.idle.append(pooled)
+                    self.__recycled += 1
+                    return
+            except Exception:
+                logger.warning("Failed to recycle a pooled page", exc_info=True)
+        await self.__close(pooled)
+
+    async def __recycle(self, pooled: _PooledPage) -> bool:
+        """Bring a page back to a blank state, return False if it is gone."""
+
+        page = pooled.page
+        if page.is_closed():
+            return False
+
+        for event, handler in pooled.listeners:
+            page.remove_listener(event, handler)
+        pooled.listeners.clear()
+
+        await page.unroute_all(behavior="ignoreErrors")
+        await page.set_extra_http_headers({})
+        await page.goto("about:blank")
+        return True
+
+    async def __close(self, pooled: _PooledPage):
+        self.__discarded += 1
+        try:
+            if not pooled.page.is_closed():
+                await pooled.page.close()
+        except Exception:
+            logger.warning("Failed to close a pooled page", exc_info=True)
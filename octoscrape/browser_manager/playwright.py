@@ -1,11 +1,133 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator
 
 from playwright.async_api import Browser, async_playwright
 
-from ..config import common_config
+from .. import config
+from .health import BrowserHealth, BrowserSupervisor, HealthLimits
 from .interface import IBrowserManager
+from .server import connect_server
+
+# Firefox preferences that save work a scraper has no use for: background
+# updates and telemetry, speculative connections, media and the disk cache
+FIREFOX_PREFS = {
+    "app.update.enabled": False,
+    "browser.cache.disk.enable": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.sessionstore.resume_from_crash": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "media.autoplay.default": 5,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "network.prefetch-next": False,
+    "toolkit.telemetry.enabled": False,
+}
+
+# Chromium flags to the same end; background pages are not throttled, as
+# every page of a scraper is in the background
+CHROMIUM_ARGS = [
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+
+def firefox_options() -> dict[str, Any]:
+    """Playwright Firefox launch options from the common config."""
+
+    return {
+        "headless": config.common_config.headless,
+        "args": [
+            f"--width={config.common_config.max_window_width}",
+            f"--height={config.common_config.max_window_height}",
+        ],
+        "firefox_user_prefs": dict(FIREFOX_PREFS),
+    }
+
+
+def chromium_options() -> dict[str, Any]:
+    """
+    Playwright Chromium launch options from the common config.
+
+    Headless Chromium runs the lighter headless shell build; set the
+    "chromium" channel to run the full browser instead.
+    """
+
+    return {
+        "headless": config.common_config.headless,
+        "args": [
+            *CHROMIUM_ARGS,
+            f"--window-size={config.common_config.max_window_width},"
+            f"{config.common_config.max_window_height}",
+        ],
+    }
+
+
+def webkit_options() -> dict[str, Any]:
+    """Playwright WebKit launch options from the common config."""
+
+    return {"headless": config.common_config.headless}
+
+
+@asynccontextmanager
+async def launch_playwright(browser_type: str, **options) -> AsyncIterator[Browser]:
+    """
+    Launch a Playwright browser: "firefox", "chromium" or "webkit".
+
+    Args:
+        options: Passed to BrowserType.launch().
+    """
+
+    async with async_playwright() as p:
+        yield await getattr(p, browser_type).launch(**options)
+
+
+@asynccontextmanager
+async def launch_browser(browser_type: str, **options) -> AsyncIterator[Browser]:
+    """
+    Launch a Playwright browser, or with `browser_server`, connect to the
+    server of its type shared by the processes of the host (see BrowserServer).
+
+    Args:
+        options: Passed to BrowserType.launch(); the server is launched with
+            the options of the engine instead.
+    """
+
+    if config.common_config.browser_server:
+        async with connect_server(browser_type) as browser:
+            yield browser
+        return
+
+    async with launch_playwright(browser_type, **options) as browser:
+        yield browser
+
+
+@asynccontextmanager
+async def launch_firefox(**options) -> AsyncIterator[Browser]:
+    """
+    Launch a Playwright Firefox browser configured by the common config.
+
+    With `browser_server`, connects to the Firefox server shared by the
+    processes of the host instead (see BrowserServer).
+
+    Args:
+        options: Launch options; defaults to firefox_options().
+    """
+
+    async with launch_browser("firefox", **(options or firefox_options())) as browser:
+        yield browser
 
 
 class PlaywrightBrowserManager(IBrowserManager):
@@ -16,6 +138,10 @@ class PlaywrightBrowserManager(IBrowserManager):
     - ensuring only one browser instance exists at a time
     - managing browser creation and cleanup via async context manager
     - providing safe access to the active browser instance
+    - recycling the browser past the health limits of the common config, and
+      replacing it after a crash (see BrowserSupervisor)
+    - with `browser_idle_timeout`, launching the browser on the first lease
+      and closing it once idle
     """
 
     __instance: PlaywrightBrowserManager | None = None
@@ -24,32 +150,78 @@ class PlaywrightBrowserManager(IBrowserManager):
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
             cls.__instance.__browser = None
+            cls.__instance.__supervisor = None
         return cls.__instance
 
     @asynccontextmanager
     async def create_browser(self):
-        if self.initialized:
+        if self.initialized or self.__supervisor is not None:
             raise RuntimeError("The browser already exists")
 
-        async with async_playwright() as p:
-            self.__browser = await p.firefox.launch(
-                headless=common_config.headless,
-                args=[
-                    f"--width={common_config.max_window_width}",
-                    f"--height={common_config.max_window_height}",
-                ],
-            )
+        supervisor = BrowserSupervisor(
+            launch_firefox,
+            HealthLimits.from_config(config.common_config),
+            on_swap=self.__swapped,
+            idle_timeout=config.common_config.browser_idle_timeout,
+        )
+        async with supervisor.run():
+            self.__supervisor = supervisor
             try:
                 yield
             finally:
+                self.__supervisor = None
                 self.__browser = None
 
     @property
     def browser(self) -> Browser:
+        """
+        The current browser.
+
+        With `browser_idle_timeout`, no browser runs before the first lease()
+        or after an idle shutdown, and this raises; use lease() instead.
+
+        Raises:
+            RuntimeError: If no browser runs.
+        """
+
         if not self.initialized:
+            if self.__supervisor is not None:
+                raise RuntimeError(
+                    "Playwright browser is idle, lease() launches it "
+                    "(browser_idle_timeout)."
+                )
             raise RuntimeError("Playwriht browser has not been created yet.")
         return self.__browser
 
     @property
     def initialized(self) -> bool:
         return self.__browser is not None
+
+    def health(self) -> BrowserHealth:
+        """
+        Snapshot of the pages, uptime and memory of the current browser.
+
+        Raises:
+            RuntimeError: If the browser has not been created yet.
+        """
+        return self.__running().health()
+
+    def lease(self) -> AsyncContextManager[Browser]:
+        """
+        Borrow the browser; a recycled browser is closed after its leases.
+
+        With `browser_idle_timeout`, launches the browser if it is not running.
+        """
+        return self.__running().lease()
+
+    async def recycle(self):
+        """Replace the browser with a fresh one, draining the current one."""
+        await self.__running().recycle()
+
+    def __running(self) -> BrowserSupervisor:
+        if self.__supervisor is None:
+            raise RuntimeError("Playwriht browser has not been created yet.")
+        return self.__supervisor
+
+    def __swapped(self, browser: Browser | None):
+        self.__browser = browser
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import TYPE_CHECKING, AsyncContextManager, AsyncIterator, Callable
+
+from .health import BrowserSupervisor, HealthLimits
+from .interface import IBrowserManager
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledBrowser:
+    """A browser of the pool, or the supervisor running it, and its leases."""
+
+    __slots__ = ("launched", "supervisor", "stack", "leases", "alive")
+
+    def __init__(
+        self,
+        launched: Browser | None,
+        stack: AsyncExitStack,
+        supervisor: BrowserSupervisor | None = None,
+    ):
+        self.launched = launched
+        self.supervisor = supervisor
+        self.stack = stack
+        self.leases = 0
+        self.alive = True
+
+    @property
+    def browser(self) -> Browser:
+        if self.supervisor is not None:
+            return self.supervisor.browser
+        return self.launched
+
+    def connected(self) -> bool:
+        if self.supervisor is not None and not self.supervisor.running:
+            return False
+        return self.browser.is_connected()
+
+
+class BrowserPool(IBrowserManager):
+    """
+    Manager of several browser instances handed out through leases.
+
+    One browser process caps the number of pages it can drive; a pool spreads
+    them over `size` processes. lease() picks the least-loaded browser and, with
+    `max_contexts`, waits while every browser already holds that many leases. A
+    browser that disconnects (crash, killed process) is closed and replaced by
+    a fresh one in the background.
+
+    With `limits`, every browser of the pool runs under a BrowserSupervisor
+    instead: it is recycled past the limits, and replaced after a crash with
+    the supervisor's backoff. A lease then holds the browser across a swap.
+
+    The pool is IBrowserManager-compatible: create_browser() starts all
+    browsers and `browser` returns the least-loaded one, so it can stand in for
+    a singleton manager.
+
+    Args:
+        launcher (Callable[[], AsyncContextManager[Browser]]): Launches one
+            browser, e.g. launch_camoufox or launch_firefox.
+        size (int): Number of browsers.
+        max_contexts (int | None): Leases allowed per browser at the same time.
+            None means unlimited.
+        limits (HealthLimits | None): Health limits the browsers are recycled
+            past. None runs them unsupervised.
+
+    Example:
+        pool = BrowserPool(launch_camoufox, size=4, max_contexts=8)
+        async with pool.create_browser():
+            async with pool.lease() as browser:
+                context = await browser.new_context()
+    """
+
+    def __init__(
+        self,
+        launcher: Callable[[], AsyncContextManager[Browser]],
+        size: int,
+        max_contexts: int | None = None,
+        limits: HealthLimits | None = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        if max_contexts is not None and max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1.")
+
+        self.__launcher = launcher
+        self.__size = size
+        self.__max_contexts = max_contexts
+        self.__limits = limits
+        self.__browsers: list[_PooledBrowser] = []
+        self.__waiters: deque[asyncio.Future] = deque()
+        self.__replacements: set[asyncio.Task] = set()
+
+    @asynccontextmanager
+    async def create_browser(self):
+        if self.initialized:
+            raise RuntimeError("The browser already exists")
+
+        launched = await asyncio.gather(
+            *(self.__launch() for _ in range(self.__size)), return_exceptions=True
+        )
+        browsers = [b for b in launched if isinstance(b, _PooledBrowser)]
+        errors = [e for e in launched if not isinstance(e, _PooledBrowser)]
+        if errors:
+            for pooled in browsers:
+                await self.__close(pooled)
+            raise errors[0]
+
+        self.__browsers = browsers
+        try:
+            yield
+        finally:
+            browsers, self.__browsers = self.__browsers, []
+            for task in self.__replacements:
+                task.cancel()
+            await asyncio.gather(*self.__replacements, return_exceptions=True)
+            for pooled in browsers:
+                await self.__close(pooled)
+            self.__wake_all()
+
+    @property
+    def browser(self) -> Browser:
+        pooled = self.__least_loaded(capped=False)
+        if pooled is None:
+            raise RuntimeError("Browser pool browser has not been created yet.")
+        return pooled.browser
+
+    @property
+    def initialized(self) -> bool:
+        return len(self.__browsers) > 0
+
+    @property
+    def loads(self) -> list[int]:
+        """Number of leases held on every browser of the pool."""
+        return [pooled.leases for pooled in self.__browsers]
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Browser]:
+        """
+        Borrow the least-loaded browser for the duration of the block.
+
+        Waits while every live browser has `max_contexts` leases. One lease is
+        meant to back one browser context.
+
+        Raises:
+            RuntimeError: if the pool is not created or is closed while waiting.
+        """
+
+        while True:
+            if not self.initialized:
+                raise RuntimeError("Browser pool browser has not been created yet.")
+            pooled = self.__least_loaded(capped=True)
+            if pooled is not None:
+                break
+
+            waiter = asyncio.get_running_loop().create_future()
+            self.__waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.__wake()  # pass the wake-up on to the next waiter
+                raise
+            finally:
+                if waiter in self.__waiters:
+                    self.__waiters.remove(waiter)
+
+        pooled.leases += 1
+        try:
+            if pooled.supervisor is None:
+                yield pooled.browser
+            else:
+                async with pooled.supervisor.lease() as browser:
+                    yield browser
+        finally:
+            pooled.leases -= 1
+            self.__wake()
+
+    def __least_loaded(self, capped: bool) -> _PooledBrowser | None:
+        """Return the live browser with the fewest leases, if one is free."""
+
+        best = None
+        for pooled in self.__browsers:
+            if not pooled.alive or not pooled.connected():
+                continue
+            if (
+                capped
+                and self.__max_contexts is not None
+                and pooled.leases >= self.__max_contexts
+            ):
+                continue
+            if best is None or pooled.leases < best.leases:
+                best = pooled
+        return best
+
+    async def __launch(self) -> _PooledBrowser:
+        stack = AsyncExitStack()
+        supervisor = None
+        try:
+            if self.__limits is None:
+                browser = await stack.enter_async_context(self.__launcher())
+            else:
+                # a swapped-in browser may free leases for the waiters
+                supervisor = BrowserSupervisor(
+                    self.__launcher,
+                    self.__limits,
+                    on_swap=lambda _: self.__wake_all(),
+                )
+                await stack.enter_async_context(supervisor.run())
+        except BaseException:
+            await stack.aclose()
+            raise
+
+        if supervisor is not None:
+            # the supervisor replaces the browser after a crash
+            return _PooledBrowser(None, stack, supervisor)
+        pooled = _PooledBrowser(browser, stack)
+        browser.on("disconnected", lambda _: self.__on_disconnected(pooled))
+        return pooled
+
+    async def __close(self, pooled: _PooledBrowser):
+        pooled.alive = False
+        try:
+            await pooled.stack.aclose()
+        except Exception:
+            logger.warning("Error while closing a pooled browser", exc_info=True)
+
+    def __on_disconnected(self, pooled: _PooledBrowser):
+        if not pooled.alive or pooled not in self.__browsers:
+            return  # closed by the pool itself
+
+        pooled.alive = False
+        logger.warning("Pooled browser disconnected, launching a replacement")
+        task = asyncio.get_running_loop().create_task(self.__replace(pooled))
+        self.__replacements.add(task)
+        task.add_done_callback(self.__replacements.discard)
+
+    async def __replace(self, pooled: _PooledBrowser):
+        """Close a crashed browser and put a new one in its place."""
+
+        await self.__close(pooled)
+        delay = 1.0
+        while True:
+            try:
+                fresh = await self.__launch()
+                break
+            except Exception:
+                logger.error("Failed to relaunch a pooled browser", exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+        try:
+            self.__browsers[self.__browsers.index(pooled)] = fresh
+        except ValueError:
+            await self.__close(fresh)  # the pool was closed meanwhile
+            return
+        self.__wake_all()
+
+    def __wake(self):
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def __wake_all(self):
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, NoReturn, Sequence
+
+from .. import config
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("firefox", "chromium", "webkit", "camoufox")
+
+# websocket endpoint printed by the server, possibly wrapped in color codes
+_endpoint = re.compile(r"wss?://[^\s\x1b]+")
+
+# launches a Playwright browser server with the bundled driver; Playwright for
+# Python has no launchServer() of its own
+_PLAYWRIGHT_SERVER = """
+const browserType = require(process.env.PLAYWRIGHT_CORE)[process.argv[1]];
+browserType.launchServer(JSON.parse(process.argv[2])).then((server) => {
+  console.log(server.wsEndpoint());
+  process.on("SIGTERM", () => server.close().then(() => process.exit(0)));
+});
+"""
+
+# server processes launched by this process, to reap them
+_launched: dict[int, subprocess.Popen] = {}
+
+
+def _alive(pid: int) -> bool:
+    process = _launched.get(pid, None)
+    if process is not None:
+        return process.poll() is None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+async def _terminate(pid: int, timeout: float = 10.0):
+    """Stop a server and the browser it runs, killing them past the timeout."""
+
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    deadline = time.monotonic() + timeout
+    while _alive(pid):
+        if time.monotonic() > deadline:
+            logger.warning(f"Killing browser server {pid}")
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            break
+        await asyncio.sleep(0.05)
+    _launched.pop(pid, None)
+
+
+class BrowserServer:
+    """
+    Browser server on a local websocket endpoint, shared by the processes of a
+    host.
+
+    acquire() returns the endpoint of the server registered under `name`,
+    launching the server with `command` if there is none or it died. The
+    registry counts the clients of the server by process id, and release()
+    shuts the server down when the last client leaves. Clients that exited
+    without releasing are dropped whenever the registry is read.
+
+    The server runs in a session of its own, so it keeps running for the other
+    clients when the process that launched it exits. `command` has to print
+    the websocket endpoint on its standard output, which is logged to a file
+    next to the registry.
+
+    Args:
+        name (str): Registry name; processes using the same name share the
+            server.
+        command (Sequence[str]): Command that runs the server.
+        path (str | Path): Folder of the registry, lock and log files.
+        start_timeout (float): Seconds the server gets to print its endpoint.
+
+    Raises:
+        RuntimeError: On platforms without POSIX file locks.
+
+    Example:
+        server = BrowserServer("firefox", command, ".cache/browser_servers")
+        async with server.endpoint() as endpoint:
+            browser = await playwright.firefox.connect(endpoint)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        command: Sequence[str],
+        path: str | Path,
+        start_timeout: float = 60.0,
+    ):
+        if fcntl is None:
+            raise RuntimeError("A shared browser server needs POSIX file locks.")
+
+        self.__name = name
+        self.__command = list(command)
+        self.__path = Path(path)
+        self.__start_timeout = start_timeout
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    async def acquire(self) -> str:
+        """
+        Register this process as a client of the server.
+
+        Returns:
+            The websocket endpoint of the server.
+
+        Raises:
+            RuntimeError: If the server exited before printing its endpoint.
+            TimeoutError: If it did not print it within `start_timeout`.
+        """
+
+        async with self.__locked():
+            state = self.__read()
+            if state is None or not _alive(state["pid"]):
+                state = await self.__launch()
+            state["clients"].append(os.getpid())
+            self.__write(state)
+            return state["endpoint"]
+
+    async def release(self):
+        """Unregister a client of this process; the last one stops the server."""
+
+        async with self.__locked():
+            state = self.__read()
+            if state is None:
+                return
+            if os.getpid() in state["clients"]:
+                state["clients"].remove(os.getpid())
+            if state["clients"]:
+                self.__write(state)
+                return
+
+            self.__registry.unlink(missing_ok=True)
+            logger.info(f"Stopping browser server {self.__name}, no clients left")
+            await _terminate(state["pid"])
+
+    @asynccontextmanager
+    async def endpoint(self) -> AsyncIterator[str]:
+        """Hold a client registration for the block; yields the endpoint."""
+
+        endpoint = await self.acquire()
+        try:
+            yield endpoint
+        finally:
+            await self.release()
+
+    def clients(self) -> int:
+        """Number of registered clients, over all processes."""
+
+        state = self.__read()
+        return 0 if state is None else len(state["clients"])
+
+    @property
+    def __registry(self) -> Path:
+        return self.__path / f"{self.__name}.json"
+
+    @asynccontextmanager
+    async def __locked(self) -> AsyncIterator[None]:
+        self.__path.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.__path / f"{self.__name}.lock", os.O_RDWR | os.O_CREAT)
+        try:
+            await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # releases the lock
+
+    def __read(self) -> dict[str, Any] | None:
+        try:
+            with open(self.__registry, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"Ignoring unreadable browser server {self.__registry}")
+            return None
+        state["clients"] = [pid for pid in state["clients"] if _alive(pid)]
+        return state
+
+    def __write(self, state: dict[str, Any]):
+        with open(self.__registry, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    async def __launch(self) -> dict[str, Any]:
+        log = self.__path / f"{self.__name}.log"
+        with open(log, "wb") as out:
+            process = subprocess.Popen(
+                self.__command,
+                stdin=subprocess.DEVNULL,
+                stdout=out,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        _launched[process.pid] = process
+
+        deadline = time.monotonic() + self.__start_timeout
+        while (match := _endpoint.search(log.read_text(errors="replace"))) is None:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Browser server {self.__name} exited with code "
+                    f"{process.returncode}, see {log}"
+                )
+            if time.monotonic() > deadline:
+                await _terminate(process.pid)
+                raise TimeoutError(f"Browser server {self.__name} did not start")
+            await asyncio.sleep(0.05)
+
+        logger.info(f"Launched browser server {self.__name} at {match.group()}")
+        return {"pid": process.pid, "endpoint": match.group(), "clients": []}
+
+
+_servers: dict[str, BrowserServer] = {}
+
+
+def shared_server(engine: str) -> BrowserServer:
+    """
+    Return the server of an engine ("firefox", "chromium", "webkit" or
+    "camoufox") configured by the common config.
+
+    Processes that launch the engine with the same options share the server.
+    """
+
+    from .engines import get_engine
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown browser server engine: {engine!r}")
+
+    common = config.common_config
+    # the options serve() launches the server with
+    options = get_engine(engine).options()
+    options.pop("fingerprint", None)  # a Camoufox server picks its own
+    settings = json.dumps([engine, options], sort_keys=True, default=repr)
+    name = f"{engine}-{hashlib.sha256(settings.encode()).hexdigest()[:12]}"
+    if name not in _servers:
+        _servers[name] = BrowserServer(
+            name,
+            [sys.executable, "-m", __name__, engine],
+            common.browser_server_dir,
+        )
+    return _servers[name]
+
+
+@asynccontextmanager
+async def connect_server(engine: str) -> AsyncIterator[Browser]:
+    """
+    Connect to the browser server of an engine, launching it if needed.
+
+    With `browser_endpoint` in the common config, connects to that server
+    instead, which is left running.
+    """
+
+    from playwright.async_api import async_playwright
+
+    endpoint = config.common_config.browser_endpoint
+    if endpoint is None:
+        registration = shared_server(engine).endpoint()
+    else:
+        registration = nullcontext(endpoint)
+
+    async with registration as endpoint, async_playwright() as p:
+        # Camoufox is a Firefox build and speaks its protocol
+        browser_type = "firefox" if engine == "camoufox" else engine
+        browser = await getattr(p, browser_type).connect(endpoint)
+        try:
+            yield browser
+        finally:
+            # closes the contexts of this client, the server keeps running
+            await browser.close()
+
+
+def _camel(name: str) -> str:
+    first, *rest = name.split("_")
+    return first + "".join(part.capitalize() for part in rest)
+
+
+def serve(engine: str) -> NoReturn:
+    """Run the browser server of an engine and print its endpoint."""
+
+    from .engines import get_engine
+
+    if engine == "camoufox":
+        from camoufox.server import launch_server
+
+        launch_server(**get_engine(engine).options())
+        raise RuntimeError("Camoufox server exited")
+
+    if engine in ENGINES:
+        from playwright._impl._driver import compute_driver_executable
+
+        node, cli = compute_driver_executable()
+        env = {**os.environ, "PLAYWRIGHT_CORE": str(Path(cli).parent)}
+        # launchServer() takes the options in camel case
+        options = {_camel(k): v for k, v in get_engine(engine).options().items()}
+        os.execve(
+            node, [node, "-e", _PLAYWRIGHT_SERVER, engine, json.dumps(options)], env
+        )
+
+    raise ValueError(f"Unknown browser server engine: {engine!r}")
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
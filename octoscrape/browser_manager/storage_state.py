@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .. import config
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext
+
+    from ..config import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+# characters left out of file names
+_unsafe = re.compile(r"[^\w.-]+")
+
+
+def _slug(proxy: dict[str, str] | None) -> str:
+    """File name of the state of a proxy, readable but unique per account."""
+
+    if proxy is None:
+        return "direct"
+    server = proxy["server"]
+    digest = hashlib.sha256(
+        f"{server}|{proxy.get('username', '')}".encode()
+    ).hexdigest()
+    return f"{_unsafe.sub('_', server).strip('_')}-{digest[:12]}"
+
+
+def _is_empty(state: dict[str, Any]) -> bool:
+    return not state.get("cookies") and not state.get("origins")
+
+
+class StorageStateStore:
+    """
+    Storage states (cookies and localStorage) of browser contexts, kept on disk.
+
+    There is one state per proxy, as sessions are usually bound to the IP
+    address they were opened from. A context created with get() starts with the
+    cookies of the previous run and skips the login or warm-up it would
+    otherwise need. A state is dropped `max_age` seconds after it was saved and
+    its expired cookies are filtered out on load.
+
+    States are refreshed from live contexts with capture(), at most once per
+    `refresh_interval` seconds and proxy, and contexts passed to track() are
+    captured in the background on the same interval. The files are read and
+    written in a worker thread.
+
+    Args:
+        path (str | Path): Folder of the state files.
+        max_age (float): Seconds a saved state is used for.
+        refresh_interval (float): Seconds between two captures of a state.
+
+    Example:
+        store = StorageStateStore(".cache/storage_states/shop")
+        state = await store.get(proxy)
+        context = await browser.new_context(storage_state=state)
+        store.track(context, proxy)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_age: float = 86400.0,
+        refresh_interval: float = 300.0,
+    ):
+        self.__path = Path(path)
+        self.__max_age = max_age
+        self.__refresh_interval = refresh_interval
+        # slug -> (state, wall clock time it was saved at), None if there is none
+        self.__states: dict[str, tuple[dict[str, Any], float] | None] = {}
+        self.__captured: dict[str, float] = {}
+        self.__tracked: dict[BrowserContext, dict[str, str] | None] = {}
+        self.__refresher: asyncio.Task | None = None
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    async def get(self, proxy: dict[str, str] | None = None) -> dict[str, Any] | None:
+        """
+        Return the stored state of a proxy for Browser.new_context().
+
+        Returns:
+            The state without its expired cookies, or None if there is no
+            state or it is too old.
+        """
+
+        slug = _slug(proxy)
+        if slug not in self.__states:
+            stored = await asyncio.to_thread(self.__read, slug)
+            self.__states.setdefault(slug, stored)
+        stored = self.__states[slug]
+        now = time.time()
+        if stored is None or now - stored[1] >= self.__max_age:
+            return None
+
+        state, _ = stored
+        cookies = [
+            cookie
+            for cookie in state.get("cookies", [])
+            if cookie.get("expires", -1) < 0 or cookie["expires"] > now
+        ]
+        if len(cookies) != len(state.get("cookies", [])):
+            state = {**state, "cookies": cookies}
+        return None if _is_empty(state) else state
+
+    async def save(self, state: dict[str, Any], proxy: dict[str, str] | None = None):
+        """Store the state of a proxy; empty states are ignored."""
+
+        if _is_empty(state):
+            return
+        slug = _slug(proxy)
+        saved = time.time()
+        self.__states[slug] = (state, saved)
+        await asyncio.to_thread(self.__write, slug, {"saved": saved, "state": state})
+
+    async def capture(
+        self,
+        context: BrowserContext,
+        proxy: dict[str, str] | None = None,
+        force: bool = False,
+    ) -> bool:
+        """
+        Save the current state of a context that uses the proxy.
+
+        Args:
+            force: Capture even if the state was captured less than
+                `refresh_interval` seconds ago.
+
+        Returns:
+            True if the state was captured.
+        """
+
+        slug = _slug(proxy)
+        now = time.monotonic()
+        last = self.__captured.get(slug, None)
+        if not force and last is not None and now - last < self.__refresh_interval:
+            return False
+
+        self.__captured[slug] = now
+        try:
+            state = await context.storage_state()
+        except Exception:
+            # the context was closed in the meantime
+            logger.debug("Failed to capture a storage state", exc_info=True)
+            return False
+        await self.save(state, proxy)
+        return True
+
+    def track(self, context: BrowserContext, proxy: dict[str, str] | None = None):
+        """Capture the state of a context in the background until it is closed."""
+
+        loop = asyncio.get_running_loop()
+        refresher = self.__refresher
+        if refresher is not None and refresher.get_loop() is not loop:
+            # left over from a stopped loop, e.g. before a runner restart; its
+            # contexts went with that loop
+            self.__refresher = refresher = None
+            self.__tracked.clear()
+
+        self.__tracked[context] = proxy
+        context.once("close", lambda _: self.__tracked.pop(context, None))
+        if refresher is None or refresher.done():
+            self.__refresher = loop.create_task(self.__refresh())
+
+    async def close(self):
+        """Capture the tracked contexts a last time and stop refreshing."""
+
+        refresher, self.__refresher = self.__refresher, None
+        if refresher is not None:
+            if refresher.get_loop() is asyncio.get_running_loop():
+                refresher.cancel()
+                await asyncio.gather(refresher, return_exceptions=True)
+            else:
+                self.__tracked.clear()  # contexts of a stopped loop
+        tracked, self.__tracked = self.__tracked, {}
+        for context, proxy in tracked.items():
+            await self.capture(context, proxy, force=True)
+
+    async def __refresh(self):
+        while self.__tracked:
+            await asyncio.sleep(self.__refresh_interval)
+            for context, proxy in list(self.__tracked.items()):
+                await self.capture(context, proxy)
+
+    def __read(self, slug: str) -> tuple[dict[str, Any], float] | None:
+        path = self.__path / f"{slug}.json"
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            return stored["state"], stored["saved"]
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable storage state {path}")
+            return None
+
+    def __write(self, slug: str, stored: dict[str, Any]):
+        path = self.__path / f"{slug}.json"
+        try:
+            self.__path.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.__path)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning(f"Failed to save storage state {path}", exc_info=True)
+
+
+# stores by id() of their config; the config is kept so the id is not reused
+_stores: dict[int, tuple[ScraperConfig, StorageStateStore | None]] = {}
+
+
+def storage_state_for(scraper_config: ScraperConfig) -> StorageStateStore | None:
+    """
+    Return the storage state store of a scraper config, building it on first use.
+
+    The states are kept in a folder named after the config key, under the
+    `storage_state_dir` of the common config.
+
+    Returns:
+        The store, or None if the config has no storage_state section.
+    """
+
+    entry = _stores.get(id(scraper_config), None)
+    if entry is not None:
+        return entry[1]
+
+    settings = scraper_config.storage_state
+    store = None
+    if settings is not None:
+        name = _unsafe.sub("_", scraper_config.key) or "default"
+        store = StorageStateStore(
+            config.common_config.storage_state_dir / name, **settings
+        )
+    _stores[id(scraper_config)] = (scraper_config, store)
+    return store
+
+
+async def close_storage_states():
+    """Capture the tracked contexts of all stores and stop their refreshes."""
+
+    for _, store in list(_stores.values()):
+        if store is not None:
+            await store.close()
@@ -1,3 +1,25 @@
+from .adaptive import AdaptiveConcurrency
 from .async_pool import AsyncPool
+from .job import DeadlineExceeded, JobHandle, JobSpec
+from .limits import KeyLimit, TokenBucket
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .spill import IJobSpill, SqliteJobSpill
+from .stats import HistogramSnapshot, JobEvent, PoolStats
 
-__all__ = ["AsyncPool"]
+__all__ = [
+    "AdaptiveConcurrency",
+    "AsyncPool",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "HistogramSnapshot",
+    "IJobSpill",
+    "JobEvent",
+    "JobHandle",
+    "JobSpec",
+    "KeyLimit",
+    "PoolStats",
+    "RetryPolicy",
+    "SqliteJobSpill",
+    "TokenBucket",
+]
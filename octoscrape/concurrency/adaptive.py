@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller of the number of jobs AsyncPool runs at the same time.
+
+    Every `window` finished jobs the controller looks at the window:
+    - if the error rate is above `max_error_rate`, the mean latency is above
+      `target_latency` or `pressure()` reports overload (>= 1.0), the limit is
+      multiplied by `decrease`;
+    - otherwise the limit grows by `increase`.
+    The limit always stays within [min_concurrency, max_concurrency].
+
+    Long jobs finish windows rarely, so acquire() also polls `pressure()`, at
+    most once per `pressure_interval` seconds, and decreases the limit at once
+    on overload.
+
+    Args:
+        min_concurrency (int): Lower bound of the limit.
+        max_concurrency (int | None): Upper bound of the limit. Defaults to the
+            concurrency of the pool the controller is attached to.
+        initial (int | None): Starting limit. Defaults to `min_concurrency`.
+        target_latency (float | None): Mean job duration in seconds above which
+            the limit is decreased. None disables the latency signal.
+        max_error_rate (float): Share of failed or timed out jobs in a window
+            above which the limit is decreased.
+        pressure (Callable[[], float] | None): External load signal, for
+            example browser RSS divided by its budget. Values >= 1.0 mean
+            overload.
+        increase (int): Additive increase step.
+        decrease (float): Multiplicative decrease factor, in (0, 1).
+        window (int): Number of finished jobs per adjustment.
+        pressure_interval (float): Minimum seconds between two polls of
+            `pressure()` from acquire().
+
+    Example:
+        AsyncPool(
+            64,
+            adaptive=AdaptiveConcurrency(
+                min_concurrency=4,
+                target_latency=10.0,
+                pressure=lambda: browser_rss() / 4e9,
+            ),
+        )
+    """
+
+    def __init__(
+        self,
+        min_concurrency: int = 1,
+        max_concurrency: int | None = None,
+        initial: int | None = None,
+        target_latency: float | None = None,
+        max_error_rate: float = 0.1,
+        pressure: Callable[[], float] | None = None,
+        increase: int = 1,
+        decrease: float = 0.5,
+        window: int = 20,
+        pressure_interval: float = 5.0,
+    ):
+        if min_concurrency < 1:
+            raise ValueError("min_concurrency must be at least 1.")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1.")
+
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.pressure = pressure
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.pressure_interval = pressure_interval
+
+        self._limit = initial if initial is not None else min_concurrency
+        self._admitted = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+        self._samples = 0
+        self._failures = 0
+        self._latency_sum = 0.0
+        self._pressure_polled = -math.inf
+
+    @property
+    def limit(self) -> int:
+        """Current number of jobs allowed to run at the same time."""
+        return self._limit
+
+    def bind(self, concurrency: int):
+        """Clamp the bounds to the concurrency of the owning pool."""
+
+        if self.max_concurrency is None or self.max_concurrency > concurrency:
+            self.max_concurrency = concurrency
+        self.min_concurrency = min(self.min_concurrency, self.max_concurrency)
+        self._set_limit(self._limit)
+
+    async def acquire(self):
+        """Wait until one more job may run."""
+
+        self._poll_pressure()
+        while self._admitted >= self._limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    self._wake()  # pass the wake-up on to the next waiter
+                raise
+        self._admitted += 1
+
+    def release(self):
+        """Give back a slot taken by acquire()."""
+
+        self._admitted -= 1
+        self._wake()
+
+    def record(self, latency: float, failed: bool):
+        """Account a finished job and adjust the limit once per window."""
+
+        self._samples += 1
+        self._latency_sum += latency
+        if failed:
+            self._failures += 1
+
+        if self._samples >= self.window:
+            self._adjust()
+
+    def _adjust(self):
+        error_rate = self._failures / self._samples
+        mean_latency = self._latency_sum / self._samples
+        self._samples = 0
+        self._failures = 0
+        self._latency_sum = 0.0
+
+        congested = error_rate > self.max_error_rate or (
+            self.target_latency is not None and mean_latency > self.target_latency
+        )
+        if not congested and self.pressure is not None:
+            congested = self._overloaded()
+
+        previous = self._limit
+        if congested:
+            self._set_limit(math.floor(self._limit * self.decrease))
+        else:
+            self._set_limit(self._limit + self.increase)
+
+        if self._limit != previous:
+            logger.debug(
+                f"Adaptive concurrency {previous} -> {self._limit} "
+                f"(errors={error_rate:.2f}, latency={mean_latency:.3f}s)"
+            )
+
+    def _poll_pressure(self):
+        """Decrease the limit on overload without waiting for a window."""
+
+        if self.pressure is None:
+            return
+        if time.monotonic() - self._pressure_polled < self.pressure_interval:
+            return
+        if self._overloaded():
+            previous = self._limit
+            self._set_limit(math.floor(self._limit * self.decrease))
+            if self._limit != previous:
+                logger.debug(
+                    f"Adaptive concurrency {previous} -> {self._limit} (pressure)"
+                )
+
+    def _overloaded(self) -> bool:
+        self._pressure_polled = time.monotonic()
+        try:
+            return self.pressure() >= 1.0
+        except Exception:
+            logger.error("Pressure signal raised an exception", exc_info=True)
+            return False
+
+    def _set_limit(self, limit: int):
+        upper = self.max_concurrency if self.max_concurrency is not None else limit
+        self._limit = max(self.min_concurrency, min(limit, upper))
+        self._wake()
+
+    def _wake(self):
+        free = self._limit - self._admitted
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
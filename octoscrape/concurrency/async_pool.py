@@ -1,8 +1,26 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import itertools
 import logging
-from typing import Coroutine
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Iterable,
+)
+
+from .adaptive import AdaptiveConcurrency
+from .job import DeadlineExceeded, Job, JobHandle, JobSpec
+from .limits import KeyLimit, KeyLimiter
+from .retry import Circuit, CircuitBreaker, CircuitOpenError, RetryPolicy
+from .spill import IJobSpill
+from .stats import JobEvent, PoolMetrics, PoolStats
 
 logger = logging.getLogger(__name__)
 
@@ -11,22 +29,113 @@ class AsyncPool:
     """
     Coroutine manager that limits concurrency.
 
+    Queued jobs are started in priority order (lower value first); jobs with
+    the same priority are started in submission order.
+
+    submit() returns a JobHandle that can be awaited for the result of the job;
+    map() and as_completed() stream results of many jobs as they finish.
+
+    Jobs may be tagged with a key (for example a domain or a proxy). Keys with a
+    KeyLimit are capped in running jobs and start rate; a job that is blocked by
+    its key is parked aside and does not hold a worker, so other keys keep the
+    pool busy.
+
+    Jobs submitted as coroutine factories can be retried with a RetryPolicy;
+    the backoff is spent outside the pool, without holding a slot. With a
+    CircuitBreaker, a key whose jobs keep failing is cut off for a while and its
+    jobs fail fast instead of taking slots.
+
+    Jobs can be given an execution timeout; a job that runs longer is cancelled
+    and fails with TimeoutError (which a RetryPolicy may retry). drain() and
+    stop() accept a time budget after which remaining jobs are cancelled and
+    reported as abandoned.
+
+    With `max_queued` the queue is bounded: submit() waits for a free slot, so
+    producers cannot run ahead of the workers. Jobs described by a JobSpec can
+    instead be enqueued into a spill (for example SqliteJobSpill) when the queue
+    is full; they are loaded back as slots free up, so memory stays flat however
+    much work is queued.
+
+    The pool keeps counters and duration histograms of its jobs, see stats().
+
     Args:
         concurrency (int): Maximum number of coroutines that can run concurrently.
+        key_limits (dict[str, KeyLimit] | None): Limits for specific keys.
+        default_key_limit (KeyLimit | None): Limit for keys missing in
+            `key_limits`. None means such keys are not limited.
+        adaptive (AdaptiveConcurrency | None): Controller that tunes the number
+            of running jobs between its bounds at runtime; `concurrency` is then
+            the upper bound. None keeps the limit fixed at `concurrency`.
+        on_job_done (Callable[[JobEvent], None] | None): Hook called with the
+            outcome and timings of every finished, failed, cancelled or expired
+            job. It runs on the event loop and must not block.
+        retry (RetryPolicy | None): Default retry policy of jobs submitted as
+            coroutine factories.
+        circuit_breaker (CircuitBreaker | None): Circuit breaker settings
+            applied to every key. None disables circuit breaking.
+        job_timeout (float | None): Default execution timeout of a job attempt,
+            in seconds. None means no timeout.
+        max_queued (int | None): Maximum number of jobs waiting in the queue.
+            None means the queue is unbounded.
+        spill (IJobSpill | None): Overflow storage for enqueue() when the
+            bounded queue is full. Requires `max_queued`.
     Example:
         pool = AsyncPool(concurrency=5)
         with AsyncPool(concurrency=5) as pool: ...
+        AsyncPool(50, key_limits={"example.com": KeyLimit(max_in_flight=2, rate=1)})
+        AsyncPool(50, max_queued=500, spill=SqliteJobSpill("spill.sqlite"))
     """
 
-    def __init__(self, concurrency: int):
+    def __init__(
+        self,
+        concurrency: int,
+        key_limits: dict[str, KeyLimit] | None = None,
+        default_key_limit: KeyLimit | None = None,
+        adaptive: AdaptiveConcurrency | None = None,
+        on_job_done: Callable[[JobEvent], None] | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        job_timeout: float | None = None,
+        max_queued: int | None = None,
+        spill: IJobSpill | None = None,
+    ):
+        if max_queued is not None and max_queued < 1:
+            raise ValueError("max_queued must be at least 1.")
+        if spill is not None and max_queued is None:
+            raise ValueError("A spill requires a bounded queue, set max_queued.")
+
         self.__concurency = concurrency
-        self._sem = asyncio.Semaphore(self.__concurency)
-        self._queue: asyncio.Queue[Coroutine] = asyncio.Queue()
+        self._queue: asyncio.PriorityQueue[Job] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+
+        self._key_limits: dict[str, KeyLimit] = dict(key_limits or {})
+        self._default_key_limit = default_key_limit
+        self._limiters: dict[str, KeyLimiter] = {}
+
+        self._adaptive = adaptive
+        if adaptive is not None:
+            adaptive.bind(concurrency)
+
+        self._retry = retry
+        self._backoff: dict[Job, asyncio.TimerHandle] = {}
+        self._circuit_breaker = circuit_breaker
+        self._circuits: dict[str, Circuit] = {}
+
+        self._job_timeout = job_timeout
+
+        self._max_queued = max_queued
+        self._spill = spill
+        self._space_waiters: deque[asyncio.Future] = deque()
+        self._jobs: dict[str, Callable[..., Coroutine]] = {}
+
+        self._metrics = PoolMetrics()
+        self._on_job_done = on_job_done
 
         self._workers: list[asyncio.Task] = []
-        self._active_tasks: set[asyncio.Task] = set()
+        self._active_tasks: dict[asyncio.Task, Job] = {}
 
         self._stopped = True
+        self._closing = False
 
         logger.debug(f"AsyncPool({self.__concurency}) created")
 
@@ -34,6 +143,29 @@ class AsyncPool:
     def is_stopped(self):
         return self._stopped
 
+    @property
+    def concurrency(self) -> int:
+        """Number of jobs currently allowed to run at the same time."""
+        if self._adaptive is not None:
+            return self._adaptive.limit
+        return self.__concurency
+
+    def stats(self) -> PoolStats:
+        """
+        Snapshot of the pool counters.
+
+        `queued` counts jobs waiting in the queue or the spill, parked by their
+        key or waiting for a retry; `queue_wait` and `run_time` summarise job
+        durations in seconds.
+        """
+
+        parked = sum(len(limiter.parked) for limiter in self._limiters.values())
+        spilled = len(self._spill) if self._spill is not None else 0
+        return self._metrics.snapshot(
+            queued=self._queue.qsize() + parked + len(self._backoff) + spilled,
+            in_flight=len(self._active_tasks),
+        )
+
     async def __aenter__(self) -> AsyncPool:
         await self.start()
         return self
@@ -47,18 +179,36 @@ class AsyncPool:
         """Launch workers (based on concurrency)."""
 
         self._stopped = False
+        self._closing = False
         for _ in range(self.__concurency):
             worker = asyncio.create_task(self._worker())
             self._workers.append(worker)
 
+        # pick up jobs spilled by a previous run
+        self._fill_queue()
+
         logger.debug(f"AsyncPool({self.__concurency}) started")
 
-    async def stop(self):
-        """Stop gracefully: no new tasks, cancel active ones."""
+    async def stop(self, grace: float = 0) -> list[JobHandle]:
+        """
+        Stop gracefully: no new tasks, cancel active ones.
 
-        self._stopped = True
+        Spilled jobs are left in the spill for the next run.
+
+        Args:
+            grace: Seconds to let queued and running jobs finish before they are
+                cancelled. 0 cancels them right away.
+
+        Returns:
+            Handles of the jobs that were cancelled by the stop.
+        """
 
-        await self.cancel_all()
+        self._closing = True
+        if grace > 0:
+            abandoned = await self.drain(timeout=grace)
+        else:
+            abandoned = await self._cancel_jobs()
+        self._stopped = True
 
         # cancel worker tasks
         for w in self._workers:
@@ -69,68 +219,694 @@ class AsyncPool:
         self._workers.clear()
 
         logger.debug(f"AsyncPool({self.__concurency}) stopped")
+        return abandoned
+
+    def register_job(self, name: str, fn: Callable[..., Coroutine]):
+        """
+        Register a coroutine function that JobSpec jobs can refer to by name.
 
-    async def submit(self, coro: Coroutine):
+        Example:
+            pool.register_job("fetch", fetch)
+        """
+        self._jobs[name] = fn
+
+    async def submit(
+        self,
+        coro: Coroutine | Callable[[], Coroutine] | JobSpec,
+        priority: int = 0,
+        deadline: float | None = None,
+        key: str | None = None,
+        retry: RetryPolicy | None = None,
+        timeout: float | None = None,
+    ) -> JobHandle:
         """
         Submit a coroutine to execution.
 
+        Args:
+            coro: Coroutine to execute, or a factory returning a new coroutine
+                for every attempt, or a JobSpec of a registered job. Only
+                factories and specs can be retried.
+            priority: Lower value is started first. Defaults to 0.
+            deadline: Seconds from submission within which the job must be
+                started. A job that is still queued after its deadline is
+                dropped without taking a slot. None means no deadline.
+            key: Key whose limits apply to the job. None means no key limits.
+            retry: Retry policy of a factory job. Defaults to the pool policy.
+            timeout: Execution timeout of an attempt, in seconds. Defaults to
+                the pool `job_timeout`.
+
+        Returns:
+            JobHandle: awaitable handle with the result of the job. A job dropped
+            after its deadline raises DeadlineExceeded; a job rejected by an open
+            circuit raises CircuitOpenError.
+
+        With a bounded queue, submit() waits until the queue has room.
+
         Raises:
             RuntimeError: if pool stopped
+            ValueError: if a retry policy is given for a coroutine, or the job
+                of a JobSpec is not registered
         """
 
-        if self._stopped:
+        self._check_open()
+        if isinstance(coro, JobSpec):
+            name = coro.name
+            coro = self._spec_factory(coro)
+        else:
+            name = None
+
+        try:
+            await self._wait_for_space()
+            self._check_open()
+        except BaseException:
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise
+
+        now = asyncio.get_running_loop().time()
+        if deadline is not None:
+            deadline += now
+        job = self._put(coro, priority, deadline, key, retry, timeout, now, name)
+        self._metrics.submitted += 1
+        return JobHandle(job)
+
+    async def enqueue(
+        self,
+        spec: JobSpec,
+        priority: int = 0,
+        deadline: float | None = None,
+        key: str | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Submit a job without keeping a handle to it.
+
+        When the bounded queue is full the job is written to the spill instead
+        of waiting; without a spill, enqueue() waits like submit(). Outcomes are
+        reported through `on_job_done` and stats() only. Spilled jobs use the
+        pool retry policy.
+
+        Args:
+            spec: Job to run; its arguments must be JSON-serializable.
+            priority, deadline, key, timeout: As for submit().
+
+        Raises:
+            RuntimeError: if pool stopped
+            ValueError: if the job of the spec is not registered
+        """
+
+        self._check_open()
+        if self._spill is None or self._has_space():
+            await self.submit(spec, priority, deadline, key, timeout=timeout)
+            return
+
+        self._spec_factory(spec)  # fail now rather than when loaded back
+        self._spill.push(
+            priority,
+            {
+                "name": spec.name,
+                "args": spec.args,
+                "kwargs": spec.kwargs,
+                "priority": priority,
+                "deadline": time.time() + deadline if deadline is not None else None,
+                "key": key,
+                "timeout": timeout,
+            },
+        )
+        self._metrics.submitted += 1
+
+    def _check_open(self):
+        if self._stopped or self._closing:
             raise RuntimeError("Pool stopped: cannot submit new jobs.")
-        await self._queue.put(coro)
+
+    def _spec_factory(self, spec: JobSpec) -> Callable[[], Coroutine]:
+        """Turn a JobSpec into a coroutine factory of its registered job."""
+
+        fn = self._jobs.get(spec.name, None)
+        if fn is None:
+            raise ValueError(f"Job '{spec.name}' is not registered.")
+        return functools.partial(fn, *spec.args, **spec.kwargs)
+
+    def _put(
+        self,
+        coro: Coroutine | Callable[[], Coroutine],
+        priority: int,
+        deadline: float | None,
+        key: str | None,
+        retry: RetryPolicy | None,
+        timeout: float | None,
+        now: float,
+        name: str | None = None,
+    ) -> Job:
+        """Create a job and put it in the queue, ignoring its bound."""
+
+        if retry is None and not asyncio.iscoroutine(coro):
+            retry = self._retry
+
+        job = Job(
+            coro,
+            priority,
+            deadline,
+            key,
+            next(self._seq),
+            asyncio.get_running_loop().create_future(),
+            submitted=now,
+            retry=retry,
+            timeout=timeout if timeout is not None else self._job_timeout,
+        )
+        if name is not None:
+            job.name = name
+        self._queue.put_nowait(job)
+        return job
+
+    def _has_space(self) -> bool:
+        return self._max_queued is None or self._queue.qsize() < self._max_queued
+
+    async def _wait_for_space(self):
+        """Wait until the bounded queue can take another job."""
+
+        while not self._has_space():
+            waiter = asyncio.get_running_loop().create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # pass the free slot on to the next producer
+                    self._fill_queue()
+                raise
+            finally:
+                if waiter in self._space_waiters:
+                    self._space_waiters.remove(waiter)
+
+    def _fill_queue(self):
+        """
+        Hand free queue slots to waiting producers first, then to spilled jobs.
+        """
+
+        if self._max_queued is None:
+            return
+
+        free = self._max_queued - self._queue.qsize()
+        while free > 0 and self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+        # a stopping pool leaves the spilled jobs for the next run
+        if free <= 0 or self._closing or self._spill is None or not len(self._spill):
+            return
+
+        now = asyncio.get_running_loop().time()
+        wall = time.time()
+        for record in self._spill.pop(free):
+            spec = JobSpec(record["name"], *record["args"], **record["kwargs"])
+            try:
+                factory = self._spec_factory(spec)
+            except ValueError:
+                self._metrics.failed += 1
+                logger.error(f"Spilled job {spec!r} dropped: job is not registered")
+                continue
+
+            deadline = record["deadline"]
+            if deadline is not None:
+                deadline = now + deadline - wall
+            self._put(
+                factory,
+                record["priority"],
+                deadline,
+                record["key"],
+                None,
+                record["timeout"],
+                now,
+                spec.name,
+            )
+
+    async def as_completed(
+        self,
+        coros: Iterable[Coroutine] | AsyncIterable[Coroutine],
+        prefetch: int | None = None,
+        **submit_kwargs,
+    ) -> AsyncIterator[JobHandle]:
+        """
+        Submit coroutines and yield their handles in completion order.
+
+        Coroutines are pulled lazily from `coros`, so at most `prefetch` of them
+        exist at any time. Closing the iterator early cancels the jobs that are
+        still pending.
+
+        Args:
+            coros: Iterable or async iterable of coroutines.
+            prefetch: Maximum number of submitted, not yet yielded jobs.
+                Defaults to twice the pool concurrency.
+            **submit_kwargs: Passed to submit() for every job.
+
+        Example:
+            async for handle in pool.as_completed(fetch(u) for u in urls):
+                page = handle.result()
+        """
+
+        if prefetch is None:
+            prefetch = max(1, 2 * self.__concurency)
+
+        if isinstance(coros, AsyncIterable):
+            next_coro = aiter(coros).__anext__
+        else:
+            source = iter(coros)
+
+            async def next_coro():
+                try:
+                    return next(source)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        finished: asyncio.Queue[JobHandle] = asyncio.Queue()
+        pending: set[JobHandle] = set()
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < prefetch:
+                    try:
+                        coro = await next_coro()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+
+                    handle = await self.submit(coro, **submit_kwargs)
+                    pending.add(handle)
+                    handle.add_done_callback(finished.put_nowait)
+
+                if not pending:
+                    return
+
+                handle = await finished.get()
+                pending.discard(handle)
+                yield handle
+        finally:
+            for handle in pending:
+                handle.cancel()
+
+    async def map(
+        self,
+        fn: Callable[[Any], Coroutine],
+        iterable: Iterable | AsyncIterable,
+        prefetch: int | None = None,
+        **submit_kwargs,
+    ) -> AsyncIterator[Any]:
+        """
+        Run `fn(item)` for every item and yield results in completion order.
+
+        Items are consumed lazily with at most `prefetch` jobs in flight. The
+        first failed job raises its exception and cancels the pending ones.
+
+        Example:
+            async for page in pool.map(fetch, urls, key="example.com"):
+                ...
+        """
+
+        if isinstance(iterable, AsyncIterable):
+            coros = (fn(item) async for item in iterable)
+        else:
+            coros = (fn(item) for item in iterable)
+
+        results = self.as_completed(coros, prefetch, **submit_kwargs)
+        try:
+            async for handle in results:
+                yield handle.result()
+        finally:
+            await results.aclose()
 
     async def _worker(self):
-        """Worker continuously pulls jobs from the queue."""
+        """
+        Worker pulls jobs from the queue.
+
+        An idle worker sleeps on the queue until a job arrives or the worker
+        is cancelled by stop(). Without an adaptive controller the number of
+        workers is the concurrency limit; with it, a worker also has to get a
+        slot from the controller before it takes a job.
+        """
 
         try:
             while not self._stopped:
-                try:
-                    coro = await asyncio.wait_for(self._queue.get(), timeout=0.1)
-                except asyncio.TimeoutError:
+                if self._adaptive is None:
+                    await self._dispatch(await self._take())
                     continue
 
-                async with self._sem:
-                    task = asyncio.create_task(coro)
-                    self._active_tasks.add(task)
-
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-                    except Exception:
-                        print("Worker task raised an exception")
-                        logger.error("Worker task raised an exception", exc_info=True)
-                    finally:
-                        self._active_tasks.discard(task)
-                        self._queue.task_done()
+                await self._adaptive.acquire()
+                try:
+                    await self._dispatch(await self._take())
+                finally:
+                    self._adaptive.release()
 
         except asyncio.CancelledError:
             pass
 
-    async def drain(self):
-        """Wait until all queued tasks finish."""
+    async def _take(self) -> Job:
+        """Get the next job; its slot goes to a producer or a spilled job."""
+
+        job = await self._queue.get()
+        # refill before the job is done, so drain() waits for spilled jobs too
+        self._fill_queue()
+        return job
+
+    async def _dispatch(self, job: Job):
+        """Run a dequeued job, or set it aside if it cannot start now."""
+
+        now = asyncio.get_running_loop().time()
+
+        if job.future.done():
+            # cancelled through its handle while queued
+            self._discard(job)
+            return
+
+        if job.is_expired(now):
+            self._drop_expired(job)
+            return
+
+        circuit = self._circuit(job.key)
+        if circuit is not None and not circuit.allow(now):
+            self._reject(job, circuit, now)
+            return
+
+        limiter = self._limiter(job.key)
+        if limiter is not None and not limiter.try_acquire(now):
+            if circuit is not None:
+                circuit.record_cancelled()
+            self._park(job, limiter)
+            return
+
+        rescheduled = False
+        try:
+            rescheduled = await self._run(job)
+        finally:
+            if limiter is not None:
+                limiter.release()
+                self._unpark(job.key)
+            if not rescheduled:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> bool:
+        """
+        Execute a job and publish its outcome through the job future.
+
+        Returns:
+            True if the job failed and was scheduled for a retry.
+        """
+
+        loop = asyncio.get_running_loop()
+        try:
+            coro = job.next_attempt()
+        except Exception as e:
+            # the factory itself failed, there is nothing to retry
+            job.set_exception(e)
+            self._finish(job, "failed", loop.time() - job.submitted, None)
+            logger.error("Job factory raised an exception", exc_info=True)
+            return False
+
+        task = asyncio.create_task(coro)
+        job.task = task
+        self._active_tasks[task] = job
+
+        started = loop.time()
+        queue_wait = started - job.submitted
+        self._metrics.started += 1
+        self._metrics.queue_wait.record(queue_wait)
+
+        timeout = asyncio.timeout(job.timeout)
+        try:
+            async with timeout:
+                result = await task
+            job.set_result(result)
+            self._finish(job, "completed", queue_wait, loop.time() - started)
+        except asyncio.CancelledError:
+            job.cancel()
+            self._finish(job, "cancelled", queue_wait, loop.time() - started)
+            # the worker itself is being cancelled, not just the job
+            if asyncio.current_task().cancelling():
+                raise
+        except Exception as e:
+            if isinstance(e, TimeoutError) and timeout.expired():
+                e = TimeoutError(f"Job {job.name} timed out after {job.timeout}s")
+            if self._retry_later(job, e):
+                self._finish(job, "retried", queue_wait, loop.time() - started)
+                logger.warning(f"Job {job.name} failed, retrying: {e!r}")
+                return True
+            job.set_exception(e)
+            self._finish(job, "failed", queue_wait, loop.time() - started)
+            logger.error("Worker task raised an exception", exc_info=True)
+        finally:
+            self._active_tasks.pop(task, None)
+
+        return False
+
+    def _finish(
+        self, job: Job, outcome: str, queue_wait: float, run_time: float | None
+    ):
+        """Account the outcome of a job in metrics, controller and hook."""
+
+        metrics = self._metrics
+        if outcome == "completed":
+            metrics.completed += 1
+        elif outcome == "failed":
+            metrics.failed += 1
+        elif outcome == "retried":
+            metrics.retried += 1
+        elif outcome == "cancelled":
+            metrics.cancelled += 1
+        else:
+            metrics.expired += 1
+
+        # only attempts that actually ran say something about the target
+        if run_time is not None:
+            circuit = self._circuits.get(job.key, None)
+            if outcome == "cancelled":
+                if circuit is not None:
+                    circuit.record_cancelled()
+            else:
+                failed = outcome != "completed"
+                metrics.run_time.record(run_time)
+                if self._adaptive is not None:
+                    self._adaptive.record(run_time, failed=failed)
+                if circuit is not None:
+                    if failed:
+                        circuit.record_failure(asyncio.get_running_loop().time())
+                    else:
+                        circuit.record_success()
+
+        if self._on_job_done is not None:
+            try:
+                self._on_job_done(
+                    JobEvent(job.name, job.key, outcome, queue_wait, run_time)
+                )
+            except Exception:
+                logger.error("on_job_done hook raised an exception", exc_info=True)
+
+    def _drop_expired(self, job: Job):
+        """Discard a job whose deadline passed before it was started."""
+
+        logger.warning(f"Job {job.name} dropped: deadline passed before start")
+        job.set_exception(DeadlineExceeded(f"Job {job.name} missed its deadline"))
+        self._discard(job, "expired")
+
+    def _discard(self, job: Job, outcome: str = "cancelled"):
+        """Close a job that will never start and mark it done in the queue."""
+
+        job.cancel()
+        queue_wait = asyncio.get_running_loop().time() - job.submitted
+        self._finish(job, outcome, queue_wait, None)
+        try:
+            job.close()
+        except (RuntimeError, GeneratorExit) as e:
+            logger.warning(f"Expected exception when closing coroutine: {e}")
+        self._queue.task_done()
+
+    def _circuit(self, key: str | None) -> Circuit | None:
+        """Return the circuit of a key, creating it on first use."""
 
-        await self._queue.join()
+        if key is None or self._circuit_breaker is None:
+            return None
 
-    async def cancel_all(self):
-        """Cancel all actively running tasks AND clear queue."""
+        circuit = self._circuits.get(key, None)
+        if circuit is None:
+            circuit = Circuit(self._circuit_breaker)
+            self._circuits[key] = circuit
+        return circuit
+
+    def _reject(self, job: Job, circuit: Circuit, now: float):
+        """Fail, or retry later, a job whose key has an open circuit."""
+
+        job.attempt += 1
+        exc = CircuitOpenError(f"Circuit of key '{job.key}' is open")
+        if self._retry_later(job, exc, min_delay=circuit.retry_after(now)):
+            return
+
+        job.set_exception(exc)
+        self._finish(job, "failed", now - job.submitted, None)
+        job.close()
+        self._queue.task_done()
+
+    def _retry_later(self, job: Job, exc: Exception, min_delay: float = 0.0) -> bool:
+        """
+        Schedule the next attempt of a failed job if its policy allows it.
+
+        The job waits for its backoff on a timer, not in a worker, and stays
+        unfinished for the queue, so drain() keeps waiting for it.
+        """
+
+        if job.retry is None or not job.retry.should_retry(job.attempt, exc):
+            return False
+
+        job.task = None
+        job.coro = None
+        delay = max(min_delay, job.retry.delay(job.attempt))
+        loop = asyncio.get_running_loop()
+        self._backoff[job] = loop.call_later(delay, self._requeue, job)
+        return True
+
+    def _requeue(self, job: Job):
+        """Put a job back in the queue after its backoff."""
+
+        del self._backoff[job]
+        job.submitted = asyncio.get_running_loop().time()
+        # requeue before task_done() so the unfinished count never hits zero
+        self._queue.put_nowait(job)
+        self._queue.task_done()
+
+    def _limiter(self, key: str | None) -> KeyLimiter | None:
+        """Return the limiter of a key, creating it on first use."""
+
+        if key is None:
+            return None
+
+        limiter = self._limiters.get(key, None)
+        if limiter is None:
+            limit = self._key_limits.get(key, self._default_key_limit)
+            if limit is None:
+                return None
+            limiter = KeyLimiter(limit, asyncio.get_running_loop().time())
+            self._limiters[key] = limiter
+        return limiter
+
+    def _park(self, job: Job, limiter: KeyLimiter):
+        """
+        Set aside a job blocked by its key limits.
+
+        The job stays unfinished for the queue, so drain() keeps waiting for it.
+        """
+
+        limiter.park(job)
+        self._schedule_unpark(job.key, limiter)
+
+    def _schedule_unpark(self, key: str, limiter: KeyLimiter):
+        """Arrange a wake-up for parked jobs throttled by the token bucket."""
+
+        if limiter.timer is not None or not limiter.parked:
+            return
+
+        loop = asyncio.get_running_loop()
+        delay = limiter.retry_after(loop.time())
+        if delay is not None:
+            limiter.timer = loop.call_later(delay, self._unpark, key)
+
+    def _unpark(self, key: str):
+        """Return parked jobs of a key to the queue as far as its limits allow."""
+
+        limiter = self._limiters[key]
+        if limiter.timer is not None:
+            limiter.timer.cancel()
+            limiter.timer = None
+
+        for job in limiter.unpark(asyncio.get_running_loop().time()):
+            # requeue before task_done() so the unfinished count never hits zero
+            self._queue.put_nowait(job)
+            self._queue.task_done()
+
+        self._schedule_unpark(key, limiter)
+
+    async def drain(self, timeout: float | None = None) -> list[JobHandle]:
+        """
+        Wait until all queued tasks finish.
+
+        Args:
+            timeout: Seconds to wait. When it runs out, the jobs that are still
+                queued or running are cancelled; spilled jobs are kept. None
+                waits without limit.
+
+        Returns:
+            Handles of the jobs cancelled because the timeout ran out.
+        """
+
+        try:
+            async with asyncio.timeout(timeout):
+                await self._queue.join()
+        except TimeoutError:
+            abandoned = await self._cancel_jobs()
+            logger.warning(
+                f"AsyncPool drain timed out after {timeout}s, abandoned "
+                f"{len(abandoned)} jobs: {', '.join(h.name for h in abandoned)}"
+            )
+            return abandoned
+        return []
+
+    async def cancel_all(self) -> list[JobHandle]:
+        """
+        Cancel all actively running tasks AND clear queue and spill.
+
+        Returns:
+            Handles of the cancelled jobs.
+        """
+
+        # spilled jobs have no handles, they are only counted
+        if self._spill is not None:
+            dropped = self._spill.clear()
+            if dropped:
+                self._metrics.cancelled += dropped
+                logger.warning(f"AsyncPool dropped {dropped} spilled jobs")
+
+        return await self._cancel_jobs()
+
+    async def _cancel_jobs(self) -> list[JobHandle]:
+        """Cancel the running, queued, retrying and parked jobs; keep the spill."""
+
+        cancelled: list[Job] = []
 
         # cancel active
-        for task in list(self._active_tasks):
+        for task, job in list(self._active_tasks.items()):
             task.cancel()
+            cancelled.append(job)
 
         # remove queued jobs
         while not self._queue.empty():
             try:
-                coro = self._queue.get_nowait()
-                self._queue.task_done()
-                coro.close()
+                job = self._queue.get_nowait()
             except asyncio.QueueEmpty:
                 break
-            except (RuntimeError, GeneratorExit) as e:
-                logger.warning(f"Expected exception when closing coroutine: {e}")
+            if not job.future.done():
+                cancelled.append(job)
+            self._discard(job)
+
+        # remove jobs waiting for a retry
+        for job, timer in list(self._backoff.items()):
+            timer.cancel()
+            cancelled.append(job)
+            self._discard(job)
+        self._backoff.clear()
+
+        # remove parked jobs
+        for limiter in self._limiters.values():
+            if limiter.timer is not None:
+                limiter.timer.cancel()
+                limiter.timer = None
+            for job in limiter.parked:
+                if not job.future.done():
+                    cancelled.append(job)
+                self._discard(job)
+            limiter.parked.clear()
+
+        # the queue is empty now, let waiting producers in
+        self._fill_queue()
 
         await asyncio.sleep(0)  # let cancellations propagate
+        return [JobHandle(job) for job in cancelled]
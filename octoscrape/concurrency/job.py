@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Coroutine
+
+from .retry import RetryPolicy
+
+
+class DeadlineExceeded(Exception):
+    """Raised by a job handle when the job was dropped before it could start."""
+
+
+class JobSpec:
+    """
+    Serializable description of a job: the name of a job function registered
+    with AsyncPool.register_job() and its arguments.
+
+    Unlike a coroutine, a spec can be written to a spill and run later, so
+    arguments must be JSON-serializable.
+
+    Example:
+        pool.register_job("fetch", fetch)
+        await pool.enqueue(JobSpec("fetch", url, retries=2))
+    """
+
+    __slots__ = ("name", "args", "kwargs")
+
+    def __init__(self, name: str, *args: Any, **kwargs: Any):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return f"JobSpec({self.name!r}, *{self.args!r}, **{self.kwargs!r})"
+
+
+class Job:
+    """
+    Queued unit of work.
+
+    Jobs are ordered by priority (lower value runs first), then by submission
+    order, so jobs of equal priority keep FIFO semantics.
+
+    A job is either a coroutine, which can run once, or a coroutine factory,
+    which is called for every attempt and so can be retried.
+    """
+
+    __slots__ = (
+        "coro",
+        "factory",
+        "retry",
+        "attempt",
+        "name",
+        "priority",
+        "deadline",
+        "key",
+        "seq",
+        "future",
+        "submitted",
+        "timeout",
+        "task",
+    )
+
+    def __init__(
+        self,
+        coro: Coroutine | Callable[[], Coroutine],
+        priority: int,
+        deadline: float | None,
+        key: str | None,
+        seq: int,
+        future: asyncio.Future,
+        submitted: float,
+        retry: RetryPolicy | None = None,
+        timeout: float | None = None,
+    ):
+        if asyncio.iscoroutine(coro):
+            self.coro: Coroutine | None = coro
+            self.factory = None
+        elif callable(coro):
+            self.coro = None
+            self.factory = coro
+        else:
+            raise TypeError(f"Expected a coroutine or a coroutine factory: {coro!r}")
+
+        if retry is not None and self.factory is None:
+            raise ValueError("A coroutine cannot be retried, submit a factory.")
+
+        self.retry = retry
+        self.attempt = 0
+        self.name: str = getattr(coro, "__qualname__", repr(coro))
+        self.priority = priority
+        self.deadline = deadline
+        self.key = key
+        self.seq = seq
+        self.future = future
+        self.submitted = submitted
+        self.timeout = timeout
+        self.task: asyncio.Task | None = None
+
+    def __lt__(self, other: Job) -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def next_attempt(self) -> Coroutine:
+        """Return the coroutine of the next attempt."""
+
+        self.attempt += 1
+        if self.factory is not None:
+            self.coro = self.factory()
+        return self.coro
+
+    def close(self):
+        """Close a coroutine that was created but will not run."""
+
+        if self.coro is not None:
+            self.coro.close()
+            self.coro = None
+
+    def is_expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+    def set_result(self, result: Any):
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def set_exception(self, exc: BaseException):
+        if not self.future.done():
+            self.future.set_exception(exc)
+            # the pool already reported the failure, nobody has to retrieve it
+            self.future.exception()
+
+    def cancel(self):
+        self.future.cancel()
+
+
+class JobHandle:
+    """
+    Awaitable handle of a job submitted to AsyncPool.
+
+    Awaiting the handle returns the result of the job or raises its exception.
+    Cancelling the awaiting task does not cancel the job; use cancel() for that.
+
+    Example:
+        handle = await pool.submit(fetch(url))
+        page = await handle
+    """
+
+    __slots__ = ("_job",)
+
+    def __init__(self, job: Job):
+        self._job = job
+
+    def __await__(self):
+        return asyncio.shield(self._job.future).__await__()
+
+    def __repr__(self) -> str:
+        if self.cancelled():
+            state = "cancelled"
+        elif self.done():
+            state = "done"
+        elif self._job.task is not None:
+            state = "running"
+        else:
+            state = "pending"
+        return f"<JobHandle {self.name} {state}>"
+
+    @property
+    def name(self) -> str:
+        """Qualified name of the job coroutine or coroutine factory."""
+        return self._job.name
+
+    @property
+    def attempts(self) -> int:
+        """Number of attempts started so far."""
+        return self._job.attempt
+
+    def done(self) -> bool:
+        """Whether the job finished, failed, was cancelled or dropped."""
+        return self._job.future.done()
+
+    def cancelled(self) -> bool:
+        return self._job.future.cancelled()
+
+    def result(self) -> Any:
+        """
+        Return the result of a finished job.
+
+        Raises:
+            asyncio.InvalidStateError: if the job is not done yet.
+            asyncio.CancelledError: if the job was cancelled.
+            Exception: the exception raised by the job.
+        """
+        return self._job.future.result()
+
+    def exception(self) -> BaseException | None:
+        return self._job.future.exception()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job: a queued job is discarded, a running one is cancelled.
+
+        Returns:
+            False if the job is already done, True otherwise.
+        """
+
+        if self.done():
+            return False
+        if self._job.task is not None:
+            self._job.task.cancel()
+        else:
+            self._job.cancel()
+        return True
+
+    def add_done_callback(self, fn: Callable[[JobHandle], Any]):
+        """Call `fn(handle)` once the job is done."""
+        self._job.future.add_done_callback(lambda _: fn(self))
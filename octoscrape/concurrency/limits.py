@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+
+
+class KeyLimit:
+    """
+    Limits applied to all jobs sharing a key (for example a domain or a proxy).
+
+    Args:
+        max_in_flight (int | None): Maximum number of jobs with this key running
+            at the same time. None means unlimited.
+        rate (float | None): Sustained number of job starts per second.
+            None means unlimited.
+        burst (int | None): Number of starts that may happen back to back before
+            `rate` applies. Defaults to max(1, rate).
+
+    Example:
+        KeyLimit(max_in_flight=4, rate=2.0, burst=5)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+    ):
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive.")
+
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, math.ceil(rate or 1))
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (int): Bucket capacity; the bucket starts full.
+        now (float): Current time, as returned by the event loop clock.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = now
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def available(self, now: float) -> int:
+        """Number of whole tokens available at `now`."""
+        self._refill(now)
+        return int(self._tokens)
+
+    def try_acquire(self, now: float) -> bool:
+        """Take one token if available."""
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def delay(self, now: float) -> float:
+        """Seconds until at least one token is available."""
+        self._refill(now)
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class KeyLimiter:
+    """
+    Runtime state of one key: running jobs, token bucket and parked jobs.
+
+    Jobs that cannot start because of the key limits are parked here instead
+    of holding a pool worker, and are handed back to the pool when the key
+    has capacity again.
+    """
+
+    def __init__(self, limit: KeyLimit, now: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.bucket = None
+        if limit.rate is not None:
+            self.bucket = TokenBucket(limit.rate, limit.burst, now)
+        self.parked: list = []
+        self.timer: asyncio.TimerHandle | None = None
+
+    def try_acquire(self, now: float) -> bool:
+        """Reserve a start for one job if the key limits allow it."""
+
+        if (
+            self.limit.max_in_flight is not None
+            and self.in_flight >= self.limit.max_in_flight
+        ):
+            return False
+        if self.bucket is not None and not self.bucket.try_acquire(now):
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        """Mark one job of this key as finished."""
+        self.in_flight -= 1
+
+    def park(self, job):
+        heapq.heappush(self.parked, job)
+
+    def unpark(self, now: float) -> list:
+        """Pop the parked jobs that could start now, highest priority first."""
+
+        count = len(self.parked)
+        if self.limit.max_in_flight is not None:
+            count = min(count, self.limit.max_in_flight - self.in_flight)
+        if self.bucket is not None:
+            count = min(count, self.bucket.available(now))
+        return [heapq.heappop(self.parked) for _ in range(max(0, count))]
+
+    def retry_after(self, now: float) -> float | None:
+        """
+        Seconds until parked jobs may be admitted by the token bucket.
+
+        Returns None if admission is only waiting for running jobs to finish.
+        """
+
+        if (
+            self.limit.max_in_flight is not None
+            and self.in_flight >= self.limit.max_in_flight
+        ):
+            return None
+        if self.bucket is not None:
+            return self.bucket.delay(now)
+        return 0.0
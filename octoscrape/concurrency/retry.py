@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+
+
+class CircuitOpenError(Exception):
+    """Raised by a job handle when the circuit of the job key is open."""
+
+
+class RetryPolicy:
+    """
+    How a failed job is retried.
+
+    The delay before retry n (starting at 1) is drawn uniformly from
+    [0, min(max_delay, base_delay * multiplier ** (n - 1))] ("full jitter"),
+    so retries of many jobs that failed together are spread out.
+
+    Args:
+        max_attempts (int): Total number of attempts, the first one included.
+        base_delay (float): Backoff of the first retry, in seconds.
+        max_delay (float): Upper bound of the backoff, in seconds.
+        multiplier (float): Backoff growth per retry.
+        jitter (bool): Randomise the delay; False uses the upper bound.
+        retry_on (tuple[type[BaseException], ...]): Exception classes worth
+            retrying. Other exceptions fail the job immediately.
+
+    Example:
+        RetryPolicy(max_attempts=5, base_delay=1.0, retry_on=(TimeoutError,))
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        retry_on: tuple[type[BaseException], ...] = (Exception,),
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    def should_retry(self, attempt: int, exc: BaseException) -> bool:
+        """Whether a job that failed on `attempt` with `exc` gets another try."""
+        return attempt < self.max_attempts and isinstance(exc, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Backoff in seconds after the failed `attempt`."""
+
+        backoff = self.base_delay * self.multiplier ** (attempt - 1)
+        ceiling = min(self.max_delay, backoff)
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+
+class CircuitBreaker:
+    """
+    Settings of the per-key circuit breaker of AsyncPool.
+
+    After `failure_threshold` consecutive failures of jobs with the same key the
+    circuit opens: jobs of that key fail with CircuitOpenError without taking a
+    slot. After `reset_timeout` seconds up to `half_open_jobs` trial jobs are let
+    through; a success closes the circuit, a failure opens it again.
+
+    A retried job rejected by an open circuit uses up an attempt and waits at
+    least until the circuit half-opens before the next one.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds the circuit stays open.
+        half_open_jobs (int): Trial jobs allowed while half-open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_jobs: int = 1,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_jobs = half_open_jobs
+
+
+class Circuit:
+    """Runtime state of the circuit breaker of one key."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trials = 0
+
+    def state(self, now: float) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if now - self.opened_at < self.breaker.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self, now: float) -> bool:
+        """Whether a job of the key may start now."""
+
+        state = self.state(now)
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self.trials < self.breaker.half_open_jobs:
+            self.trials += 1
+            return True
+        return False
+
+    def retry_after(self, now: float) -> float:
+        """Seconds until the circuit lets trial jobs through."""
+
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.breaker.reset_timeout - now)
+
+    def record_cancelled(self):
+        """A job let through while half-open ended without a verdict."""
+        if self.trials > 0:
+            self.trials -= 1
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trials = 0
+
+    def record_failure(self, now: float):
+        self.failures += 1
+        if (
+            self.opened_at is not None
+            or self.failures >= self.breaker.failure_threshold
+        ):
+            # a failed trial, or too many failures in a row
+            self.opened_at = now
+            self.trials = 0
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+
+class IJobSpill(ABC):
+    """
+    Interface for overflow storage of serialized job descriptors.
+
+    AsyncPool writes descriptors here when its bounded queue is full and reads
+    them back, best priority first, as the queue frees up.
+    """
+
+    @abstractmethod
+    def push(self, priority: int, record: dict[str, Any]):
+        """Store a JSON-serializable job record."""
+
+    @abstractmethod
+    def pop(self, count: int) -> list[dict[str, Any]]:
+        """Remove and return up to `count` records, lowest priority value first."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove all records and return how many were removed."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored records."""
+
+
+class SqliteJobSpill(IJobSpill):
+    """
+    Job spill backed by a local SQLite database.
+
+    Records are kept in insertion order within a priority. The database is
+    created if missing; records left by a previous run are picked up again.
+
+    Args:
+        path (str | Path): Database file. ":memory:" keeps the spill in RAM.
+
+    Example:
+        AsyncPool(50, max_queued=1000, spill=SqliteJobSpill("frontier.sqlite"))
+    """
+
+    def __init__(self, path: str | Path):
+        self.__conn = sqlite3.connect(str(path), isolation_level=None)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "priority INTEGER NOT NULL, "
+            "record TEXT NOT NULL)"
+        )
+        self.__conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_order ON jobs (priority, id)"
+        )
+        self.__size = self.__conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def push(self, priority: int, record: dict[str, Any]):
+        self.__conn.execute(
+            "INSERT INTO jobs (priority, record) VALUES (?, ?)",
+            (priority, json.dumps(record)),
+        )
+        self.__size += 1
+
+    def pop(self, count: int) -> list[dict[str, Any]]:
+        if count <= 0 or self.__size == 0:
+            return []
+
+        rows = self.__conn.execute(
+            "SELECT id, record FROM jobs ORDER BY priority, id LIMIT ?", (count,)
+        ).fetchall()
+        if rows:
+            self.__conn.executemany(
+                "DELETE FROM jobs WHERE id = ?", [(row[0],) for row in rows]
+            )
+            self.__size -= len(rows)
+        return [json.loads(row[1]) for row in rows]
+
+    def clear(self) -> int:
+        removed = self.__size
+        self.__conn.execute("DELETE FROM jobs")
+        self.__size = 0
+        return removed
+
+    def close(self):
+        self.__conn.close()
+
+    def __len__(self) -> int:
+        return self.__size
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import bisect
+from typing import NamedTuple
+
+
+class HistogramSnapshot(NamedTuple):
+    """Summary of a duration histogram, in seconds."""
+
+    count: int
+    mean: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of durations with constant memory.
+
+    Buckets grow geometrically by sqrt(2) from 100 microseconds to about a day,
+    so recording is one binary search and percentiles are accurate to within
+    one bucket (about 41%).
+    """
+
+    BOUNDS: list[float] = [1e-4 * 2 ** (i / 2) for i in range(60)]
+
+    __slots__ = ("_counts", "_count", "_sum", "_max")
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def record(self, value: float):
+        self._counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self._count += 1
+        self._sum += value
+        if value > self._max:
+            self._max = value
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile (0 < p <= 100)."""
+
+        if self._count == 0:
+            return 0.0
+
+        rank = p / 100 * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                if index == len(self.BOUNDS):
+                    break
+                return min(self.BOUNDS[index], self._max)
+        return self._max
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            count=self._count,
+            mean=self._sum / self._count if self._count else 0.0,
+            max=self._max,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+        )
+
+
+class PoolStats(NamedTuple):
+    """Point-in-time snapshot of AsyncPool counters."""
+
+    submitted: int
+    started: int
+    completed: int
+    failed: int
+    retried: int
+    cancelled: int
+    expired: int
+    queued: int
+    in_flight: int
+    queue_wait: HistogramSnapshot
+    run_time: HistogramSnapshot
+
+
+class JobEvent(NamedTuple):
+    """
+    Outcome of a single job, passed to the AsyncPool `on_job_done` hook.
+
+    `outcome` is one of "completed", "failed", "retried" (a failed attempt that
+    will be retried), "cancelled" or "expired". `run_time` is None for jobs
+    that never started.
+    """
+
+    name: str
+    key: str | None
+    outcome: str
+    queue_wait: float
+    run_time: float | None
+
+
+class PoolMetrics:
+    """Counters and histograms updated by AsyncPool on its hot path."""
+
+    __slots__ = (
+        "submitted",
+        "started",
+        "completed",
+        "failed",
+        "retried",
+        "cancelled",
+        "expired",
+        "queue_wait",
+        "run_time",
+    )
+
+    def __init__(self):
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.queue_wait = Histogram()
+        self.run_time = Histogram()
+
+    def snapshot(self, queued: int, in_flight: int) -> PoolStats:
+        return PoolStats(
+            submitted=self.submitted,
+            started=self.started,
+            completed=self.completed,
+            failed=self.failed,
+            retried=self.retried,
+            cancelled=self.cancelled,
+            expired=self.expired,
+            queued=queued,
+            in_flight=in_flight,
+            queue_wait=self.queue_wait.snapshot(),
+            run_time=self.run_time.snapshot(),
+        )
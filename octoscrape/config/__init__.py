@@ -1,14 +1,68 @@
-import yaml
+import os
+from pathlib import Path
+from typing import Any
 
 from .common_config_acessor import CommonConfig
 from .scraper_config_acessor import ScraperConfig
 
-with open("config.yaml", "r", encoding="utf-8") as f:
-    raw_config = yaml.safe_load(f)
+CONFIG_ENV = "OCTOSCRAPE_CONFIG"
 
-common_config = CommonConfig(raw_config["common"])
-scrappers_configs: dict[str, ScraperConfig] = {
-    key: ScraperConfig(value, key) for key, value in raw_config["scrapers"].items()
-}
+raw_config: dict[str, Any]
+common_config: CommonConfig
+scrappers_configs: dict[str, ScraperConfig]
 
-__all__ = ["CommonConfig", "ScraperConfig", "common_config", "scrappers_configs"]
+
+def config_path() -> Path:
+    """Path of the configuration file: $OCTOSCRAPE_CONFIG or ./config.yaml."""
+    return Path(os.environ.get(CONFIG_ENV, "config.yaml"))
+
+
+def load_config(path: str | Path | None = None):
+    """
+    Load the configuration file, replacing the loaded configuration.
+
+    Called on first access to `common_config`, `scrappers_configs` or
+    `raw_config`; call it directly to load another file. An explicit path is
+    also exported in $OCTOSCRAPE_CONFIG, so worker processes load the same file.
+
+    Args:
+        path: Configuration file. Defaults to config_path().
+
+    Raises:
+        FileNotFoundError: if the file does not exist.
+    """
+
+    import yaml
+
+    if path is None:
+        path = config_path()
+    else:
+        path = Path(path).resolve()
+        os.environ[CONFIG_ENV] = str(path)
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+
+    module = globals()
+    module["raw_config"] = raw
+    module["common_config"] = CommonConfig(raw["common"])
+    module["scrappers_configs"] = {
+        key: ScraperConfig(value, key) for key, value in raw["scrapers"].items()
+    }
+
+
+def __getattr__(name: str):
+    if name in ("raw_config", "common_config", "scrappers_configs"):
+        load_config()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "CommonConfig",
+    "ScraperConfig",
+    "common_config",
+    "config_path",
+    "load_config",
+    "scrappers_configs",
+]
@@ -27,6 +27,117 @@ class CommonConfig:
         """Number of processes that can be run simultaneously."""
         return self.__config.get("pool_size", 1)
 
+    @property
+    def processes(self) -> int:
+        """Number of worker processes the scrapers are sharded across."""
+        return self.__config.get("processes", 1)
+
+    @property
+    def stop_timeout(self) -> float:
+        """Seconds scrapers and pool jobs get to finish when the runner stops."""
+        return self.__config.get("stop_timeout", 30.0)
+
+    @property
+    def cache_dir(self) -> Path:
+        """Folder of the HTTP response cache shared by the scrapers."""
+        return Path(self.__config.get("cache_dir", ".cache/responses"))
+
+    @property
+    def cache_max_size(self) -> int:
+        """Size limit of the HTTP response cache, in megabytes."""
+        return self.__config.get("cache_max_size", 512)
+
+    @property
+    def fingerprints_path(self) -> Path:
+        """File the pre-generated Camoufox fingerprints are kept in."""
+        return Path(self.__config.get("fingerprints_path", ".cache/fingerprints.json"))
+
+    @property
+    def fingerprints_size(self) -> int:
+        """Number of fingerprints kept ready; 0 (default) generates one per launch."""
+        return self.__config.get("fingerprints_size", 0)
+
+    @property
+    def fingerprints_max_uses(self) -> int:
+        """Launches a fingerprint is used for before it is replaced."""
+        return self.__config.get("fingerprints_max_uses", 20)
+
+    @property
+    def fingerprints_max_age(self) -> float:
+        """Seconds a fingerprint is used for before it is replaced."""
+        return self.__config.get("fingerprints_max_age", 86400.0)
+
+    @property
+    def storage_state_dir(self) -> Path:
+        """Folder the cookies and localStorage of the scrapers are kept in."""
+        return Path(self.__config.get("storage_state_dir", ".cache/storage_states"))
+
+    @property
+    def browser_max_pages(self) -> int | None:
+        """Pages a browser opens before it is recycled; None for no limit."""
+        return self.__config.get("browser_max_pages", None)
+
+    @property
+    def browser_max_uptime(self) -> float | None:
+        """Seconds a browser runs before it is recycled; None for no limit."""
+        return self.__config.get("browser_max_uptime", None)
+
+    @property
+    def browser_max_rss(self) -> int | None:
+        """Browser memory past which it is recycled, in megabytes; None for no limit."""
+        return self.__config.get("browser_max_rss", None)
+
+    @property
+    def health_check_interval(self) -> float:
+        """Seconds between two health checks of the browser."""
+        return self.__config.get("health_check_interval", 10.0)
+
+    @property
+    def browser_drain_timeout(self) -> float:
+        """Seconds a recycled browser gets to finish its pages before it is closed."""
+        return self.__config.get("browser_drain_timeout", 120.0)
+
+    @property
+    def browsers_per_engine(self) -> int:
+        """Browsers launched per engine the scrapers run on."""
+        return self.__config.get("browsers_per_engine", 1)
+
+    @property
+    def browser_max_contexts(self) -> int | None:
+        """Contexts a pooled browser serves at the same time; None for no limit."""
+        return self.__config.get("browser_max_contexts", None)
+
+    @property
+    def browser_engines(self) -> dict:
+        """Launch options added to the defaults of the engines, by engine name."""
+        return self.__config.get("browser_engines", {})
+
+    @property
+    def browser_server(self) -> bool:
+        """Share one browser server between the processes of the host."""
+        return self.__config.get("browser_server", False)
+
+    @property
+    def browser_server_dir(self) -> Path:
+        """Folder of the registry of the shared browser servers."""
+        return Path(self.__config.get("browser_server_dir", ".cache/browser_servers"))
+
+    @property
+    def browser_endpoint(self) -> str | None:
+        """Websocket endpoint of a running browser server to connect to."""
+        return self.__config.get("browser_endpoint", None)
+
+    @property
+    def browser_idle_timeout(self) -> float | None:
+        """Seconds without use after which the browser is closed.
+
+        The browser is then launched on the first lease instead of when it is
+        created, and `browser` of the managers raises while none runs; the
+        engine pools close an idle engine the same way. None keeps it running
+        from creation on.
+        """
+        return self.__config.get("browser_idle_timeout", None)
+
     @property
     def headless(self) -> bool:
         """Launching the browser in headless mode."""
@@ -0,0 +1,5 @@
+from .browser_fetcher import BrowserFetcher
+from .http_fetcher import HttpFetcher
+from .interface import FetchResponse, IFetcher
+
+__all__ = ["BrowserFetcher", "FetchResponse", "HttpFetcher", "IFetcher"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .interface import FetchResponse, IFetcher
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page, Response
+
+    from ..browser_manager.page_pool import PagePool
+
+
+class BrowserFetcher(IFetcher):
+    """
+    Fetcher backed by a browser context.
+
+    GET requests open a page and return the rendered HTML; other methods go
+    through the request API of the context, sharing its cookies.
+
+    Args:
+        context (BrowserContext): Context pages are opened in.
+        owns_context (bool): Close the context on close().
+        pages (PagePool | None): Pool GET requests lease their pages from,
+            instead of opening and closing one per request.
+    """
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        owns_context: bool = False,
+        pages: PagePool | None = None,
+    ):
+        self.__context = context
+        self.__owns_context = owns_context
+        self.__pages = pages
+
+    @property
+    def context(self) -> BrowserContext:
+        return self.__context
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: dict[str, str] | None = None,
+        data: str | bytes | None = None,
+    ) -> FetchResponse:
+        if method.upper() != "GET" or data is not None:
+            response = await self.__context.request.fetch(
+                url, method=method, headers=headers, data=data
+            )
+            return FetchResponse(
+                response.url, response.status, response.headers, await response.body()
+            )
+
+        if self.__pages is None:
+            page = await self.__context.new_page()
+            try:
+                response, body = await self.__render(page, url, headers)
+            finally:
+                await page.close()
+        else:
+            async with self.__pages.page(self.__context) as page:
+                response, body = await self.__render(page, url, headers)
+
+        # the body is the rendered DOM, re-encoded as UTF-8
+        content_type = {"content-type": "text/html; charset=utf-8"}
+        if response is None:  # same-document navigation
+            return FetchResponse(url, 200, content_type, body)
+        headers = {**response.headers, **content_type}
+        return FetchResponse(response.url, response.status, headers, body)
+
+    async def __render(
+        self, page: Page, url: str, headers: dict[str, str] | None
+    ) -> tuple[Response | None, bytes]:
+        if headers:
+            await page.set_extra_http_headers(headers)
+        response = await page.goto(url)
+        return response, (await page.content()).encode()
+
+    async def close(self):
+        if self.__owns_context:
+            await self.__context.close()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import quote, urlsplit
+
+from ..config import ScraperConfig
+from ..proxy import proxy_pool_for
+from .interface import FetchResponse, IFetcher
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def proxy_url(proxy: dict[str, str]) -> str:
+    """Build a proxy URL from a Playwright-style proxy configuration."""
+
+    server = proxy["server"]
+    if "://" not in server:
+        server = f"http://{server}"
+    username = proxy.get("username", None)
+    if not username:
+        return server
+
+    scheme, _, host = server.partition("://")
+    credentials = quote(username, safe="")
+    if proxy.get("password", None):
+        credentials += ":" + quote(proxy["password"], safe="")
+    return f"{scheme}://{credentials}@{host}"
+
+
+class HttpFetcher(IFetcher):
+    """
+    Fetcher backed by an async HTTP client, for pages that need no JavaScript.
+
+    Connections are kept alive and pooled, HTTP/2 is negotiated when the
+    server supports it, and gzip and brotli bodies are decoded. At most
+    `max_connections_per_host` requests run against one host at a time.
+
+    With a proxy pool, every request leases a proxy and reports its status and
+    latency to the pool; one client is kept per proxy.
+
+    Args:
+        config (ScraperConfig): Scraper settings; its proxy is used.
+        timeout (float): Timeout of a request, in seconds.
+        transport (httpx.AsyncBaseTransport | None): Custom transport, e.g.
+            httpx.MockTransport in tests. It handles every request, so proxies
+            are only leased and reported on, not connected through.
+
+    Raises:
+        ImportError: if httpx is not installed (`pip install octoscrape[http]`).
+    """
+
+    def __init__(
+        self,
+        config: ScraperConfig,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        # imported here, so scrapers on the browser engine do not load it
+        try:
+            import httpx
+        except ImportError:  # optional dependency, see the "http" extra
+            raise ImportError(
+                "The http engine requires httpx: pip install 'octoscrape[http]'"
+            ) from None
+
+        per_host = config.max_connections_per_host
+        self.__per_host = per_host
+        self.__hosts: dict[str, asyncio.Semaphore] = {}
+        self.__host_users: dict[str, int] = {}
+        self.__timeout = timeout
+        self.__transport = transport
+        self.__limits = httpx.Limits(
+            max_connections=max(100, config.pool_size * per_host),
+            max_keepalive_connections=max(20, config.pool_size),
+        )
+        self.__proxies = proxy_pool_for(config)
+        self.__clients: dict[str, httpx.AsyncClient] = {}
+        if self.__proxies is None:
+            self.__client = self.__new_client(config.proxy)
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: dict[str, str] | None = None,
+        data: str | bytes | None = None,
+    ) -> FetchResponse:
+        host = urlsplit(url).netloc
+        slots = self.__hosts.get(host, None)
+        if slots is None:
+            slots = asyncio.Semaphore(self.__per_host)
+            self.__hosts[host] = slots
+        self.__host_users[host] = self.__host_users.get(host, 0) + 1
+
+        try:
+            async with slots:
+                if self.__proxies is None:
+                    response = await self.__client.request(
+                        method, url, headers=headers, content=data
+                    )
+                else:
+                    response = await self.__proxied(method, url, headers, data)
+        finally:
+            # a crawl touches many hosts once; keep no semaphore nobody waits on
+            self.__host_users[host] -= 1
+            if not self.__host_users[host]:
+                del self.__host_users[host]
+                del self.__hosts[host]
+        return FetchResponse(
+            str(response.url),
+            response.status_code,
+            {k.lower(): v for k, v in response.headers.items()},
+            response.content,
+        )
+
+    async def close(self):
+        if self.__proxies is None:
+            await self.__client.aclose()
+        for client in self.__clients.values():
+            await client.aclose()
+        self.__clients.clear()
+
+    def __new_client(self, proxy: dict[str, str] | None) -> httpx.AsyncClient:
+        import httpx
+
+        if self.__transport is not None:
+            # httpx mounts its own transport for a proxy, which would replace
+            # the injected one; the injected transport gets all requests
+            proxy = None
+        return httpx.AsyncClient(
+            http2=self.__transport is None,
+            proxy=None if proxy is None else proxy_url(proxy),
+            limits=self.__limits,
+            timeout=self.__timeout,
+            follow_redirects=True,
+            transport=self.__transport,
+        )
+
+    async def __proxied(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None,
+        data: str | bytes | None,
+    ) -> httpx.Response:
+        import httpx
+
+        lease = await self.__proxies.acquire()
+        client = self.__clients.get(lease.server, None)
+        if client is None:
+            client = self.__new_client(lease.proxy)
+            self.__clients[lease.server] = client
+
+        started = time.monotonic()
+        try:
+            response = await client.request(method, url, headers=headers, content=data)
+        except httpx.TransportError:
+            lease.release(error=True)
+            raise
+        except BaseException:
+            lease.abandon()
+            raise
+        lease.record(response.status_code, time.monotonic() - started)
+        lease.release()
+        return response
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, NamedTuple
+
+
+class FetchResponse(NamedTuple):
+    """Response returned by every fetcher, whichever engine produced it."""
+
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+    def text(self) -> str:
+        """Body decoded with the charset of the Content-Type header."""
+
+        charset = "utf-8"
+        for part in self.headers.get("content-type", "").split(";")[1:]:
+            name, _, value = part.strip().partition("=")
+            if name.lower() == "charset" and value:
+                charset = value.strip('"')
+        return self.body.decode(charset, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text())
+
+
+class IFetcher(ABC):
+    """
+    Interface for fetching pages with a given engine.
+
+    Scrapers written against it run unchanged on a browser or a plain HTTP
+    client, see ScraperConfig.engine.
+    """
+
+    @abstractmethod
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: dict[str, str] | None = None,
+        data: str | bytes | None = None,
+    ) -> FetchResponse:
+        """
+        Fetch a URL.
+
+        Raises:
+            Exception: engine specific network errors.
+        """
+
+    @abstractmethod
+    async def close(self):
+        """Release connections, contexts and other resources of the fetcher."""
+
+    async def __aenter__(self) -> IFetcher:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
@@ -0,0 +1,12 @@
+from .bloom import BloomFilter
+from .canonical import TRACKING_PARAMS, canonicalize_url, host_of
+from .frontier import FrontierStats, UrlFrontier
+
+__all__ = [
+    "TRACKING_PARAMS",
+    "BloomFilter",
+    "FrontierStats",
+    "UrlFrontier",
+    "canonicalize_url",
+    "host_of",
+]
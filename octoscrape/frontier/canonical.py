@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+import string
+from typing import Collection
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# query parameters that only track the visitor; every "utm_" one is dropped too
+TRACKING_PARAMS = frozenset(
+    {"fbclid", "gclid", "dclid", "msclkid", "yclid", "mc_cid", "mc_eid", "_ga"}
+)
+
+_escape = re.compile(r"%[0-9a-fA-F]{2}")
+_unreserved = frozenset(string.ascii_letters + string.digits + "-._~")
+
+
+def _normalize_escapes(part: str) -> str:
+    """Decode escaped unreserved characters and uppercase the other escapes."""
+
+    def replace(match: re.Match) -> str:
+        char = chr(int(match.group()[1:], 16))
+        return char if char in _unreserved else match.group().upper()
+
+    return _escape.sub(replace, part)
+
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolve "." and ".." segments (RFC 3986, section 5.2.4)."""
+
+    if "." not in path:
+        return path
+    output: list[str] = []
+    segments = path.split("/")
+    for segment in segments[1:]:
+        if segment == "..":
+            if output:
+                output.pop()
+        elif segment != ".":
+            output.append(segment)
+    if segments[-1] in (".", ".."):
+        output.append("")
+    return "/" + "/".join(output)
+
+
+def _host(host: str) -> str:
+    host = host.rstrip(".")
+    if ":" in host:  # IPv6
+        return f"[{host}]"
+    try:
+        return host.encode("idna").decode("ascii")
+    except UnicodeError:
+        return host
+
+
+def canonicalize_url(url: str, drop_params: Collection[str] = TRACKING_PARAMS) -> str:
+    """
+    Normalize a URL so that the spellings of the same page compare equal.
+
+    The scheme and host are lowercased, internationalized hosts encoded with
+    IDNA, default ports, fragments and dot segments removed, escapes
+    normalized, query parameters sorted and tracking parameters (`drop_params`
+    and "utm_*") dropped.
+
+    Raises:
+        ValueError: If the URL has no host or an invalid port.
+
+    Example:
+        canonicalize_url("HTTP://Example.com:80/a/../b?utm_source=x&q=1#top")
+        # "http://example.com/b?q=1"
+    """
+
+    parts = urlsplit(url.strip())
+    if not parts.hostname:
+        raise ValueError(f"URL without host: {url!r}")
+
+    scheme = parts.scheme.lower()
+    netloc = _host(parts.hostname)
+    port = parts.port
+    if port is not None and port != DEFAULT_PORTS.get(scheme, None):
+        netloc = f"{netloc}:{port}"
+    if "@" in parts.netloc:
+        netloc = f"{parts.netloc.rpartition('@')[0]}@{netloc}"
+
+    path = _remove_dot_segments(_normalize_escapes(parts.path)) or "/"
+
+    params = []
+    for param in parts.query.split("&"):
+        if not param:
+            continue
+        name = unquote_plus(param.partition("=")[0])
+        if name in drop_params or name.startswith("utm_"):
+            continue
+        params.append(_normalize_escapes(param))
+    params.sort()
+
+    return urlunsplit((scheme, netloc, path, "&".join(params), ""))
+
+
+def host_of(url: str) -> str:
+    """Host of a URL, lowercased and without port; "" if it has none."""
+    return urlsplit(url).hostname or ""
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from ..concurrency import JobSpec
+from .bloom import BloomFilter
+from .canonical import canonicalize_url, host_of
+
+if TYPE_CHECKING:
+    from ..concurrency import AsyncPool
+
+logger = logging.getLogger(__name__)
+
+
+class FrontierStats(NamedTuple):
+    """Snapshot of a frontier."""
+
+    queued: int
+    hosts: int
+    seen: int
+    duplicates: int
+
+
+class UrlFrontier:
+    """
+    URLs waiting to be crawled, queued per host.
+
+    add() canonicalizes a URL and drops it if it was added before. The seen
+    URLs are kept in a Bloom filter sized by `capacity` and `error_rate`, so
+    tens of millions of them fit in tens of megabytes; a false positive skips a
+    new URL as if it was seen.
+
+    Each host has a FIFO queue, and hosts take turns: a host with thousands of
+    URLs does not hold back the others. A host is not handed out again before
+    its politeness delay has passed since its previous URL.
+
+    Args:
+        delay (float): Seconds between two URLs of a host.
+        host_delays (dict[str, float] | None): Delays of specific hosts, e.g.
+            from robots.txt Crawl-delay.
+        capacity (int): Number of distinct URLs the seen filter is sized for.
+        error_rate (float): False positive rate of the seen filter at capacity.
+        canonicalize (Callable[[str], str]): Normalizes URLs before dedup.
+
+    Example:
+        frontier = UrlFrontier(delay=2.0, capacity=50_000_000)
+        frontier.add("https://shop.example.com/")
+        url = await frontier.get()
+    """
+
+    def __init__(
+        self,
+        delay: float = 1.0,
+        host_delays: dict[str, float] | None = None,
+        capacity: int = 10_000_000,
+        error_rate: float = 0.001,
+        canonicalize: Callable[[str], str] = canonicalize_url,
+    ):
+        if delay < 0:
+            raise ValueError("delay must not be negative.")
+
+        self.__delay = delay
+        self.__host_delays = dict(host_delays or {})
+        self.__seen = BloomFilter(capacity, error_rate)
+        self.__canonicalize = canonicalize
+
+        # a host has a queue from its first URL until its delay has passed
+        # after its last one; it is then either ready or waiting
+        self.__queues: dict[str, deque[str]] = {}
+        self.__ready: deque[str] = deque()
+        self.__waiting: list[tuple[float, str]] = []  # heap of (due time, host)
+        self.__queued = 0
+        self.__duplicates = 0
+
+        self.__waiters: deque[asyncio.Future] = deque()
+        self.__closed = False
+
+    @property
+    def delay(self) -> float:
+        return self.__delay
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def __len__(self) -> int:
+        """Number of queued URLs."""
+        return self.__queued
+
+    def delay_of(self, host: str) -> float:
+        return self.__host_delays.get(host, self.__delay)
+
+    def set_delay(self, host: str, delay: float):
+        """Set the politeness delay of a host; applies from its next URL."""
+        self.__host_delays[host] = delay
+
+    def add(self, url: str) -> bool:
+        """
+        Queue a URL if it was not added before.
+
+        Returns:
+            True if the URL was queued; False if it was seen before or has no
+            host.
+
+        Raises:
+            RuntimeError: If the frontier is closed.
+        """
+
+        if self.__closed:
+            raise RuntimeError("The frontier is closed.")
+        try:
+            url = self.__canonicalize(url)
+        except ValueError:
+            logger.debug(f"Skipping invalid URL {url!r}")
+            return False
+        if not self.__seen.add(url):
+            self.__duplicates += 1
+            return False
+
+        host = host_of(url)
+        queue = self.__queues.get(host, None)
+        if queue is None:
+            queue = self.__queues[host] = deque()
+            self.__ready.append(host)
+        queue.append(url)
+        self.__queued += 1
+        self.__wake()
+        return True
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """Queue the URLs that were not added before; returns how many."""
+        return sum(self.add(url) for url in urls)
+
+    def pop(self) -> str | None:
+        """Return the next URL of a host that is due, or None if none is."""
+
+        now = time.monotonic()
+        self.__promote(now)
+        if not self.__ready:
+            return None
+
+        host = self.__ready.popleft()
+        queue = self.__queues[host]
+        url = queue.popleft()
+        self.__queued -= 1
+        delay = self.delay_of(host)
+        if delay > 0:
+            heapq.heappush(self.__waiting, (now + delay, host))
+        elif queue:
+            self.__ready.append(host)
+        else:
+            del self.__queues[host]
+        return url
+
+    async def get(self) -> str | None:
+        """
+        Wait for the next URL of a host that is due.
+
+        Returns:
+            The URL, or None once the frontier is closed and empty.
+        """
+
+        while (url := self.pop()) is None:
+            if self.__closed and not self.__queued:
+                return None
+
+            timeout = None
+            if self.__waiting:
+                timeout = max(0.0, self.__waiting[0][0] - time.monotonic())
+            waiter = asyncio.get_running_loop().create_future()
+            self.__waiters.append(waiter)
+            try:
+                await asyncio.wait((waiter,), timeout=timeout)
+            except asyncio.CancelledError:
+                if waiter.done():
+                    # pass the new URL on to the next consumer
+                    self.__wake()
+                raise
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+                if waiter in self.__waiters:
+                    self.__waiters.remove(waiter)
+        return url
+
+    async def feed(
+        self,
+        pool: AsyncPool,
+        job: str,
+        priority: int = 0,
+        deadline: float | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Hand the URLs to an AsyncPool as they become due, until the frontier is
+        closed and empty.
+
+        Each URL is enqueued as JobSpec(job, url) with its host as key, so the
+        per-key limits and circuit breaker of the pool apply per host. The
+        delay of a host counts from the hand-off; bound the pool queue with
+        `max_queued` so URLs are not handed off long before they run.
+
+        Args:
+            pool: Pool that runs the job, registered with pool.register_job().
+            job: Name of the job; it is called with the URL.
+            priority, deadline, timeout: As for AsyncPool.submit().
+
+        Returns:
+            Number of URLs handed to the pool.
+        """
+
+        count = 0
+        while (url := await self.get()) is not None:
+            await pool.enqueue(
+                JobSpec(job, url), priority, deadline, host_of(url), timeout
+            )
+            count += 1
+        return count
+
+    def close(self):
+        """Refuse new URLs; get() returns None once the queued ones are out."""
+
+        self.__closed = True
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> FrontierStats:
+        return FrontierStats(
+            queued=self.__queued,
+            hosts=len(self.__queues),
+            seen=len(self.__seen),
+            duplicates=self.__duplicates,
+        )
+
+    def __promote(self, now: float):
+        """Move the hosts whose delay has passed to the back of the ready turn."""
+
+        waiting = self.__waiting
+        while waiting and waiting[0][0] <= now:
+            _, host = heapq.heappop(waiting)
+            if self.__queues[host]:
+                self.__ready.append(host)
+            else:
+                del self.__queues[host]
+
+    def __wake(self):
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
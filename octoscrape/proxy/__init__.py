@@ -0,0 +1,19 @@
+from .pool import (
+    ProxyLease,
+    ProxyPool,
+    ProxyStats,
+    load_proxies,
+    parse_proxy,
+    proxy_pool_for,
+    watch_context,
+)
+
+__all__ = [
+    "ProxyLease",
+    "ProxyPool",
+    "ProxyStats",
+    "load_proxies",
+    "parse_proxy",
+    "proxy_pool_for",
+    "watch_context",
+]
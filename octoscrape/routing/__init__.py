@@ -0,0 +1,16 @@
+from .blocking import BlockingHandler, BlockingStats, BlockRules
+from .cache import CacheHandler, CacheStats, ResponseCache
+from .interface import IRouteHandler
+from .router import Router, router_for
+
+__all__ = [
+    "BlockingHandler",
+    "BlockingStats",
+    "BlockRules",
+    "CacheHandler",
+    "CacheStats",
+    "IRouteHandler",
+    "ResponseCache",
+    "Router",
+    "router_for",
+]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+from urllib.parse import urlsplit
+
+from .interface import IRouteHandler
+
+if TYPE_CHECKING:
+    from playwright.async_api import Request, Route
+
+# content types of stub responses, by resource type
+_STUB_CONTENT_TYPES = {
+    "script": "application/javascript",
+    "stylesheet": "text/css",
+    "xhr": "application/json",
+    "fetch": "application/json",
+    "document": "text/html",
+}
+
+
+class BlockRules:
+    """
+    Which requests to block, parsed from the `block` section of ScraperConfig.
+
+    A request is blocked if its resource type, URL glob or domain matches.
+    Blocked requests of the `stub` resource types are answered with an empty
+    200 response, for scripts a page would otherwise wait for; the rest are
+    aborted.
+
+    Args:
+        resource_types (Iterable[str]): Playwright resource types, e.g. image.
+        urls (Iterable[str]): Glob patterns matched against the full URL;
+            `*` also matches `/`.
+        domains (Iterable[str]): Domains blocked together with their subdomains.
+        stub (Iterable[str]): Resource types fulfilled instead of aborted.
+    """
+
+    def __init__(
+        self,
+        resource_types: Iterable[str] = (),
+        urls: Iterable[str] = (),
+        domains: Iterable[str] = (),
+        stub: Iterable[str] = (),
+    ):
+        self.resource_types = frozenset(resource_types)
+        self.urls = tuple(urls)
+        self.domains = frozenset(d.lower().lstrip(".") for d in domains)
+        self.stub = frozenset(stub)
+
+    @classmethod
+    def from_config(cls, block: dict[str, list[str]]) -> BlockRules:
+        return cls(
+            resource_types=block.get("resource_types", ()),
+            urls=block.get("urls", ()),
+            domains=block.get("domains", ()),
+            stub=block.get("stub", ()),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.resource_types or self.urls or self.domains)
+
+    def matches(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+
+        if self.domains:
+            host = (urlsplit(url).hostname or "").lower()
+            while host:
+                if host in self.domains:
+                    return True
+                _, _, host = host.partition(".")
+
+        return any(fnmatchcase(url, pattern) for pattern in self.urls)
+
+
+class BlockingStats(NamedTuple):
+    """
+    Requests blocked by a BlockingHandler, by resource type.
+
+    Aborted requests are never downloaded, so their size is unknown; the
+    counts are what was saved.
+    """
+
+    aborted: dict[str, int]
+    stubbed: dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.aborted.values()) + sum(self.stubbed.values())
+
+
+class BlockingHandler(IRouteHandler):
+    """Route handler that aborts or stubs the requests matched by BlockRules."""
+
+    def __init__(self, rules: BlockRules):
+        self.rules = rules
+        self.__aborted: dict[str, int] = {}
+        self.__stubbed: dict[str, int] = {}
+
+    def stats(self) -> BlockingStats:
+        return BlockingStats(dict(self.__aborted), dict(self.__stubbed))
+
+    async def handle(self, route: Route, request: Request) -> bool:
+        resource_type = request.resource_type
+        if not self.rules.matches(request.url, resource_type):
+            return False
+
+        if resource_type in self.rules.stub:
+            await route.fulfill(
+                status=200,
+                body="",
+                content_type=_STUB_CONTENT_TYPES.get(resource_type, "text/plain"),
+            )
+            counters = self.__stubbed
+        else:
+            await route.abort("blockedbyclient")
+            counters = self.__aborted
+
+        counters[resource_type] = counters.get(resource_type, 0) + 1
+        return True
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from .. import config
+from ..concurrency.stats import Histogram, HistogramSnapshot
+from .interface import IRouteHandler
+
+if TYPE_CHECKING:
+    from playwright.async_api import Request, Route
+
+logger = logging.getLogger(__name__)
+
+# the stored body is already decoded, these headers no longer describe it
+_DROPPED_HEADERS = frozenset(
+    ("content-encoding", "content-length", "transfer-encoding")
+)
+
+DEFAULT_RESOURCE_TYPES = ("script", "stylesheet", "image", "font", "xhr", "fetch")
+
+# request headers that make a response specific to a session
+_PRIVATE_REQUEST_HEADERS = ("authorization", "cookie")
+
+# puts between two reads of the total size from the index, which picks up the
+# bodies stored and evicted by other processes
+_RESYNC_PUTS = 256
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    expires: float
+    etag: str | None
+    last_modified: str | None
+
+
+def freshness(headers: dict[str, str], default_ttl: float | None) -> float | None:
+    """
+    Seconds a response may be served from the cache without revalidation.
+
+    Cache-Control and Expires win over `default_ttl`. A response with a
+    validator (ETag, Last-Modified) and no lifetime is stored for revalidation.
+    The cache is shared by all scrapers, proxies and sessions, so private
+    responses, responses that set cookies and responses that vary on anything
+    but Accept-Encoding are not stored.
+
+    Returns:
+        The lifetime in seconds, or None if the response must not be stored.
+    """
+
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "set-cookie" in headers:
+        return None
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",")}
+    if vary - {"", "accept-encoding"}:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                return max(0.0, float(directives[name]))
+            except ValueError:
+                break
+
+    expires = headers.get("expires", None)
+    if expires is not None:
+        try:
+            return max(0.0, parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+
+    if default_ttl is not None:
+        return default_ttl
+    if "etag" in headers or "last-modified" in headers:
+        return 0.0
+    return None
+
+
+class ResponseCache:
+    """
+    Content-addressed HTTP response cache on disk.
+
+    Bodies are stored once per content hash under `path/objects`; a SQLite
+    index maps request URLs to bodies, headers and freshness. When the bodies
+    outgrow `max_size`, the least recently used entries are evicted.
+
+    The cache can be shared by scrapers in one process and, since writes are
+    atomic and the index is a SQLite database, by several processes. Its
+    methods block on disk and on the index lock of other processes; they are
+    thread-safe, so async code runs them with asyncio.to_thread(). The size of
+    the bodies is tracked per process and read again from the index every few
+    hundred puts, so with several processes `max_size` is enforced
+    approximately.
+
+    Args:
+        path (str | Path): Cache directory, created if missing.
+        max_size (int): Size limit of the stored bodies, in bytes.
+    """
+
+    def __init__(self, path: str | Path, max_size: int = 512 * 2**20):
+        self.__path = Path(path)
+        self.__objects = self.__path / "objects"
+        self.__objects.mkdir(parents=True, exist_ok=True)
+        self.__max_size = max_size
+        self.__last_access = 0.0
+        self.__lock = threading.Lock()
+        self.evicted = 0
+
+        self.__conn = sqlite3.connect(
+            str(self.__path / "index.sqlite"),
+            isolation_level=None,
+            timeout=30,
+            check_same_thread=False,
+        )
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.executescript(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, status INTEGER, headers TEXT, digest TEXT, "
+            "expires REAL, etag TEXT, last_modified TEXT, accessed REAL);"
+            "CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed);"
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "digest TEXT PRIMARY KEY, size INTEGER, refs INTEGER);"
+        )
+        self.__size = self.__stored_size()
+        self.__puts = 0
+
+    @property
+    def size(self) -> int:
+        """Total size of the stored bodies, in bytes."""
+        with self.__lock:
+            return self.__stored_size()
+
+    def get(self, method: str, url: str) -> CachedResponse | None:
+        """Return the stored response of a request, fresh or not."""
+
+        key = self.__key(method, url)
+        with self.__lock:
+            row = self.__conn.execute(
+                "SELECT status, headers, digest, expires, etag, last_modified "
+                "FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            body = self.__object_path(row[2]).read_bytes()
+        except OSError:
+            with self.__lock:
+                # the body was evicted by another process
+                self.__size -= self.__delete(key)
+            return None
+
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                (self.__access_time(), key),
+            )
+        return CachedResponse(row[0], json.loads(row[1]), body, *row[3:])
+
+    def put(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        ttl: float,
+    ):
+        """Store a response, replacing the previous one of the request."""
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.__object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+
+        headers = {k: v for k, v in headers.items() if k not in _DROPPED_HEADERS}
+        key = self.__key(method, url)
+        with self.__lock:
+            now = self.__access_time()
+            with self.__conn:
+                self.__conn.execute("BEGIN IMMEDIATE")
+                # referenced before the previous entry is deleted, so a body
+                # stored again is not dropped in between
+                refs = self.__conn.execute(
+                    "INSERT INTO objects (digest, size, refs) VALUES (?, ?, 1) "
+                    "ON CONFLICT (digest) DO UPDATE SET refs = refs + 1 "
+                    "RETURNING refs",
+                    (digest, len(body)),
+                ).fetchone()[0]
+                self.__size -= self.__delete(key)
+                self.__conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        status,
+                        json.dumps(headers),
+                        digest,
+                        now + ttl,
+                        headers.get("etag", None),
+                        headers.get("last-modified", None),
+                        now,
+                    ),
+                )
+            if refs == 1:
+                self.__size += len(body)
+
+            self.__puts += 1
+            if self.__puts % _RESYNC_PUTS == 0:
+                self.__size = self.__stored_size()
+            if self.__size > self.__max_size:
+                self.__evict()
+
+    def refresh(self, method: str, url: str, ttl: float):
+        """Extend the lifetime of a response revalidated by the server."""
+
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE entries SET expires = ? WHERE key = ?",
+                (time.time() + ttl, self.__key(method, url)),
+            )
+
+    def clear(self):
+        with self.__lock:
+            for (key,) in self.__conn.execute("SELECT key FROM entries").fetchall():
+                self.__delete(key)
+            self.__size = self.__stored_size()
+
+    def close(self):
+        with self.__lock:
+            self.__conn.close()
+
+    def __stored_size(self) -> int:
+        row = self.__conn.execute("SELECT SUM(size) FROM objects").fetchone()
+        return row[0] or 0
+
+    def __access_time(self) -> float:
+        """Wall-clock time, strictly increasing so LRU order has no ties."""
+
+        self.__last_access = max(time.time(), self.__last_access + 1e-6)
+        return self.__last_access
+
+    def __key(self, method: str, url: str) -> str:
+        return hashlib.sha256(f"{method} {url}".encode()).hexdigest()
+
+    def __object_path(self, digest: str) -> Path:
+        return self.__objects / digest[:2] / digest
+
+    def __delete(self, key: str) -> int:
+        """Delete an entry, and its body if no other entry uses it.
+
+        Returns:
+            Number of bytes freed.
+        """
+
+        row = self.__conn.execute(
+            "DELETE FROM entries WHERE key = ? RETURNING digest", (key,)
+        ).fetchall()
+        if not row:
+            return 0
+
+        digest = row[0][0]
+        refs = self.__conn.execute(
+            "UPDATE objects SET refs = refs - 1 WHERE digest = ? RETURNING refs, size",
+            (digest,),
+        ).fetchall()
+        if not refs or refs[0][0] > 0:
+            return 0
+
+        self.__conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        try:
+            self.__object_path(digest).unlink()
+        except OSError:
+            pass
+        return refs[0][1]
+
+    def __evict(self):
+        """Drop least recently used entries until the bodies fit `max_size`."""
+
+        while self.__size > self.__max_size:
+            rows = self.__conn.execute(
+                "SELECT key FROM entries ORDER BY accessed LIMIT 16"
+            ).fetchall()
+            if not rows:
+                break
+            for (key,) in rows:
+                self.__size -= self.__delete(key)
+                self.evicted += 1
+                if self.__size <= self.__max_size:
+                    break
+
+
+class CacheStats(NamedTuple):
+    """
+    Counters of a CacheHandler.
+
+    `hit_time` is the time to answer from the cache, `fetch_time` the time to
+    fetch from the network, so their difference is the saving per request.
+    """
+
+    hits: int
+    revalidated: int
+    misses: int
+    stored: int
+    hit_time: HistogramSnapshot
+    fetch_time: HistogramSnapshot
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.hits + self.revalidated
+        total = served + self.misses
+        return served / total if total else 0.0
+
+
+class CacheHandler(IRouteHandler):
+    """
+    Route handler that answers GET requests from a ResponseCache.
+
+    Fresh responses are served from disk; stale ones with a validator are
+    revalidated with a conditional request; other requests are fetched and
+    stored if their headers, or `default_ttl`, allow it. Responses to requests
+    with cookies or credentials are not stored. The cache is accessed from a
+    worker thread, so a slow disk or a lock held by another process does not
+    stall the pages of the process.
+
+    Args:
+        cache (ResponseCache): Cache to use; may be shared between handlers.
+        resource_types (Iterable[str]): Resource types worth caching.
+        default_ttl (float | None): Lifetime of responses without Cache-Control
+            or Expires headers, in seconds. None honours headers only.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        resource_types: Iterable[str] = DEFAULT_RESOURCE_TYPES,
+        default_ttl: float | None = None,
+    ):
+        self.cache = cache
+        self.resource_types = frozenset(resource_types)
+        self.default_ttl = default_ttl
+
+        self.__hits = 0
+        self.__revalidated = 0
+        self.__misses = 0
+        self.__stored = 0
+        self.__hit_time = Histogram()
+        self.__fetch_time = Histogram()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.__hits,
+            revalidated=self.__revalidated,
+            misses=self.__misses,
+            stored=self.__stored,
+            hit_time=self.__hit_time.snapshot(),
+            fetch_time=self.__fetch_time.snapshot(),
+        )
+
+    async def handle(self, route: Route, request: Request) -> bool:
+        if request.method != "GET" or request.resource_type not in self.resource_types:
+            return False
+
+        started = time.perf_counter()
+        url = request.url
+        cached = await asyncio.to_thread(self.cache.get, "GET", url)
+        if cached is not None and cached.expires > time.time():
+            await self.__fulfill_cached(route, cached)
+            self.__hits += 1
+            self.__hit_time.record(time.perf_counter() - started)
+            return True
+
+        headers = dict(request.headers)
+        if cached is not None:
+            if cached.etag is not None:
+                headers["if-none-match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["if-modified-since"] = cached.last_modified
+
+        response = await route.fetch(headers=headers)
+        if cached is not None and response.status == 304:
+            ttl = freshness(response.headers, self.default_ttl) or 0.0
+            await asyncio.to_thread(self.cache.refresh, "GET", url, ttl)
+            await self.__fulfill_cached(route, cached)
+            self.__revalidated += 1
+            self.__hit_time.record(time.perf_counter() - started)
+            return True
+
+        body = await response.body()
+        self.__misses += 1
+        self.__fetch_time.record(time.perf_counter() - started)
+
+        ttl = freshness(response.headers, self.default_ttl)
+        if (
+            response.status == 200
+            and ttl is not None
+            and await self.__shareable(request)
+        ):
+            try:
+                await asyncio.to_thread(
+                    self.cache.put, "GET", url, 200, response.headers, body, ttl
+                )
+                self.__stored += 1
+            except (OSError, sqlite3.Error):
+                logger.warning(f"Failed to cache {url}", exc_info=True)
+
+        await route.fulfill(response=response, body=body)
+        return True
+
+    async def __shareable(self, request: Request) -> bool:
+        """Whether the request carried no cookies or credentials."""
+
+        # request.headers leaves out the cookie header
+        headers = await request.all_headers()
+        return not any(name in headers for name in _PRIVATE_REQUEST_HEADERS)
+
+    async def __fulfill_cached(self, route: Route, cached: CachedResponse):
+        await route.fulfill(
+            status=cached.status, headers=cached.headers, body=cached.body
+        )
+
+
+_shared_cache: ResponseCache | None = None
+
+
+def shared_cache() -> ResponseCache:
+    """Return the process-wide cache configured by the common config."""
+
+    global _shared_cache
+    if _shared_cache is None:
+        common = config.common_config
+        _shared_cache = ResponseCache(common.cache_dir, common.cache_max_size * 2**20)
+    return _shared_cache
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Request, Route
+
+
+class IRouteHandler(ABC):
+    """
+    Interface for a link of the Router handler chain.
+
+    Handlers are asked in order; the first one that answers the route ends
+    the chain. Requests no handler answers go to the network.
+    """
+
+    @abstractmethod
+    async def handle(self, route: Route, request: Request) -> bool:
+        """
+        Handle an intercepted request.
+
+        Returns:
+            True if the route was answered (aborted or fulfilled), False to pass
+            it on to the next handler.
+        """
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Iterable, TypeVar
+
+from ..config import ScraperConfig
+from .blocking import BlockingHandler, BlockRules
+from .cache import DEFAULT_RESOURCE_TYPES, CacheHandler, shared_cache
+from .interface import IRouteHandler
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Request, Route
+
+logger = logging.getLogger(__name__)
+
+H = TypeVar("H", bound=IRouteHandler)
+
+
+class Router:
+    """
+    Chain of route handlers installed on browser contexts.
+
+    Every request of a context goes through the handlers in order until one
+    of them answers it; the rest fall back to the network.
+
+    Args:
+        handlers (Iterable[IRouteHandler]): Handlers in the order they are asked.
+
+    Example:
+        router = Router([BlockingHandler(BlockRules(resource_types=["image"]))])
+        await router.install(context)
+    """
+
+    def __init__(self, handlers: Iterable[IRouteHandler] = ()):
+        self.__handlers: list[IRouteHandler] = list(handlers)
+
+    @property
+    def handlers(self) -> list[IRouteHandler]:
+        return list(self.__handlers)
+
+    def add(self, handler: IRouteHandler):
+        """Append a handler to the end of the chain."""
+        self.__handlers.append(handler)
+
+    def get(self, handler_type: type[H]) -> H | None:
+        """Return the first handler of the given type, if any."""
+
+        for handler in self.__handlers:
+            if isinstance(handler, handler_type):
+                return handler
+        return None
+
+    async def install(self, context: BrowserContext):
+        """Route all requests of a context through the chain."""
+        await context.route("**/*", self.__handle)
+
+    async def __handle(self, route: Route, request: Request):
+        for handler in self.__handlers:
+            try:
+                if await handler.handle(route, request):
+                    return
+            except Exception:
+                logger.warning(
+                    f"Route handler {type(handler).__name__} failed on {request.url}",
+                    exc_info=True,
+                )
+        await route.fallback()
+
+
+# configs are kept alongside their routers, so their ids are never reused
+_routers: dict[int, tuple[ScraperConfig, Router | None]] = {}
+
+
+def router_for(config: ScraperConfig) -> Router | None:
+    """
+    Return the router of a scraper config, building it on first use.
+
+    The router, and so its counters, is shared by every scraper instance
+    created from the config.
+
+    Returns:
+        The router, or None if the config does not route any request; contexts
+        are then left without interception, which has a cost of its own.
+    """
+
+    entry = _routers.get(id(config), None)
+    if entry is not None:
+        return entry[1]
+
+    handlers: list[IRouteHandler] = []
+    rules = BlockRules.from_config(config.block)
+    if rules:
+        handlers.append(BlockingHandler(rules))
+
+    # blocked requests never reach the cache
+    cache = config.cache
+    if cache is not None:
+        handlers.append(
+            CacheHandler(
+                shared_cache(),
+                cache.get("resource_types", DEFAULT_RESOURCE_TYPES),
+                cache.get("ttl", None),
+            )
+        )
+
+    router = Router(handlers) if handlers else None
+    _routers[id(config)] = (config, router)
+    return router
@@ -1,6 +1,14 @@
 from .factory import ScraperFactory
 from .interfaces import IAsyncScraper
-from .mixins import MixinContextCreator
+from .mixins import MixinContextCreator, MixinFetcher
 from .multirunner import MultiRunner
+from .sharded import ShardedMultiRunner
 
-__all__ = ["IAsyncScraper", "MixinContextCreator", "ScraperFactory", "MultiRunner"]
+__all__ = [
+    "IAsyncScraper",
+    "MixinContextCreator",
+    "MixinFetcher",
+    "ScraperFactory",
+    "MultiRunner",
+    "ShardedMultiRunner",
+]
@@ -1,16 +1,196 @@
-from playwright.async_api import Browser, BrowserContext
+from __future__ import annotations
 
-from ..config import common_config
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncContextManager, AsyncIterator
+
+from .. import config
+from ..browser_manager.context_pool import ContextPool
+from ..browser_manager.engines import shared_engine_pools
+from ..browser_manager.page_pool import PagePool
+from ..browser_manager.storage_state import StorageStateStore, storage_state_for
+from ..fetch import BrowserFetcher, HttpFetcher, IFetcher
+from ..proxy import ProxyLease, ProxyPool, proxy_pool_for, watch_context
+from ..routing import router_for
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
 
 
 class MixinContextCreator:
+    _context_pool: ContextPool = ContextPool()
+    _page_pool: PagePool = PagePool()
+
+    def _lease_browser(self) -> AsyncContextManager[Browser]:
+        """
+        Borrow a browser of the engine set in the scraper config.
+
+        The browsers of an engine are pooled per process and launched when a
+        scraper first asks for the engine.
+
+        Example:
+            async with self._lease_browser() as browser:
+                async with self._lease_context(browser) as context:
+                    page = await context.new_page()
+        """
+
+        return shared_engine_pools().lease(self._config.browser)
+
     async def _new_context(self, browser: Browser) -> BrowserContext:
-        """Create async bowser context."""
-
-        return await browser.new_context(
-            viewport={
-                "width": common_config.max_window_width,
-                "height": common_config.max_window_height,
-            },
-            proxy=self._config.proxy if self._config.is_proxy_available else None,
-        )
+        """
+        Create async bowser context with the request routing of the scraper.
+
+        With a proxy pool, the context holds a proxy of the pool until it is
+        closed. With a storage_state section, the context starts with the
+        cookies saved for its proxy and its state is saved in the background.
+        """
+
+        pool = proxy_pool_for(self._config)
+        lease = None if pool is None else await pool.acquire()
+        proxy = self.__proxy(lease)
+        store = storage_state_for(self._config)
+        try:
+            context = await browser.new_context(
+                viewport=self.__viewport(),
+                proxy=proxy,
+                storage_state=None if store is None else await store.get(proxy),
+            )
+        except BaseException:
+            if lease is not None:
+                lease.release(error=True)
+            raise
+
+        if lease is not None:
+            watch_context(context, lease)
+            context.once("close", lambda _: lease.release())
+        if store is not None:
+            store.track(context, proxy)
+
+        router = router_for(self._config)
+        if router is not None:
+            await router.install(context)
+        return context
+
+    def _lease_context(self, browser: Browser) -> AsyncContextManager[BrowserContext]:
+        """
+        Borrow a warm browser context from the shared context pool.
+
+        The context has the same settings as one from _new_context() and goes
+        back to the pool at the end of the block. With a proxy pool, the
+        context uses the proxy leased for the block. With a storage_state
+        section, the state of the context is saved when the block exits
+        normally.
+
+        Example:
+            async with self._lease_context(browser) as context:
+                page = await context.new_page()
+        """
+
+        pool = proxy_pool_for(self._config)
+        store = storage_state_for(self._config)
+        if pool is None and store is None:
+            leased = self._context_pool.context(
+                browser,
+                viewport=self.__viewport(),
+                proxy=self.__proxy(None),
+                router=router_for(self._config),
+            )
+        else:
+            leased = self.__stateful_context(browser, pool, store)
+        return self.__releasing_pages(leased)
+
+    def _lease_page(self, context: BrowserContext) -> AsyncContextManager[Page]:
+        """
+        Borrow a blank page of a context from the shared page pool.
+
+        The page goes back to the pool at the end of the block. Handlers added
+        with self._page_pool.listen() are removed then, along with routes and
+        extra HTTP headers.
+
+        Example:
+            async with self._lease_page(context) as page:
+                await page.goto(self._config.url)
+        """
+
+        return self._page_pool.page(context)
+
+    @asynccontextmanager
+    async def __releasing_pages(
+        self, leased: AsyncContextManager[BrowserContext]
+    ) -> AsyncIterator[BrowserContext]:
+        async with leased as context:
+            try:
+                yield context
+            finally:
+                # no refill may open pages once the context goes back
+                await self._page_pool.release(context)
+
+    @asynccontextmanager
+    async def __stateful_context(
+        self,
+        browser: Browser,
+        pool: ProxyPool | None,
+        store: StorageStateStore | None,
+    ) -> AsyncIterator[BrowserContext]:
+        lease = None if pool is None else await pool.acquire()
+        proxy = self.__proxy(lease)
+        try:
+            async with self._context_pool.context(
+                browser,
+                viewport=self.__viewport(),
+                proxy=proxy,
+                storage_state=None if store is None else await store.get(proxy),
+                router=router_for(self._config),
+            ) as context:
+                unwatch = None if lease is None else watch_context(context, lease)
+                try:
+                    yield context
+                    if store is not None:
+                        await store.capture(context, proxy)
+                finally:
+                    if unwatch is not None:
+                        unwatch()
+        finally:
+            if lease is not None:
+                lease.release()
+
+    def __proxy(self, lease: ProxyLease | None) -> dict[str, str] | None:
+        if lease is not None:
+            return lease.proxy
+        return self._config.proxy if self._config.is_proxy_available else None
+
+    def __viewport(self) -> dict[str, int]:
+        return {
+            "width": config.common_config.max_window_width,
+            "height": config.common_config.max_window_height,
+        }
+
+
+class MixinFetcher(MixinContextCreator):
+    async def _new_fetcher(self, browser: Browser | None = None) -> IFetcher:
+        """
+        Create a fetcher for the engine set in the scraper config.
+
+        Scrapers that only use the fetcher run on either engine; the browser
+        is ignored by the http engine.
+
+        Example:
+            async with await self._new_fetcher(browser) as fetcher:
+                response = await fetcher.fetch(self._config.url)
+
+        Raises:
+            ValueError: if the engine is unknown, or the browser engine is used
+                without a browser.
+        """
+
+        engine = self._config.engine
+        if engine == "http":
+            return HttpFetcher(self._config)
+        if engine == "browser":
+            if browser is None:
+                raise ValueError("The browser engine needs a browser.")
+            return BrowserFetcher(
+                await self._new_context(browser),
+                owns_context=True,
+                pages=self._page_pool,
+            )
+        raise ValueError(f"Unknown engine '{engine}'")
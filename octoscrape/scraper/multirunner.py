@@ -4,8 +4,10 @@ import threading
 import time
 from typing import Iterable
 
+from .. import config
+from ..browser_manager.engines import shared_engine_pools
+from ..browser_manager.storage_state import close_storage_states
 from ..concurrency import AsyncPool
-from ..config import common_config, scrappers_configs
 from .factory import ScraperFactory
 from .interfaces import IAsyncScraper
 
@@ -72,7 +74,7 @@ class MultiRunner:
             self.__running_loop.create_task(init())
             self.__running_loop.run_forever()
 
-        self.__pool = AsyncPool(common_config.pool_size)
+        self.__pool = AsyncPool(config.common_config.pool_size)
         self.__loop_thread = threading.Thread(target=run_loop, daemon=False)
         self.__loop_thread.start()
 
@@ -82,6 +84,9 @@ class MultiRunner:
         """
         Stop all scrapers, close the AsyncPool, and terminate the event loop.
 
+        Scrapers get `stop_timeout` seconds from the common config to stop; the
+        ones still running after that are cancelled.
+
         Raises:
             RuntimeError: If the MultiRunner was not started.
         """
@@ -89,10 +94,16 @@ class MultiRunner:
         if not self.is_started:
             raise RuntimeError("Multirainer was not started.")
 
+        deadline = time.monotonic() + config.common_config.stop_timeout
+
         self.stop_scrapers()
         while not all((i.is_stopped for i in self.__scrapers.values())):
+            if time.monotonic() >= deadline:
+                running = [k for k, v in self.__scrapers.items() if not v.is_stopped]
+                logger.warning(f"Scrapers did not stop in time: {running}")
+                break
             time.sleep(0.05)
-        self.__close_async_loop()
+        self.__close_async_loop(grace=max(0.0, deadline - time.monotonic()))
 
         self.__factory = None
         self.__scrapers = {}
@@ -100,18 +111,29 @@ class MultiRunner:
         self.__running_loop = None
         self.__loop_thread = None
 
-    def __close_async_loop(self):
+    def __close_async_loop(self, grace: float = 0):
         """
-        Internal method to stop the AsyncPool and close the asyncio loop safely.
+        Internal method to stop the AsyncPool, save the storage states, close
+        the browsers of the scrapers and close the asyncio loop safely.
+
+        Args:
+            grace: Seconds the pool jobs get to finish before they are cancelled.
         """
 
         # close pool
         async def f(r: threading.Event):
-            await self.__pool.stop()
+            abandoned = await self.__pool.stop(grace=grace)
+            if abandoned:
+                logger.warning(
+                    f"Cancelled on stop: {', '.join(h.name for h in abandoned)}"
+                )
+            # the last captures need the contexts, before the browsers close
+            await close_storage_states()
+            await shared_engine_pools().close()
             r.set()
 
         ready = threading.Event()
-        self.__running_loop.create_task(f(ready))
+        asyncio.run_coroutine_threadsafe(f(ready), self.__running_loop)
         ready.wait()
 
         # close async loop
@@ -144,7 +166,7 @@ class MultiRunner:
             raise RuntimeError("Multirainer was not started.")
 
         if scrapers is None:
-            scrapers = (k for k in scrappers_configs.keys())
+            scrapers = (k for k in config.scrappers_configs.keys())
 
         async def run_scrapers():
             for k in scrapers:
@@ -156,10 +178,19 @@ class MultiRunner:
 
                 if scraper and scraper.is_stopped:
                     logger.warning(f"The scraper {k} restarted.")
-                self.__scrapers[k] = self.__factory(scrappers_configs[k])
+                self.__scrapers[k] = self.__factory(config.scrappers_configs[k])
                 await self.__pool.submit(self.__scrapers[k].async_start())
 
-        self.__running_loop.create_task(run_scrapers())
+        asyncio.run_coroutine_threadsafe(run_scrapers(), self.__running_loop)
+
+    def status(self) -> dict[str, bool]:
+        """
+        Get the state of the scrapers launched by this runner.
+
+        Returns:
+            Mapping of scraper key to True if it is running, False otherwise.
+        """
+        return {k: not v.is_stopped for k, v in self.__scrapers.items()}
 
     def stop_scrapers(self, scrapers: Iterable[str] | None = None):
         """
@@ -183,4 +214,4 @@ class MultiRunner:
                 *[self.__scrapers[k].async_stop() for k in scrapers],
             )
 
-        self.__running_loop.create_task(stop_scrapers())
+        asyncio.run_coroutine_threadsafe(stop_scrapers(), self.__running_loop)
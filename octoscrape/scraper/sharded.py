@@ -0,0 +1,262 @@
+import logging
+import multiprocessing as mp
+import signal
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Iterable
+
+from .. import config
+from .interfaces import IAsyncScraper
+from .multirunner import MultiRunner
+
+logger = logging.getLogger(__name__)
+
+
+def assign_shards(keys: Iterable[str], shards: int) -> dict[str, int]:
+    """
+    Spread scraper keys across shards round-robin, in sorted key order.
+
+    Returns:
+        Mapping of scraper key to shard index.
+    """
+    return {key: i % shards for i, key in enumerate(sorted(keys))}
+
+
+def _shard_main(conn: Connection, scrapers: list[type[IAsyncScraper]], keys: list[str]):
+    """
+    Entry point of a shard process.
+
+    Runs a MultiRunner (its own loop, AsyncPool and browser managers) and
+    executes commands received from the parent until "stop" or until the
+    parent goes away.
+    """
+
+    # Ctrl+C is handled by the parent shell, which stops shards explicitly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    runner = MultiRunner()
+    runner.register(scrapers)
+    runner.start()
+
+    try:
+        while True:
+            command, arg = conn.recv()
+            try:
+                if command == "run":
+                    runner.run_scrapers(keys if arg is None else arg)
+                    conn.send(("ok", None))
+                elif command == "stop_scrapers":
+                    runner.stop_scrapers(arg)
+                    conn.send(("ok", None))
+                elif command == "status":
+                    conn.send(("ok", runner.status()))
+                elif command == "stop":
+                    break
+                else:
+                    conn.send(("error", f"Unknown command '{command}'"))
+            except Exception as e:
+                logger.error(f"Shard command '{command}' failed", exc_info=True)
+                conn.send(("error", repr(e)))
+    except (EOFError, OSError):
+        logger.warning("Shard lost connection to the parent process.")
+
+    runner.stop()
+    try:
+        conn.send(("ok", None))
+    except (EOFError, OSError):
+        pass
+
+
+class _Shard:
+    """Parent-side handle of a shard process."""
+
+    def __init__(self, process: mp.Process, conn: Connection, keys: list[str]):
+        self.process = process
+        self.conn = conn
+        self.keys = keys
+        self.lock = threading.Lock()
+
+    def call(self, command: str, arg: Any = None) -> Any:
+        with self.lock:
+            self.conn.send((command, arg))
+            status, result = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Shard {self.process.name}: {result}")
+        return result
+
+
+class ShardedMultiRunner:
+    """
+    MultiRunner that spreads scrapers across several worker processes.
+
+    Every process runs its own MultiRunner with its own asyncio loop, AsyncPool
+    and browser managers, so throughput is not capped by a single Python core.
+    The parent sends start/stop/status commands to the processes over pipes.
+    Scrapers are assigned to processes by their config key.
+
+    Args:
+        processes (int): Number of worker processes.
+        stop_timeout (float | None): Seconds to wait for a process to exit on
+            stop() before it is terminated. Defaults to `stop_timeout` from the
+            common config.
+
+    Note:
+        Processes are spawned, so registered scraper classes must be importable
+        at module level.
+    """
+
+    def __init__(self, processes: int, stop_timeout: float | None = None):
+        if processes < 1:
+            raise ValueError("processes must be at least 1.")
+
+        self.__processes = processes
+        self.__stop_timeout = stop_timeout
+        self.__scraper_classes: list[type[IAsyncScraper]] = []
+        self.__shards: list[_Shard] = []
+        self.__routes: dict[str, int] = {}
+
+    @property
+    def is_started(self):
+        """
+        Check whether the worker processes are running.
+
+        Returns:
+            True if at least one worker process is alive, False otherwise.
+        """
+        return any(s.process.is_alive() for s in self.__shards)
+
+    def start(self):
+        """
+        Spawn the worker processes and start a MultiRunner in each of them.
+
+        Raises:
+            RuntimeError: If the runner is already started.
+        """
+
+        if self.is_started:
+            raise RuntimeError("Multirainer is already started.")
+
+        self.__routes = assign_shards(config.scrappers_configs.keys(), self.__processes)
+        ctx = mp.get_context("spawn")
+
+        for index in range(self.__processes):
+            keys = [k for k, shard in self.__routes.items() if shard == index]
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_shard_main,
+                args=(child_conn, self.__scraper_classes, keys),
+                name=f"octoscrape-shard-{index}",
+                daemon=False,
+            )
+            process.start()
+            child_conn.close()
+            self.__shards.append(_Shard(process, parent_conn, keys))
+
+        logger.debug(f"ShardedMultiRunner({self.__processes}) started")
+
+    def stop(self):
+        """
+        Stop all scrapers and worker processes.
+
+        Raises:
+            RuntimeError: If the runner was not started.
+        """
+
+        if not self.is_started:
+            raise RuntimeError("Multirainer was not started.")
+
+        for shard in self.__shards:
+            try:
+                shard.call("stop")
+            except (EOFError, OSError, RuntimeError):
+                logger.warning(f"Shard {shard.process.name} did not stop cleanly.")
+
+        stop_timeout = self.__stop_timeout
+        if stop_timeout is None:
+            stop_timeout = config.common_config.stop_timeout
+        for shard in self.__shards:
+            shard.process.join(stop_timeout)
+            if shard.process.is_alive():
+                logger.warning(f"Shard {shard.process.name} terminated.")
+                shard.process.terminate()
+                shard.process.join()
+            shard.conn.close()
+
+        self.__shards = []
+        self.__routes = {}
+
+    def register(self, scrapers: Iterable[type[IAsyncScraper]]):
+        """
+        Register scraper classes to be used by the worker processes.
+
+        Must be called before start().
+
+        Args:
+            scrapers: Iterable of IAsyncScraper subclasses.
+        """
+        self.__scraper_classes = list(scrapers)
+
+    def run_scrapers(self, scrapers: Iterable[str] | None = None):
+        """
+        Launch scrapers in the processes they are assigned to.
+
+        Args:
+            scrapers: Optional list of scraper keys to run. If None, all configured scrapers are run.
+
+        Raises:
+            RuntimeError: If the runner is not started.
+        """
+        self.__broadcast("run", scrapers)
+
+    def stop_scrapers(self, scrapers: Iterable[str] | None = None):
+        """
+        Stop running scrapers in the processes they are assigned to.
+
+        Args:
+            scrapers: Optional list of scraper keys to stop. If None, stops all running scrapers.
+
+        Raises:
+            RuntimeError: If the runner is not started.
+        """
+        self.__broadcast("stop_scrapers", scrapers)
+
+    def status(self) -> dict[str, bool]:
+        """
+        Collect the state of the scrapers from all processes.
+
+        Returns:
+            Mapping of scraper key to True if it is running, False otherwise.
+
+        Raises:
+            RuntimeError: If the runner is not started.
+        """
+
+        if not self.is_started:
+            raise RuntimeError("Multirainer was not started.")
+
+        status = {}
+        for shard in self.__shards:
+            status.update(shard.call("status"))
+        return status
+
+    def __broadcast(self, command: str, scrapers: Iterable[str] | None):
+        """Send a command to the shards owning the given scraper keys."""
+
+        if not self.is_started:
+            raise RuntimeError("Multirainer was not started.")
+
+        if scrapers is None:
+            for shard in self.__shards:
+                shard.call(command)
+            return
+
+        per_shard: dict[int, list[str]] = {}
+        for key in scrapers:
+            index = self.__routes.get(key, None)
+            if index is None:
+                logger.warning(f"The scraper {key} is not configured.")
+                continue
+            per_shard.setdefault(index, []).append(key)
+
+        for index, keys in per_shard.items():
+            self.__shards[index].call(command, keys)
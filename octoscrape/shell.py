@@ -2,8 +2,8 @@ import cmd
 import logging
 from typing import Iterable
 
-from .scraper import MultiRunner, IAsyncScraper
-from .config import scrappers_configs
+from . import config
+from .scraper import MultiRunner, IAsyncScraper, ShardedMultiRunner
 
 
 logger = logging.getLogger(__name__)
@@ -12,9 +12,21 @@ logger = logging.getLogger(__name__)
 class Shell(cmd.Cmd):
     prompt = "> "
 
-    def __init__(self, scrapers: Iterable[IAsyncScraper]):
+    def __init__(self, scrapers: Iterable[IAsyncScraper], processes: int | None = None):
+        """
+        Args:
+            scrapers: Scraper classes available to the runner.
+            processes: Number of worker processes to shard scrapers across.
+                Defaults to `processes` from the common config; 1 runs all
+                scrapers in this process.
+        """
         super().__init__()
-        self.runner : MultiRunner = MultiRunner()
+        if processes is None:
+            processes = config.common_config.processes
+
+        self.runner : MultiRunner | ShardedMultiRunner = (
+            ShardedMultiRunner(processes) if processes > 1 else MultiRunner()
+        )
         self.runner.register(scrapers)
 
     def do_start(self, arg):
@@ -60,6 +72,22 @@ class Shell(cmd.Cmd):
             return
         self.runner.stop_scrapers(processed_arg)
 
+    def do_status(self, arg):
+        """
+        Shows which scrapers are running.
+
+                Example:
+                    > status
+
+        """
+
+        if not self.runner.is_started:
+            print("No scrapers are running.")
+            return
+
+        for key, running in sorted(self.runner.status().items()):
+            print(f"{key}: {'running' if running else 'stopped'}")
+
     def do_exit(self, arg):
         """Closes the shell and all scrapers"""
         self._stop_all()
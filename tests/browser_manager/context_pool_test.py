@@ -0,0 +1,229 @@
+import asyncio
+
+import pytest
+
+from octoscrape.browser_manager import ContextPool
+
+
+class FakeFrame:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "framenavigated"
+        self.handlers.append(handler)
+
+    async def route(self, pattern, handler): ...
+
+    async def goto(self, url):
+        self.url = url.rstrip("/")
+        for handler in self.handlers:
+            handler(FakeFrame(url))
+
+    async def evaluate(self, script, items):
+        self.context.local_storage[self.url] = {i["name"]: i["value"] for i in items}
+
+    async def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        state = storage_state or {}
+        self.cookies = list(state.get("cookies", []))
+        self.local_storage = {
+            o["origin"]: {i["name"]: i["value"] for i in o["localStorage"]}
+            for o in state.get("origins", [])
+        }
+        self.pages = []
+        self.opened = 0
+        self.handlers = []
+        self.closed = False
+
+    def on(self, event, handler):
+        assert event == "page"
+        self.handlers.append(handler)
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        self.opened += 1
+        for handler in self.handlers:
+            handler(page)
+        return page
+
+    async def clear_cookies(self):
+        self.cookies = []
+
+    async def clear_permissions(self): ...
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    async def new_context(self, viewport=None, proxy=None, storage_state=None):
+        context = FakeContext(storage_state)
+        self.contexts.append(context)
+        return context
+
+    def is_connected(self):
+        return self.connected
+
+
+@pytest.mark.asyncio
+async def test_context_is_reused_and_reset():
+    pool = ContextPool()
+    browser = FakeBrowser()
+
+    async with pool.context(browser) as first:
+        await first.new_page()
+        first.cookies.append({"name": "session"})
+
+    async with pool.context(browser) as second:
+        assert second is first
+        assert second.pages == []
+        assert second.cookies == []
+
+    assert pool.stats() == (1, 1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_contexts_keyed_by_settings():
+    pool = ContextPool()
+    browser = FakeBrowser()
+
+    async with pool.context(browser, proxy={"server": "http://a:1"}) as first:
+        ...
+    async with pool.context(browser, proxy={"server": "http://b:1"}) as second:
+        assert second is not first
+    async with pool.context(browser, viewport={"width": 1, "height": 1}) as third:
+        assert third not in (first, second)
+
+
+@pytest.mark.asyncio
+async def test_storage_state_restored():
+    pool = ContextPool()
+    browser = FakeBrowser()
+    state = {"cookies": [{"name": "login"}], "origins": []}
+
+    async with pool.context(browser, storage_state=state) as context:
+        await context.clear_cookies()
+    async with pool.context(browser, storage_state=state) as context:
+        assert context.cookies == [{"name": "login"}]
+
+
+@pytest.mark.asyncio
+async def test_local_storage_reset_and_context_reused():
+    pool = ContextPool()
+    browser = FakeBrowser()
+    login = {"origin": "https://a.com", "localStorage": [{"name": "t", "value": "1"}]}
+    state = {"cookies": [], "origins": [login]}
+
+    async with pool.context(browser, storage_state=state) as first:
+        page = await first.new_page()
+        await page.goto("https://a.com/")
+        first.local_storage["https://a.com"] = {"t": "2", "cart": "3"}
+        await page.goto("https://b.com/")
+        first.local_storage["https://b.com"] = {"visited": "1"}
+
+    async with pool.context(browser, storage_state=state) as second:
+        assert second is first
+        assert second.pages == []
+        assert second.local_storage == {
+            "https://a.com": {"t": "1"},
+            "https://b.com": {},
+        }
+
+    assert not first.closed
+    assert pool.stats() == (1, 1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_local_storage_reset_on_open_page():
+    pool = ContextPool()
+    browser = FakeBrowser()
+
+    async with pool.context(browser) as context:
+        page = await context.new_page()
+        await page.goto("https://a.com/")
+        context.local_storage["https://a.com"] = {"visited": "1"}
+
+    assert context.local_storage == {"https://a.com": {}}
+    # cleared from the open page, without opening another one
+    assert context.opened == 1
+
+
+@pytest.mark.asyncio
+async def test_retire_after_max_uses():
+    pool = ContextPool(max_uses=2)
+    browser = FakeBrowser()
+
+    seen = []
+    for _ in range(3):
+        async with pool.context(browser) as context:
+            seen.append(context)
+
+    assert seen[0] is seen[1]
+    assert seen[2] is not seen[0]
+    assert seen[0].closed
+
+
+@pytest.mark.asyncio
+async def test_failed_block_retires_context():
+    pool = ContextPool()
+    browser = FakeBrowser()
+
+    with pytest.raises(ValueError):
+        async with pool.context(browser) as context:
+            raise ValueError
+
+    await pool.close()
+    assert context.closed
+    assert pool.stats().idle == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnected_browser_contexts_not_reused():
+    pool = ContextPool()
+    browser = FakeBrowser()
+
+    async with pool.context(browser) as first:
+        ...
+    browser.connected = False
+    async with pool.context(browser) as second:
+        assert second is not first
+
+    await asyncio.sleep(0)
+    assert first.closed
+
+
+@pytest.mark.asyncio
+async def test_expired_contexts_of_other_settings_retired():
+    pool = ContextPool(max_age=0.05)
+    browser = FakeBrowser()
+    old_state = {"cookies": [{"name": "old"}], "origins": []}
+    new_state = {"cookies": [{"name": "new"}], "origins": []}
+
+    async with pool.context(browser, storage_state=old_state) as stale:
+        ...
+    await asyncio.sleep(0.06)
+    async with pool.context(browser, storage_state=new_state):
+        ...
+
+    assert stale.closed
+    assert pool.stats().idle == 1
@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from octoscrape import config
+from octoscrape.browser_manager import (
+    BrowserEngine,
+    EnginePools,
+    get_engine,
+    register_engine,
+)
+from octoscrape.browser_manager import engines as engines_module
+from octoscrape.browser_manager.engines import shared_engine_pools
+from octoscrape.config import CommonConfig
+
+
+class FakeBrowser:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+        self.contexts = []
+
+    def on(self, event, handler): ...
+
+    def is_connected(self):
+        return not self.closed
+
+
+@pytest.fixture(scope="function")
+def launched():
+    return []
+
+
+@pytest.fixture(scope="function")
+def fake_engine(launched, monkeypatch):
+    monkeypatch.setattr(engines_module, "_engines", dict(engines_module._engines))
+
+    @asynccontextmanager
+    async def launch(**options):
+        await asyncio.sleep(0.01)
+        browser = FakeBrowser(options)
+        launched.append(browser)
+        try:
+            yield browser
+        finally:
+            browser.closed = True
+
+    engine = BrowserEngine(
+        "fake", launch, lambda: {"args": ["--fast"], "prefs": {"a": 1}}
+    )
+    register_engine(engine)
+    return engine
+
+
+@pytest.fixture(scope="function")
+def common(monkeypatch):
+    common = CommonConfig({})
+    monkeypatch.setattr(config, "common_config", common, raising=False)
+    return common
+
+
+def test_builtin_engines():
+    for name in ("firefox", "chromium", "webkit", "camoufox"):
+        assert get_engine(name).name == name
+    with pytest.raises(ValueError, match="Unknown browser engine"):
+        get_engine("netscape")
+
+
+def test_options_extended_by_common_config(fake_engine, monkeypatch):
+    engines = {"fake": {"args": ["--lean"], "prefs": {"b": 2}, "channel": "x"}}
+    monkeypatch.setattr(
+        config,
+        "common_config",
+        CommonConfig({"browser_engines": engines}),
+        raising=False,
+    )
+
+    assert fake_engine.options() == {
+        "args": ["--fast", "--lean"],
+        "prefs": {"a": 1, "b": 2},
+        "channel": "x",
+    }
+
+
+@pytest.mark.asyncio
+async def test_pools_launched_on_first_use(fake_engine, launched, common):
+    pools = EnginePools(size=2)
+    assert pools.engines == []
+
+    async with pools.lease("fake") as browser:
+        assert browser.options["args"] == ["--fast"]
+    assert pools.engines == ["fake"]
+    assert len(launched) == 2
+
+    async with pools.lease("fake"):
+        assert len(launched) == 2
+
+    await pools.close()
+    assert all(browser.closed for browser in launched)
+    assert pools.engines == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_use_launches_once(fake_engine, launched, common):
+    pools = EnginePools()
+
+    async def use():
+        async with pools.lease("fake"):
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(use() for _ in range(5)))
+    assert len(launched) == 1
+    await pools.close()
+
+
+@pytest.mark.asyncio
+async def test_unknown_engine_not_launched(common):
+    pools = EnginePools()
+
+    with pytest.raises(ValueError):
+        async with pools.lease("netscape"):
+            ...
+    assert pools.engines == []
+
+
+@pytest.mark.asyncio
+async def test_pooled_browsers_supervised(fake_engine, launched, monkeypatch):
+    common = CommonConfig({"browser_max_uptime": 0.05, "health_check_interval": 0.01})
+    monkeypatch.setattr(config, "common_config", common, raising=False)
+    pools = EnginePools()
+
+    async with pools.lease("fake") as browser:
+        await asyncio.sleep(0.1)
+        assert not browser.closed  # kept for the lease
+    await asyncio.sleep(0.1)
+    assert launched[0].closed
+    assert len(launched) > 1
+
+    await pools.close()
+    assert all(browser.closed for browser in launched)
+
+
+@pytest.mark.asyncio
+async def test_shared_pools_closed_when_idle(fake_engine, launched, monkeypatch):
+    common = CommonConfig({"browser_idle_timeout": 0.05})
+    monkeypatch.setattr(config, "common_config", common, raising=False)
+    monkeypatch.setattr(engines_module, "_shared_pools", None)
+    pools = shared_engine_pools()
+
+    async with pools.lease("fake"):
+        await asyncio.sleep(0.1)  # not idle while leased
+        assert not launched[0].closed
+    async with pools.lease("fake"):
+        assert len(launched) == 1  # the idle timer restarts
+
+    await asyncio.sleep(0.1)
+    assert launched[0].closed
+    assert pools.engines == []
+
+    async with pools.lease("fake") as browser:
+        assert browser is launched[1]
+    await pools.close()
+    assert all(browser.closed for browser in launched)
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from octoscrape.browser_manager import FingerprintCache
+from octoscrape.browser_manager.fingerprints import generate_fingerprint
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture(scope="function")
+def generated():
+    return []
+
+
+@pytest.fixture(scope="function")
+def generate(generated):
+    lock = threading.Lock()
+
+    def generate():
+        fingerprint = generate_fingerprint()
+        with lock:
+            generated.append(fingerprint)
+        return fingerprint
+
+    return generate
+
+
+def test_take_without_ready_fingerprint_generates(generate, generated):
+    cache = FingerprintCache(size=2, generate=generate)
+
+    fingerprint = cache.take()
+
+    assert generated == [fingerprint]
+    assert cache.stats().misses == 1
+
+
+def test_pregenerated_in_background(generate, generated):
+    cache = FingerprintCache(size=3, generate=generate)
+    cache.start()
+    try:
+        wait_for(lambda: cache.stats().ready == 3)
+        fingerprint = cache.take()
+    finally:
+        cache.close()
+
+    assert fingerprint in generated
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 0
+
+
+def test_rotation_and_retirement(generate, generated):
+    cache = FingerprintCache(size=2, max_uses=2, generate=generate)
+    cache.start()
+    try:
+        wait_for(lambda: cache.stats().ready == 2)
+        first, second, third = cache.take(), cache.take(), cache.take()
+        assert first == third  # handed out in turn
+        assert first != second
+
+        cache.take()  # second use of `second` retires it as well
+        wait_for(lambda: cache.stats().ready == 2)
+    finally:
+        cache.close()
+
+    stats = cache.stats()
+    assert stats.retired == 2
+    assert stats.generated == 4
+
+
+def test_expired_by_age(generate):
+    cache = FingerprintCache(size=1, max_age=0.0, generate=generate)
+
+    cache.take()
+    cache.take()
+
+    assert cache.stats().misses == 2
+
+
+def test_persisted_between_runs(generate, generated, tmp_path):
+    path = tmp_path / "fingerprints.json"
+    cache = FingerprintCache(path, size=2, generate=generate)
+    cache.start()
+    wait_for(lambda: cache.stats().ready == 2)
+    cache.close()
+
+    reloaded = FingerprintCache(path, size=2, generate=generate)
+    assert reloaded.stats().ready == 2
+    assert reloaded.take() in generated
+    assert len(generated) == 2
+
+
+def test_unreadable_file_ignored(generate, tmp_path):
+    path = tmp_path / "fingerprints.json"
+    path.write_text("not json")
+
+    assert FingerprintCache(path, generate=generate).stats().ready == 0
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        FingerprintCache(size=0)
+    with pytest.raises(ValueError):
+        FingerprintCache(max_uses=0)
@@ -0,0 +1,365 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from octoscrape.browser_manager import BrowserSupervisor, HealthLimits
+from octoscrape.browser_manager import health as health_module
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "page"
+        self.handlers.append(handler)
+
+    def open_page(self):
+        page = object()
+        self.pages.append(page)
+        for handler in self.handlers:
+            handler(page)
+        return page
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "disconnected"
+        self.handlers.append(handler)
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def crash(self):
+        self.connected = False
+        for handler in self.handlers:
+            handler(self)
+
+
+@pytest.fixture(scope="function")
+def launched():
+    return []
+
+
+@pytest.fixture(scope="function")
+def launcher(launched):
+    @asynccontextmanager
+    async def launch():
+        browser = FakeBrowser()
+        launched.append(browser)
+        try:
+            yield browser
+        finally:
+            browser.closed = True
+
+    return launch
+
+
+async def wait_for(predicate, timeout=1.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_supervisor_lifecycle(launcher, launched):
+    swapped = []
+    supervisor = BrowserSupervisor(launcher, on_swap=swapped.append)
+    assert not supervisor.running
+
+    async with supervisor.run():
+        assert supervisor.browser is launched[0]
+        assert swapped == [launched[0]]
+        with pytest.raises(RuntimeError, match="The browser already exists"):
+            async with supervisor.run():
+                ...
+
+    assert launched[0].closed
+    with pytest.raises(RuntimeError, match="browser has not been created yet"):
+        supervisor.browser
+
+
+@pytest.mark.asyncio
+async def test_pages_counted(launcher):
+    supervisor = BrowserSupervisor(launcher)
+
+    async with supervisor.run():
+        context = supervisor.browser.new_context()
+        context.open_page()
+        assert supervisor.health().pages == 1
+
+        context.open_page()
+        context.open_page()
+        health = supervisor.health()
+        assert health.pages == 3
+        assert health.connected
+        assert health.recycles == 0
+
+
+@pytest.mark.asyncio
+async def test_recycled_past_page_limit(launcher, launched):
+    limits = HealthLimits(max_pages=2, interval=0.01, drain_timeout=1.0)
+    supervisor = BrowserSupervisor(launcher, limits)
+
+    async with supervisor.run():
+        old = supervisor.browser
+        context = old.new_context()
+        context.open_page()
+        context.open_page()
+
+        await wait_for(lambda: supervisor.browser is not old)
+        assert supervisor.health().recycles == 1
+        assert supervisor.health().pages == 0
+
+        # the old browser stays open while its pages are
+        await asyncio.sleep(0.05)
+        assert not old.closed
+        context.pages.clear()
+        await wait_for(lambda: old.closed)
+
+
+@pytest.mark.asyncio
+async def test_recycled_past_memory_limit(launcher, launched, monkeypatch):
+    monkeypatch.setattr(health_module, "_rss", lambda pids: 600 * 2**20)
+    limits = HealthLimits(max_rss=512 * 2**20, interval=0.01)
+    supervisor = BrowserSupervisor(launcher, limits)
+
+    async with supervisor.run():
+        await wait_for(lambda: len(launched) == 2)
+        await wait_for(lambda: launched[0].closed)
+
+
+@pytest.mark.asyncio
+async def test_swap_keeps_leases(launcher, launched):
+    supervisor = BrowserSupervisor(launcher, HealthLimits(drain_timeout=1.0))
+
+    async with supervisor.run():
+        lease = supervisor.lease()
+        leased = await lease.__aenter__()
+
+        await supervisor.recycle()
+        assert supervisor.browser is launched[1]
+        assert supervisor.browser is not leased
+
+        await asyncio.sleep(0.05)
+        assert not leased.closed
+        await lease.__aexit__(None, None, None)
+        await wait_for(lambda: leased.closed)
+
+
+@pytest.mark.asyncio
+async def test_browser_available_during_swap(launched):
+    release = asyncio.Event()
+
+    @asynccontextmanager
+    async def slow_launch():
+        if launched:
+            await release.wait()
+        browser = FakeBrowser()
+        launched.append(browser)
+        yield browser
+
+    supervisor = BrowserSupervisor(slow_launch)
+
+    async with supervisor.run():
+        recycling = asyncio.create_task(supervisor.recycle())
+        await asyncio.sleep(0.01)
+        assert supervisor.browser is launched[0]
+
+        release.set()
+        await recycling
+        assert supervisor.browser is launched[1]
+
+
+@pytest.mark.asyncio
+async def test_crash_is_reported_and_replaced(launcher, launched, caplog):
+    supervisor = BrowserSupervisor(launcher)
+
+    async with supervisor.run():
+        launched[0].crash()
+        assert "crashed" in caplog.text
+        assert supervisor.health().crashes == 1
+
+        await wait_for(lambda: supervisor.browser is not launched[0])
+        assert launched[0].closed
+        assert supervisor.health().connected
+
+
+@pytest.mark.asyncio
+async def test_draining_browser_closed_on_stop(launcher, launched):
+    supervisor = BrowserSupervisor(launcher, HealthLimits(drain_timeout=60.0))
+
+    async with supervisor.run():
+        supervisor.browser.new_context().open_page()
+        await supervisor.recycle()
+
+    assert all(browser.closed for browser in launched)
+
+
+def test_limits_exceeded():
+    limits = HealthLimits(max_pages=10, max_uptime=60.0, max_rss=100)
+    health = health_module.BrowserHealth(
+        pages=1, uptime=1.0, rss=None, leases=0, connected=True, recycles=0, crashes=0
+    )
+
+    assert limits.exceeded(health) is None
+    assert "pages" in limits.exceeded(health._replace(pages=10))
+    assert "uptime" in limits.exceeded(health._replace(uptime=61.0))
+    assert "RSS" in limits.exceeded(health._replace(rss=200))
+
+
+@pytest.mark.asyncio
+async def test_launched_on_first_lease(launcher, launched):
+    swapped = []
+    supervisor = BrowserSupervisor(launcher, on_swap=swapped.append, idle_timeout=60)
+
+    async with supervisor.run():
+        assert launched == []
+        assert not supervisor.running
+        with pytest.raises(RuntimeError):
+            supervisor.browser
+
+        async with supervisor.lease() as browser:
+            assert browser is launched[0]
+            assert supervisor.browser is browser
+        assert swapped == [launched[0]]
+
+
+@pytest.mark.asyncio
+async def test_burst_of_leases_launches_once(launched):
+    @asynccontextmanager
+    async def slow_launch():
+        await asyncio.sleep(0.02)
+        browser = FakeBrowser()
+        launched.append(browser)
+        yield browser
+
+    supervisor = BrowserSupervisor(slow_launch, idle_timeout=60)
+
+    async def use():
+        async with supervisor.lease() as browser:
+            return browser
+
+    async with supervisor.run():
+        browsers = await asyncio.gather(*(use() for _ in range(10)))
+
+    assert len(launched) == 1
+    assert set(browsers) == {launched[0]}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lease_keeps_launch(launched):
+    release = asyncio.Event()
+
+    @asynccontextmanager
+    async def slow_launch():
+        await release.wait()
+        browser = FakeBrowser()
+        launched.append(browser)
+        yield browser
+
+    supervisor = BrowserSupervisor(slow_launch, idle_timeout=60)
+
+    async def use():
+        async with supervisor.lease() as browser:
+            return browser
+
+    async with supervisor.run():
+        first = asyncio.create_task(use())
+        second = asyncio.create_task(use())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        release.set()
+
+        assert await second is launched[0]
+        assert len(launched) == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_browser_closed_and_relaunched(launcher, launched):
+    swapped = []
+    limits = HealthLimits(interval=0.01)
+    supervisor = BrowserSupervisor(
+        launcher, limits, on_swap=swapped.append, idle_timeout=0.05
+    )
+
+    async with supervisor.run():
+        async with supervisor.lease():
+            context = supervisor.browser.new_context()
+            context.open_page()
+        await asyncio.sleep(0.1)
+        assert supervisor.running  # a page is still open
+
+        context.pages.clear()
+        await wait_for(lambda: launched[0].closed)
+        assert not supervisor.running
+        assert swapped == [launched[0], None]
+
+        async with supervisor.lease() as browser:
+            assert browser is launched[1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_launches_measured_apart(monkeypatch):
+    children = set()
+
+    @asynccontextmanager
+    async def launch():
+        children.add(len(children) + 1)  # the driver of this launch
+        await asyncio.sleep(0.01)
+        yield FakeBrowser()
+
+    monkeypatch.setattr(health_module, "psutil", object())
+    monkeypatch.setattr(health_module, "_children", lambda: set(children))
+    monkeypatch.setattr(health_module, "_rss", lambda pids: sorted(pids))
+    first, second = BrowserSupervisor(launch), BrowserSupervisor(launch)
+
+    async def run(supervisor):
+        async with supervisor.run():
+            await asyncio.sleep(0.05)
+            return supervisor.health().rss
+
+    assert sorted(await asyncio.gather(run(first), run(second))) == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_manager_browser_while_idle(launcher, launched, monkeypatch):
+    from octoscrape import config
+    from octoscrape.browser_manager import playwright as playwright_module
+    from octoscrape.config import CommonConfig
+
+    common = CommonConfig({"browser_idle_timeout": 0.05, "health_check_interval": 0.01})
+    monkeypatch.setattr(config, "common_config", common, raising=False)
+    monkeypatch.setattr(playwright_module, "launch_firefox", launcher)
+    manager = playwright_module.PlaywrightBrowserManager()
+
+    async with manager.create_browser():
+        with pytest.raises(RuntimeError, match=r"idle, lease\(\) launches it"):
+            manager.browser
+
+        async with manager.lease() as browser:
+            assert manager.browser is browser
+        await wait_for(lambda: launched[0].closed)
+
+        with pytest.raises(RuntimeError, match=r"idle, lease\(\) launches it"):
+            manager.browser
+        async with manager.lease() as browser:
+            assert browser is launched[1]
+
+    with pytest.raises(RuntimeError, match="browser has not been created yet"):
+        manager.browser
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from octoscrape.browser_manager import PagePool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+        self.routes = 0
+        self.headers = {}
+        self.handlers = {"close": [lambda *_: None]}  # registered by the driver
+
+    def on(self, name, handler):
+        self.handlers.setdefault(name, []).append(handler)
+
+    def remove_listener(self, name, handler):
+        self.handlers[name].remove(handler)
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url):
+        self.url = url
+
+    async def route(self, *_):
+        self.routes += 1
+
+    async def unroute_all(self, behavior=None):
+        self.routes = 0
+
+    async def set_extra_http_headers(self, headers):
+        self.headers = headers
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.opened = []
+        self.handlers = []
+
+    def on(self, name, handler):
+        self.handlers.append(handler)
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.opened.append(page)
+        return page
+
+
+@pytest.mark.asyncio
+async def test_page_recycled():
+    pool = PagePool(size=1)
+    context = FakeContext()
+
+    async with pool.page(context) as first:
+        await first.goto("https://example.com")
+        await first.route("**/*")
+        await first.set_extra_http_headers({"referer": "https://example.com"})
+        pool.listen(first, "response", lambda _: None)
+
+    assert first.url == "about:blank"
+    assert first.routes == 0
+    assert first.headers == {}
+    assert {name: len(h) for name, h in first.handlers.items()} == {
+        "close": 1,
+        "response": 0,
+    }
+
+    async with pool.page(context) as second:
+        assert second is first
+
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.recycled) == (1, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_prewarm_and_refill():
+    pool = PagePool(size=2)
+    context = FakeContext()
+
+    await pool.prewarm(context)
+    assert len(context.opened) == 2
+
+    async with pool.page(context) as page:
+        assert page in context.opened
+        await asyncio.sleep(0)
+        assert pool.stats().idle == 2  # refilled in the background
+
+    # the pool is full, the returned page is closed
+    assert page.closed
+    assert pool.stats().discarded == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_block_closes_page():
+    pool = PagePool(size=1)
+    context = FakeContext()
+
+    with pytest.raises(ValueError):
+        async with pool.page(context) as page:
+            raise ValueError
+
+    await pool.close()
+    assert page.closed
+    assert pool.stats().idle == 0
+
+
+@pytest.mark.asyncio
+async def test_max_uses():
+    pool = PagePool(size=1, max_uses=1)
+    context = FakeContext()
+
+    async with pool.page(context) as page:
+        ...
+    assert page.closed
+
+
+@pytest.mark.asyncio
+async def test_released_context_not_refilled():
+    class SlowContext(FakeContext):
+        async def new_page(self):
+            await asyncio.sleep(0.01)
+            return await super().new_page()
+
+    pool = PagePool(size=1)
+    context = SlowContext()
+    await pool.prewarm(context)
+
+    async with pool.page(context):
+        ...  # starts a refill
+    await pool.release(context)
+    await asyncio.sleep(0.05)
+
+    assert len(context.opened) == 1
+    assert all(page.closed for page in context.opened)
+    assert pool.stats().idle == 0
+
+
+@pytest.mark.asyncio
+async def test_closed_context_forgotten():
+    pool = PagePool(size=1)
+    context = FakeContext()
+
+    await pool.prewarm(context)
+    for handler in context.handlers:
+        handler(context)
+    assert pool.stats().idle == 0
+
+
+@pytest.mark.asyncio
+async def test_listen_needs_leased_page():
+    pool = PagePool(size=1)
+    context = FakeContext()
+
+    async with pool.page(context) as page:
+        ...
+    with pytest.raises(ValueError):
+        pool.listen(page, "response", lambda _: None)
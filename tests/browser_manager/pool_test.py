@@ -0,0 +1,151 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from octoscrape.browser_manager import BrowserPool, HealthLimits
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "disconnected"
+        self.handlers.append(handler)
+
+    def is_connected(self):
+        return self.connected
+
+    def crash(self):
+        self.connected = False
+        for handler in self.handlers:
+            handler(self)
+
+
+@pytest.fixture(scope="function")
+def launched():
+    return []
+
+
+@pytest.fixture(scope="function")
+def launcher(launched):
+    @asynccontextmanager
+    async def launch():
+        browser = FakeBrowser()
+        launched.append(browser)
+        try:
+            yield browser
+        finally:
+            browser.closed = True
+
+    return launch
+
+
+@pytest.mark.asyncio
+async def test_pool_lifecycle(launcher, launched):
+    pool = BrowserPool(launcher, size=3)
+    assert not pool.initialized
+
+    async with pool.create_browser():
+        assert pool.initialized
+        assert len(launched) == 3
+        assert pool.browser in launched
+
+        with pytest.raises(RuntimeError, match="The browser already exists"):
+            async with pool.create_browser():
+                ...
+
+    assert not pool.initialized
+    assert all(b.closed for b in launched)
+    with pytest.raises(RuntimeError, match="browser has not been created yet"):
+        pool.browser
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_lease(launcher, launched):
+    pool = BrowserPool(launcher, size=2)
+
+    async with pool.create_browser():
+        async with pool.lease() as first:
+            async with pool.lease() as second:
+                assert first is not second
+                assert pool.loads == [1, 1]
+        assert pool.loads == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_context_cap_waits(launcher):
+    pool = BrowserPool(launcher, size=1, max_contexts=1)
+
+    async with pool.create_browser():
+        release = asyncio.Event()
+
+        async def hold():
+            async with pool.lease():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        lease = pool.lease()
+        waiting = asyncio.create_task(lease.__aenter__())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        release.set()
+        await holder
+        await asyncio.wait_for(waiting, 1)
+        assert pool.loads == [1]
+        await lease.__aexit__(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_crashed_browser_is_replaced(launcher, launched):
+    pool = BrowserPool(launcher, size=2)
+
+    async with pool.create_browser():
+        crashed = launched[0]
+        crashed.crash()
+
+        async with pool.lease() as browser:
+            assert browser is not crashed
+
+        await asyncio.sleep(0.01)
+        assert len(launched) == 3
+        assert crashed.closed
+        assert crashed not in [pool.browser for _ in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_supervised_browsers_recycled(launcher, launched):
+    limits = HealthLimits(max_uptime=0.05, interval=0.01, drain_timeout=1.0)
+    pool = BrowserPool(launcher, size=1, limits=limits)
+
+    async with pool.create_browser():
+        async with pool.lease() as first:
+            await asyncio.sleep(0.1)
+            assert pool.browser is not first
+            assert not first.closed  # kept for the lease
+
+        await asyncio.sleep(0.2)
+        assert first.closed
+
+        current = pool.browser
+        current.crash()
+        async with pool.lease() as browser:
+            assert browser is not current
+        await asyncio.sleep(0.01)
+        assert current.closed
+
+    assert all(b.closed for b in launched)
+
+
+def test_pool_validation(launcher):
+    with pytest.raises(ValueError):
+        BrowserPool(launcher, size=0)
+    with pytest.raises(ValueError):
+        BrowserPool(launcher, size=1, max_contexts=0)
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import sys
+
+import pytest
+
+from octoscrape import config
+from octoscrape.browser_manager import BrowserServer
+from octoscrape.browser_manager import server as server_module
+from octoscrape.config import CommonConfig
+
+ENDPOINT = "ws://127.0.0.1:4444/abc"
+
+# prints its endpoint in color codes, as the Camoufox server does
+COMMAND = [
+    sys.executable,
+    "-c",
+    f"import time; print('Endpoint: \\x1b[93m{ENDPOINT}\\x1b[0m', flush=True); "
+    "time.sleep(60)",
+]
+
+pytestmark = pytest.mark.skipif(
+    server_module.fcntl is None, reason="needs POSIX file locks"
+)
+
+
+def registry(tmp_path):
+    return json.loads((tmp_path / "test.json").read_text())
+
+
+@pytest.mark.asyncio
+async def test_server_shared_and_stopped_by_last_client(tmp_path):
+    server = BrowserServer("test", COMMAND, tmp_path)
+    other = BrowserServer("test", COMMAND, tmp_path)
+
+    assert await server.acquire() == ENDPOINT
+    pid = registry(tmp_path)["pid"]
+    assert await other.acquire() == ENDPOINT
+    assert registry(tmp_path)["pid"] == pid
+    assert server.clients() == 2
+
+    await server.release()
+    assert server_module._alive(pid)
+
+    await other.release()
+    assert not server_module._alive(pid)
+    assert server.clients() == 0
+
+
+@pytest.mark.asyncio
+async def test_dead_server_relaunched(tmp_path):
+    server = BrowserServer("test", COMMAND, tmp_path)
+
+    async with server.endpoint():
+        pid = registry(tmp_path)["pid"]
+        await server_module._terminate(pid)
+
+        async with server.endpoint():
+            assert registry(tmp_path)["pid"] != pid
+
+
+@pytest.mark.asyncio
+async def test_dead_clients_dropped(tmp_path):
+    server = BrowserServer("test", COMMAND, tmp_path)
+    await server.acquire()
+    state = registry(tmp_path)
+    # a client that exited without releasing
+    state["clients"].append(2**22 + 1)
+    (tmp_path / "test.json").write_text(json.dumps(state))
+
+    assert server.clients() == 1
+    await server.release()
+    assert not server_module._alive(state["pid"])
+
+
+@pytest.mark.asyncio
+async def test_failed_start_reported(tmp_path):
+    server = BrowserServer("test", [sys.executable, "-c", "exit(3)"], tmp_path)
+
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        await server.acquire()
+
+
+@pytest.mark.asyncio
+async def test_start_timeout(tmp_path):
+    command = [sys.executable, "-c", "import time; time.sleep(60)"]
+    server = BrowserServer("test", command, tmp_path, start_timeout=0.1)
+
+    with pytest.raises(TimeoutError):
+        await server.acquire()
+    assert server.clients() == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clients_launch_once(tmp_path):
+    launches = tmp_path / "launches"
+    command = COMMAND[:2] + [f"open({str(launches)!r}, 'a').write('x'); {COMMAND[2]}"]
+    servers = [BrowserServer("test", command, tmp_path) for _ in range(4)]
+
+    await asyncio.gather(*(server.acquire() for server in servers))
+    assert launches.read_text() == "x"
+    assert servers[0].clients() == 4
+    pid = registry(tmp_path)["pid"]
+
+    for server in servers:
+        await server.release()
+    assert not server_module._alive(pid)
+
+
+def test_shared_server_per_launch_options(tmp_path, monkeypatch):
+    def server(settings):
+        common = CommonConfig({"browser_server_dir": str(tmp_path), **settings})
+        monkeypatch.setattr(config, "common_config", common, raising=False)
+        return server_module.shared_server("chromium")
+
+    plain = server({})
+    assert server({}) is plain
+    assert server({"headless": not config.common_config.headless}) is not plain
+    extended = server({"browser_engines": {"chromium": {"args": ["--lean"]}}})
+    assert extended is not plain
+    assert extended.name != plain.name
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from octoscrape.browser_manager import StorageStateStore, storage_state_for
+from octoscrape.browser_manager import storage_state as storage_state_module
+from octoscrape.browser_manager.storage_state import close_storage_states
+from octoscrape.config import ScraperConfig
+
+PROXY = {"server": "http://a:1", "username": "user"}
+STATE = {"cookies": [{"name": "session", "expires": -1}], "origins": []}
+
+
+class FakeContext:
+    def __init__(self, state=None):
+        self.state = state or {"cookies": [], "origins": []}
+        self.handlers = []
+        self.closed = False
+        self.captures = 0
+
+    def once(self, event, handler):
+        assert event == "close"
+        self.handlers.append(handler)
+
+    async def storage_state(self):
+        self.captures += 1
+        if self.closed:
+            raise RuntimeError("Target closed")
+        return self.state
+
+    def close(self):
+        self.closed = True
+        for handler in self.handlers:
+            handler(self)
+
+
+@pytest.mark.asyncio
+async def test_saved_state_reloaded(tmp_path):
+    await StorageStateStore(tmp_path).save(STATE, PROXY)
+
+    store = StorageStateStore(tmp_path)
+    assert await store.get(PROXY) == STATE
+    assert await store.get() is None
+    assert await store.get({"server": "http://a:1", "username": "other"}) is None
+
+
+@pytest.mark.asyncio
+async def test_old_state_dropped(tmp_path):
+    store = StorageStateStore(tmp_path, max_age=0.0)
+    await store.save(STATE)
+
+    assert await store.get() is None
+
+
+@pytest.mark.asyncio
+async def test_expired_cookies_filtered(tmp_path):
+    store = StorageStateStore(tmp_path)
+    cookies = [
+        {"name": "expired", "expires": time.time() - 1},
+        {"name": "valid", "expires": time.time() + 3600},
+    ]
+    await store.save({"cookies": cookies, "origins": []})
+
+    assert [c["name"] for c in (await store.get())["cookies"]] == ["valid"]
+
+    await store.save({"cookies": cookies[:1], "origins": []})
+    assert await store.get() is None
+
+
+@pytest.mark.asyncio
+async def test_empty_state_not_saved(tmp_path):
+    store = StorageStateStore(tmp_path)
+    await store.save(STATE)
+    await store.save({"cookies": [], "origins": []})
+
+    assert await store.get() == STATE
+
+
+@pytest.mark.asyncio
+async def test_unreadable_file_ignored(tmp_path):
+    store = StorageStateStore(tmp_path)
+    await store.save(STATE)
+    for path in tmp_path.iterdir():
+        path.write_text("not json")
+
+    assert await StorageStateStore(tmp_path).get() is None
+
+
+@pytest.mark.asyncio
+async def test_capture_rate_limited(tmp_path):
+    store = StorageStateStore(tmp_path, refresh_interval=3600.0)
+    context = FakeContext(STATE)
+
+    assert await store.capture(context, PROXY)
+    context.state = {"cookies": [{"name": "renewed"}], "origins": []}
+    assert not await store.capture(context, PROXY)
+    assert await store.get(PROXY) == STATE
+
+    assert await store.capture(context, PROXY, force=True)
+    assert await store.get(PROXY) == context.state
+
+
+@pytest.mark.asyncio
+async def test_tracked_context_refreshed(tmp_path):
+    store = StorageStateStore(tmp_path, refresh_interval=0.01)
+    context = FakeContext(STATE)
+
+    store.track(context)
+    await asyncio.sleep(0.05)
+    assert await store.get() == STATE
+
+    context.close()
+    context.state = {"cookies": [{"name": "after close"}], "origins": []}
+    await asyncio.sleep(0.05)
+    assert await store.get() == STATE
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_close_captures_tracked(tmp_path):
+    store = StorageStateStore(tmp_path, refresh_interval=3600.0)
+    context = FakeContext()
+
+    store.track(context, PROXY)
+    context.state = STATE
+    await store.close()
+
+    stored = [json.loads(path.read_text()) for path in tmp_path.iterdir()]
+    assert [s["state"] for s in stored] == [STATE]
+
+
+def test_refresher_restarted_on_new_loop(tmp_path):
+    store = StorageStateStore(tmp_path, refresh_interval=0.01)
+    first, second = FakeContext(STATE), FakeContext(STATE)
+
+    async def track(context):
+        store.track(context)
+        await asyncio.sleep(0.05)
+
+    # a runner loop is stopped and closed without cancelling its tasks
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(track(first))
+    loop.close()
+    assert first.captures > 0
+
+    asyncio.run(track(second))
+    assert second.captures > 0
+
+
+def test_store_for_config():
+    config = ScraperConfig({"storage_state": {"max_age": 60.0}}, key="shop")
+
+    store = storage_state_for(config)
+    assert store is storage_state_for(config)
+    assert store.path.name == "shop"
+    assert storage_state_for(ScraperConfig({})) is None
+
+
+@pytest.mark.asyncio
+async def test_shared_stores_closed(tmp_path, monkeypatch):
+    config = ScraperConfig({"storage_state": {"refresh_interval": 3600.0}})
+    store = StorageStateStore(tmp_path, refresh_interval=3600.0)
+    monkeypatch.setattr(storage_state_module, "_stores", {id(config): (config, store)})
+    context = FakeContext()
+
+    store.track(context, PROXY)
+    context.state = STATE
+    await close_storage_states()
+    assert await StorageStateStore(tmp_path).get(PROXY) == STATE
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from octoscrape.concurrency import AdaptiveConcurrency, AsyncPool
+
+
+def make_controller(**kwargs) -> AdaptiveConcurrency:
+    controller = AdaptiveConcurrency(**kwargs)
+    controller.bind(16)
+    return controller
+
+
+def feed(controller: AdaptiveConcurrency, count: int, latency=0.1, failed=False):
+    for _ in range(count):
+        controller.record(latency, failed)
+
+
+def test_additive_increase():
+    controller = make_controller(min_concurrency=2, window=10)
+    assert controller.limit == 2
+
+    feed(controller, 30)
+    assert controller.limit == 5
+
+
+def test_multiplicative_decrease_on_errors():
+    controller = make_controller(initial=8, window=10, max_error_rate=0.1)
+
+    feed(controller, 8)
+    feed(controller, 2, failed=True)
+    assert controller.limit == 4
+
+
+def test_decrease_on_latency():
+    controller = make_controller(initial=8, window=10, target_latency=1.0)
+
+    feed(controller, 10, latency=2.0)
+    assert controller.limit == 4
+
+
+def test_decrease_on_pressure():
+    pressure = 0.5
+    controller = make_controller(initial=8, window=10, pressure=lambda: pressure)
+
+    feed(controller, 10)
+    assert controller.limit == 9
+
+    pressure = 1.2
+    feed(controller, 10)
+    assert controller.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_pressure_polled_on_acquire():
+    controller = make_controller(
+        initial=8, window=100, pressure=lambda: 1.2, pressure_interval=60.0
+    )
+
+    await controller.acquire()
+    assert controller.limit == 4
+
+    await controller.acquire()  # polled at most once per interval
+    assert controller.limit == 4
+
+
+def test_bounds():
+    controller = make_controller(min_concurrency=3, window=1)
+    feed(controller, 100)
+    assert controller.limit == 16
+
+    feed(controller, 100, failed=True)
+    assert controller.limit == 3
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(min_concurrency=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(decrease=1.0)
+
+
+@pytest.mark.asyncio
+async def test_pool_respects_adaptive_limit():
+    controller = AdaptiveConcurrency(min_concurrency=2, window=5)
+    async with AsyncPool(concurrency=8, adaptive=controller) as pool:
+        assert pool.concurrency == 2
+
+        running = 0
+        peaks = []
+
+        async def task():
+            nonlocal running
+            running += 1
+            peaks.append((running, pool.concurrency))
+            await asyncio.sleep(0.005)
+            running -= 1
+
+        for _ in range(60):
+            await pool.submit(task())
+
+    assert all(active <= limit for active, limit in peaks)
+    # steady successes raise the limit up to the pool size
+    assert pool.concurrency == 8
+
+
+@pytest.mark.asyncio
+async def test_pool_shrinks_on_failures():
+    controller = AdaptiveConcurrency(initial=8, window=4)
+    async with AsyncPool(concurrency=8, adaptive=controller) as pool:
+
+        async def failing_task():
+            raise ValueError("Test error")
+
+        for _ in range(8):
+            await pool.submit(failing_task())
+
+    assert pool.concurrency == 2
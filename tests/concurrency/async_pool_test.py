@@ -2,7 +2,7 @@ import asyncio
 
 import pytest
 
-from octoscrape.concurrency import AsyncPool
+from octoscrape.concurrency import AsyncPool, DeadlineExceeded
 
 
 @pytest.mark.asyncio
@@ -358,3 +358,298 @@ async def test_context_lifecycle():
     # state after stop
     assert (0, 0, 0, True) == get_state(pool)
     assert sorted(results) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_workers_survive_cancel_all():
+    async with AsyncPool(concurrency=2) as pool:
+        results = []
+
+        async def task(value):
+            await asyncio.sleep(0.5)
+            results.append(value)
+
+        await pool.submit(task(1))
+        await pool.submit(task(2))
+        await asyncio.sleep(0.01)
+        await pool.cancel_all()
+
+        async def quick_task(value):
+            results.append(value)
+
+        await pool.submit(quick_task(3))
+        await pool.submit(quick_task(4))
+        await asyncio.wait_for(pool.drain(), timeout=1.0)
+
+        # state after cancellation: workers are still alive
+        assert len(pool._workers) == 2
+        assert all(not w.done() for w in pool._workers)
+
+    assert sorted(results) == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    async with AsyncPool(concurrency=1) as pool:
+        order = []
+
+        async def blocker():
+            await asyncio.sleep(0.02)
+
+        async def task(value):
+            order.append(value)
+
+        # the only worker is busy, so all jobs below are ordered in the queue
+        await pool.submit(blocker())
+        await asyncio.sleep(0)
+        await pool.submit(task("bulk_1"), priority=10)
+        await pool.submit(task("bulk_2"), priority=10)
+        await pool.submit(task("urgent"), priority=0)
+        await pool.submit(task("bulk_3"), priority=10)
+
+    assert order == ["urgent", "bulk_1", "bulk_2", "bulk_3"]
+
+
+@pytest.mark.asyncio
+async def test_expired_jobs_are_dropped():
+    async with AsyncPool(concurrency=1) as pool:
+        executed = []
+
+        async def blocker():
+            await asyncio.sleep(0.05)
+
+        async def task(value):
+            executed.append(value)
+
+        await pool.submit(blocker())
+        await pool.submit(task("expired"), deadline=0.01)
+        await pool.submit(task("in_time"), deadline=1.0)
+        await pool.submit(task("no_deadline"))
+
+        await asyncio.wait_for(pool.drain(), timeout=1.0)
+
+    assert executed == ["in_time", "no_deadline"]
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_result():
+    async with AsyncPool(concurrency=2) as pool:
+
+        async def task(value):
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        handles = [await pool.submit(task(i)) for i in range(3)]
+        assert [await h for h in handles] == [0, 2, 4]
+        assert all(h.done() for h in handles)
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_exception():
+    async with AsyncPool(concurrency=2) as pool:
+
+        async def failing_task():
+            raise ValueError("Test error")
+
+        handle = await pool.submit(failing_task())
+        with pytest.raises(ValueError, match="Test error"):
+            await handle
+
+
+@pytest.mark.asyncio
+async def test_expired_job_handle():
+    async with AsyncPool(concurrency=1) as pool:
+        await pool.submit(asyncio.sleep(0.05))
+        handle = await pool.submit(asyncio.sleep(0), deadline=0.01)
+
+        with pytest.raises(DeadlineExceeded):
+            await handle
+
+
+@pytest.mark.asyncio
+async def test_handle_cancel():
+    async with AsyncPool(concurrency=1) as pool:
+        executed = []
+
+        async def task(value):
+            await asyncio.sleep(0.05)
+            executed.append(value)
+
+        running = await pool.submit(task(1))
+        queued = await pool.submit(task(2))
+        await asyncio.sleep(0.01)
+
+        assert running.cancel()
+        assert queued.cancel()
+        await asyncio.wait_for(pool.drain(), timeout=1.0)
+
+        assert running.cancelled()
+        assert queued.cancelled()
+        assert executed == []
+
+
+@pytest.mark.asyncio
+async def test_as_completed_order():
+    async with AsyncPool(concurrency=3) as pool:
+
+        async def task(delay):
+            await asyncio.sleep(delay)
+            return delay
+
+        coros = (task(d) for d in (0.05, 0.01, 0.03))
+        results = [h.result() async for h in pool.as_completed(coros)]
+
+    assert results == [0.01, 0.03, 0.05]
+
+
+@pytest.mark.asyncio
+async def test_map_bounded_prefetch():
+    created = 0
+
+    def items():
+        nonlocal created
+        for i in range(20):
+            created += 1
+            yield i
+
+    async with AsyncPool(concurrency=2) as pool:
+        peak_created = 0
+        results = []
+
+        async def task(value):
+            await asyncio.sleep(0.001)
+            return value
+
+        async for value in pool.map(task, items(), prefetch=4):
+            results.append(value)
+            peak_created = max(peak_created, created - len(results))
+
+    assert sorted(results) == list(range(20))
+    # the input is never read more than `prefetch` items ahead
+    assert peak_created <= 4
+
+
+@pytest.mark.asyncio
+async def test_map_async_iterable():
+    async def items():
+        for i in range(5):
+            yield i
+
+    async def task(value):
+        return value + 1
+
+    async with AsyncPool(concurrency=2) as pool:
+        results = [v async for v in pool.map(task, items())]
+
+    assert sorted(results) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_map_error_cancels_pending():
+    async with AsyncPool(concurrency=2) as pool:
+        completed = []
+
+        async def task(value):
+            if value == 0:
+                raise ValueError("Test error")
+            await asyncio.sleep(0.1)
+            completed.append(value)
+
+        with pytest.raises(ValueError):
+            async for _ in pool.map(task, range(4)):
+                pass
+
+        await pool.drain()
+        assert completed == []
+
+
+@pytest.mark.asyncio
+async def test_job_timeout():
+    async with AsyncPool(concurrency=1, job_timeout=0.02) as pool:
+        cancelled = []
+
+        async def hung_task():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def task():
+            return "done"
+
+        hung = await pool.submit(hung_task())
+        quick = await pool.submit(task())
+
+        with pytest.raises(TimeoutError, match="timed out"):
+            await hung
+        assert await quick == "done"
+        assert cancelled == [True]
+
+    assert pool.stats().failed == 1
+
+
+@pytest.mark.asyncio
+async def test_submit_timeout_overrides_default():
+    async with AsyncPool(concurrency=1, job_timeout=0.01) as pool:
+        handle = await pool.submit(asyncio.sleep(0.05, "slow"), timeout=1.0)
+        assert await handle == "slow"
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout_abandons_stragglers():
+    pool = AsyncPool(concurrency=1)
+    await pool.start()
+
+    async def task(value):
+        await asyncio.sleep(value)
+
+    done = await pool.submit(task(0.01))
+    hung = await pool.submit(task(10))
+    queued = await pool.submit(task(0.01))
+
+    abandoned = await asyncio.wait_for(pool.drain(timeout=0.1), timeout=1.0)
+
+    assert await done is None
+    assert sorted(h.name for h in abandoned) == [hung.name, queued.name]
+    assert hung.cancelled() and queued.cancelled()
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_grace():
+    pool = AsyncPool(concurrency=2)
+    await pool.start()
+
+    completed = []
+
+    async def task(value, delay):
+        await asyncio.sleep(delay)
+        completed.append(value)
+
+    await pool.submit(task("quick", 0.01))
+    slow = await pool.submit(task("slow", 10))
+
+    abandoned = await asyncio.wait_for(pool.stop(grace=0.1), timeout=1.0)
+
+    assert completed == ["quick"]
+    assert [h.name for h in abandoned] == [slow.name]
+    assert pool.is_stopped
+
+
+@pytest.mark.asyncio
+async def test_stop_grace_rejects_submissions():
+    pool = AsyncPool(concurrency=1)
+    await pool.start()
+    await pool.submit(asyncio.sleep(0.05))
+
+    stopping = asyncio.create_task(pool.stop(grace=1.0))
+    await asyncio.sleep(0.01)
+
+    coro = asyncio.sleep(0)
+    with pytest.raises(RuntimeError, match="Pool stopped"):
+        await pool.submit(coro)
+    coro.close()
+
+    assert await stopping == []
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from octoscrape.concurrency import AsyncPool, KeyLimit, TokenBucket
+
+
+def test_token_bucket_burst_and_refill():
+    bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+
+    assert bucket.try_acquire(0.0)
+    assert bucket.try_acquire(0.0)
+    assert not bucket.try_acquire(0.0)
+    assert bucket.delay(0.0) == pytest.approx(0.5)
+
+    assert bucket.try_acquire(0.5)
+    assert not bucket.try_acquire(0.5)
+
+    # refill never exceeds the burst size
+    assert bucket.available(100.0) == 2
+
+
+def test_key_limit_validation():
+    with pytest.raises(ValueError):
+        KeyLimit(max_in_flight=0)
+    with pytest.raises(ValueError):
+        KeyLimit(rate=0)
+
+    assert KeyLimit(rate=3.5).burst == 4
+    assert KeyLimit().burst == 1
+
+
+@pytest.mark.asyncio
+async def test_key_max_in_flight():
+    limits = {"host_a": KeyLimit(max_in_flight=1)}
+    async with AsyncPool(concurrency=4, key_limits=limits) as pool:
+        running = {"host_a": 0, "host_b": 0}
+        peak = {"host_a": 0, "host_b": 0}
+
+        async def task(key):
+            running[key] += 1
+            peak[key] = max(peak[key], running[key])
+            await asyncio.sleep(0.02)
+            running[key] -= 1
+
+        for _ in range(4):
+            await pool.submit(task("host_a"), key="host_a")
+            await pool.submit(task("host_b"), key="host_b")
+
+    assert peak["host_a"] == 1
+    # an unlimited key uses the slots that host_a cannot
+    assert peak["host_b"] == 3
+
+
+@pytest.mark.asyncio
+async def test_blocked_key_does_not_hold_worker():
+    limits = {"slow": KeyLimit(max_in_flight=1)}
+    async with AsyncPool(concurrency=2, key_limits=limits) as pool:
+        finished = []
+
+        async def task(value, delay):
+            await asyncio.sleep(delay)
+            finished.append(value)
+
+        await pool.submit(task("slow_1", 0.2), key="slow")
+        await pool.submit(task("slow_2", 0.2), key="slow")
+        for i in range(3):
+            await pool.submit(task(f"fast_{i}", 0.01), key="fast")
+
+        await asyncio.sleep(0.1)
+
+        # fast jobs were not stuck behind the parked slow_2
+        assert finished == ["fast_0", "fast_1", "fast_2"]
+
+    assert finished[-2:] == ["slow_1", "slow_2"]
+
+
+@pytest.mark.asyncio
+async def test_key_rate_limit():
+    limit = KeyLimit(rate=20, burst=1)
+    async with AsyncPool(concurrency=5, default_key_limit=limit) as pool:
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def task():
+            starts.append(loop.time())
+
+        for _ in range(5):
+            await pool.submit(task(), key="host")
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 5
+    assert min(gaps) >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_clears_parked_jobs():
+    pool = AsyncPool(concurrency=2, key_limits={"host": KeyLimit(max_in_flight=1)})
+    await pool.start()
+
+    executed = []
+
+    async def task(value):
+        await asyncio.sleep(0.05)
+        executed.append(value)
+
+    for i in range(5):
+        await pool.submit(task(i), key="host")
+
+    await asyncio.sleep(0.01)
+    await pool.cancel_all()
+
+    # parked jobs no longer block drain
+    await asyncio.wait_for(pool.drain(), timeout=1.0)
+    assert executed == []
+
+    await pool.stop()
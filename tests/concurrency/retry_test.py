@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+from octoscrape.concurrency import (
+    AsyncPool,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+from octoscrape.concurrency.retry import Circuit
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+    assert [policy.delay(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    jittered = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    assert all(0 <= jittered.delay(3) <= 4.0 for _ in range(100))
+
+
+def test_retry_policy_should_retry():
+    policy = RetryPolicy(max_attempts=2, retry_on=(TimeoutError,))
+    assert policy.should_retry(1, TimeoutError())
+    assert not policy.should_retry(2, TimeoutError())
+    assert not policy.should_retry(1, ValueError())
+
+
+def test_circuit_states():
+    circuit = Circuit(CircuitBreaker(failure_threshold=2, reset_timeout=10))
+
+    circuit.record_failure(0)
+    assert circuit.state(0) == Circuit.CLOSED
+    circuit.record_failure(1)
+    assert circuit.state(1) == Circuit.OPEN
+    assert not circuit.allow(5)
+    assert circuit.retry_after(5) == 6
+
+    # half-open: a single trial job goes through
+    assert circuit.allow(11)
+    assert not circuit.allow(11)
+
+    # a failed trial opens the circuit again
+    circuit.record_failure(12)
+    assert circuit.state(12) == Circuit.OPEN
+
+    assert circuit.allow(22)
+    circuit.record_success()
+    assert circuit.state(22) == Circuit.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retry_until_success():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+    async with AsyncPool(concurrency=1, retry=policy) as pool:
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise ConnectionError("Navigation failed")
+            return "page"
+
+        handle = await pool.submit(flaky)
+        assert await handle == "page"
+        assert handle.attempts == 3
+
+    stats = pool.stats()
+    assert (stats.completed, stats.retried, stats.failed) == (1, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_retry_exhausted():
+    async with AsyncPool(concurrency=1) as pool:
+
+        async def failing():
+            raise ConnectionError("Navigation failed")
+
+        handle = await pool.submit(failing, retry=RetryPolicy(2, base_delay=0.01))
+        with pytest.raises(ConnectionError):
+            await handle
+        assert handle.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_coroutine_cannot_be_retried():
+    async with AsyncPool(concurrency=1) as pool:
+        coro = asyncio.sleep(0)
+        with pytest.raises(ValueError, match="cannot be retried"):
+            await pool.submit(coro, retry=RetryPolicy())
+        coro.close()
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_hold_slot():
+    policy = RetryPolicy(max_attempts=2, base_delay=0.2, jitter=False)
+    async with AsyncPool(concurrency=1, retry=policy) as pool:
+        finished = []
+
+        async def failing():
+            raise ConnectionError("Navigation failed")
+
+        async def task(value):
+            finished.append(value)
+
+        await pool.submit(failing)
+        await asyncio.sleep(0.01)
+        await pool.submit(task(1))
+        await asyncio.sleep(0.01)
+
+        # the only slot is free while `failing` waits for its retry
+        assert finished == [1]
+        assert pool.stats().queued == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_clears_backoff():
+    policy = RetryPolicy(max_attempts=5, base_delay=10, jitter=False)
+    async with AsyncPool(concurrency=1, retry=policy) as pool:
+
+        async def failing():
+            raise ConnectionError("Navigation failed")
+
+        handle = await pool.submit(failing)
+        await asyncio.sleep(0.01)
+        await pool.cancel_all()
+
+        await asyncio.wait_for(pool.drain(), timeout=1.0)
+        assert handle.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    async with AsyncPool(concurrency=1, circuit_breaker=breaker) as pool:
+        calls = []
+
+        async def failing(value):
+            calls.append(value)
+            raise ConnectionError("Host down")
+
+        async def task(value):
+            calls.append(value)
+
+        handles = [await pool.submit(failing(i), key="bad") for i in range(4)]
+        other = await pool.submit(task("other"), key="good")
+        await pool.drain()
+
+        # only the first two jobs reached the failing host
+        assert calls == [0, 1, "other"]
+        for handle in handles[2:]:
+            with pytest.raises(CircuitOpenError):
+                await handle
+        assert await other is None
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_delays_retries():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    async with AsyncPool(1, retry=policy, circuit_breaker=breaker) as pool:
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def flaky():
+            starts.append(loop.time())
+            if len(starts) == 1:
+                raise ConnectionError("Host down")
+            return "page"
+
+        handle = await pool.submit(flaky, key="host")
+        assert await handle == "page"
+
+    # the retry waited for the circuit to half-open
+    assert starts[1] - starts[0] >= 0.1
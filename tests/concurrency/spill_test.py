@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from octoscrape.concurrency import AsyncPool, JobSpec, SqliteJobSpill
+
+
+def test_sqlite_spill_order_and_persistence(tmp_path):
+    path = tmp_path / "spill.sqlite"
+    spill = SqliteJobSpill(path)
+    spill.push(5, {"n": 1})
+    spill.push(0, {"n": 2})
+    spill.push(5, {"n": 3})
+
+    assert len(spill) == 3
+    assert spill.pop(2) == [{"n": 2}, {"n": 1}]
+    spill.close()
+
+    # records survive a restart
+    spill = SqliteJobSpill(path)
+    assert len(spill) == 1
+    assert spill.pop(10) == [{"n": 3}]
+    assert spill.pop(10) == []
+    assert len(spill) == 0
+
+
+def test_spill_requires_bounded_queue():
+    with pytest.raises(ValueError):
+        AsyncPool(2, spill=SqliteJobSpill(":memory:"))
+    with pytest.raises(ValueError):
+        AsyncPool(2, max_queued=0)
+
+
+@pytest.mark.asyncio
+async def test_submit_backpressure():
+    pool = AsyncPool(concurrency=1, max_queued=2)
+    await pool.start()
+
+    release = asyncio.Event()
+
+    async def task():
+        await release.wait()
+
+    for _ in range(3):  # one running, two queued
+        await pool.submit(task())
+    await asyncio.sleep(0.01)
+
+    blocked = asyncio.create_task(pool.submit(task()))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert pool._queue.qsize() == 2
+
+    release.set()
+    handle = await asyncio.wait_for(blocked, 1)
+    await handle
+    await pool.drain()
+    await pool.stop()
+
+    assert pool.stats().completed == 4
+
+
+@pytest.mark.asyncio
+async def test_enqueue_spills_and_reloads():
+    results = []
+
+    async def work(n):
+        await asyncio.sleep(0.001)
+        results.append(n)
+
+    spill = SqliteJobSpill(":memory:")
+    pool = AsyncPool(concurrency=2, max_queued=3, spill=spill)
+    pool.register_job("work", work)
+    await pool.start()
+
+    for n in range(50):
+        await pool.enqueue(JobSpec("work", n))
+    assert len(spill) > 0
+    assert pool._queue.qsize() <= 3
+
+    await pool.drain()
+    await pool.stop()
+
+    assert sorted(results) == list(range(50))
+    assert len(spill) == 0
+    assert pool.stats().completed == 50
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unregistered_job():
+    pool = AsyncPool(concurrency=1, max_queued=1, spill=SqliteJobSpill(":memory:"))
+    await pool.start()
+
+    with pytest.raises(ValueError):
+        await pool.enqueue(JobSpec("missing"))
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_clears_spill():
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    spill = SqliteJobSpill(":memory:")
+    pool = AsyncPool(concurrency=1, max_queued=1, spill=spill)
+    pool.register_job("work", work)
+    await pool.start()
+
+    for _ in range(5):
+        await pool.enqueue(JobSpec("work"))
+    await asyncio.sleep(0.01)
+
+    await pool.cancel_all()
+    await pool.stop()
+
+    assert len(spill) == 0
+    assert pool.stats().cancelled == 5
+
+
+@pytest.mark.asyncio
+async def test_stop_keeps_spill(tmp_path):
+    release = asyncio.Event()
+    results = []
+
+    async def work(n):
+        await release.wait()
+        results.append(n)
+
+    path = tmp_path / "spill.sqlite"
+    spill = SqliteJobSpill(path)
+    pool = AsyncPool(concurrency=1, max_queued=1, spill=spill)
+    pool.register_job("work", work)
+    await pool.start()
+
+    for n in range(5):
+        await pool.enqueue(JobSpec("work", n))
+    await asyncio.sleep(0.01)
+    spilled = len(spill)
+    assert spilled == 3
+
+    await pool.stop(grace=0.05)
+    assert len(spill) == spilled
+    spill.close()
+
+    spill = SqliteJobSpill(path)
+    assert len(spill) == spilled
+    release.set()
+    pool = AsyncPool(concurrency=1, max_queued=1, spill=spill)
+    pool.register_job("work", work)
+    await pool.start()
+    await pool.drain()
+    await pool.stop()
+
+    assert sorted(results) == [2, 3, 4]
+    assert len(spill) == 0
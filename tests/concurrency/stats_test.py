@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from octoscrape.concurrency import AsyncPool, KeyLimit
+from octoscrape.concurrency.stats import Histogram
+
+
+def test_empty_histogram():
+    snapshot = Histogram().snapshot()
+    assert (snapshot.count, snapshot.mean, snapshot.p99) == (0, 0.0, 0.0)
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for _ in range(90):
+        histogram.record(0.01)
+    for _ in range(10):
+        histogram.record(1.0)
+
+    snapshot = histogram.snapshot()
+    assert snapshot.count == 100
+    assert snapshot.max == 1.0
+    assert snapshot.mean == pytest.approx(0.109)
+    # percentiles are bucket upper bounds, accurate to one bucket
+    assert 0.01 <= snapshot.p50 < 0.01 * 1.5
+    # clamped to the largest recorded value
+    assert snapshot.p99 == 1.0
+
+
+def test_histogram_overflow():
+    histogram = Histogram()
+    histogram.record(10**9)
+    assert histogram.percentile(50) == 10**9
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_counters():
+    async with AsyncPool(concurrency=1) as pool:
+
+        async def task(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        async def failing_task():
+            raise ValueError("Test error")
+
+        await pool.submit(task(1))
+        await pool.submit(failing_task())
+        await pool.submit(task(2), deadline=0.001)
+        cancelled = await pool.submit(task(3))
+        cancelled.cancel()
+
+        await asyncio.sleep(0)
+        stats = pool.stats()
+        assert stats.in_flight == 1
+        assert stats.queued == 3
+
+    stats = pool.stats()
+    assert stats.submitted == 4
+    assert stats.started == 2
+    assert stats.completed == 1
+    assert stats.failed == 1
+    assert stats.expired == 1
+    assert stats.cancelled == 1
+    assert (stats.queued, stats.in_flight) == (0, 0)
+    assert stats.run_time.count == 2
+    assert stats.queue_wait.count == 2
+    assert stats.run_time.max >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_stats_count_parked_jobs():
+    pool = AsyncPool(concurrency=2, key_limits={"host": KeyLimit(max_in_flight=1)})
+    async with pool:
+        for _ in range(3):
+            await pool.submit(asyncio.sleep(0.02), key="host")
+        await asyncio.sleep(0.005)
+
+        stats = pool.stats()
+        assert stats.in_flight == 1
+        assert stats.queued == 2
+
+
+@pytest.mark.asyncio
+async def test_on_job_done_hook():
+    events = []
+
+    def hook(event):
+        events.append(event)
+        raise RuntimeError("hook errors must not break the pool")
+
+    async with AsyncPool(concurrency=2, on_job_done=hook) as pool:
+
+        async def task():
+            await asyncio.sleep(0.01)
+
+        await pool.submit(task(), key="host")
+
+    assert len(events) == 1
+    event = events[0]
+    assert (event.name, event.key, event.outcome) == (
+        "test_on_job_done_hook.<locals>.task",
+        "host",
+        "completed",
+    )
+    assert event.run_time >= 0.01
+    assert event.queue_wait >= 0
@@ -14,6 +14,90 @@ def test_default_pool_size(default_common_config):
     assert default_common_config.pool_size == 1
 
 
+def test_default_processes(default_common_config):
+    assert default_common_config.processes == 1
+
+
+def test_default_stop_timeout(default_common_config):
+    assert default_common_config.stop_timeout == 30.0
+
+
+def test_default_cache_dir(default_common_config):
+    assert str(default_common_config.cache_dir) == ".cache/responses"
+
+
+def test_default_cache_max_size(default_common_config):
+    assert default_common_config.cache_max_size == 512
+
+
+def test_default_fingerprints_path(default_common_config):
+    assert str(default_common_config.fingerprints_path) == ".cache/fingerprints.json"
+
+
+def test_default_fingerprints_size(default_common_config):
+    assert default_common_config.fingerprints_size == 0
+
+
+def test_default_fingerprints_max_uses(default_common_config):
+    assert default_common_config.fingerprints_max_uses == 20
+
+
+def test_default_fingerprints_max_age(default_common_config):
+    assert default_common_config.fingerprints_max_age == 86400.0
+
+
+def test_default_storage_state_dir(default_common_config):
+    assert str(default_common_config.storage_state_dir) == ".cache/storage_states"
+
+
+def test_default_browser_idle_timeout(default_common_config):
+    assert default_common_config.browser_idle_timeout is None
+
+
+def test_default_browsers_per_engine(default_common_config):
+    assert default_common_config.browsers_per_engine == 1
+
+
+def test_default_browser_max_contexts(default_common_config):
+    assert default_common_config.browser_max_contexts is None
+
+
+def test_default_browser_engines(default_common_config):
+    assert default_common_config.browser_engines == {}
+
+
+def test_default_browser_server(default_common_config):
+    assert default_common_config.browser_server is False
+
+
+def test_default_browser_server_dir(default_common_config):
+    assert str(default_common_config.browser_server_dir) == ".cache/browser_servers"
+
+
+def test_default_browser_endpoint(default_common_config):
+    assert default_common_config.browser_endpoint is None
+
+
+def test_default_browser_max_pages(default_common_config):
+    assert default_common_config.browser_max_pages is None
+
+
+def test_default_browser_max_uptime(default_common_config):
+    assert default_common_config.browser_max_uptime is None
+
+
+def test_default_browser_max_rss(default_common_config):
+    assert default_common_config.browser_max_rss is None
+
+
+def test_default_health_check_interval(default_common_config):
+    assert default_common_config.health_check_interval == 10.0
+
+
+def test_default_browser_drain_timeout(default_common_config):
+    assert default_common_config.browser_drain_timeout == 120.0
+
+
 def test_default_headless(default_common_config):
     assert default_common_config.headless == False
 
@@ -34,5 +118,113 @@ def test_pool_size(common_config, common_config_dict):
     assert common_config.pool_size == common_config_dict["pool_size"]
 
 
+def test_processes(common_config, common_config_dict):
+    assert common_config.processes == common_config_dict["processes"]
+
+
+def test_stop_timeout(common_config, common_config_dict):
+    assert common_config.stop_timeout == common_config_dict["stop_timeout"]
+
+
+def test_cache_dir(common_config, common_config_dict):
+    assert str(common_config.cache_dir) == common_config_dict["cache_dir"]
+
+
+def test_cache_max_size(common_config, common_config_dict):
+    assert common_config.cache_max_size == common_config_dict["cache_max_size"]
+
+
+def test_fingerprints_path(common_config, common_config_dict):
+    assert (
+        str(common_config.fingerprints_path) == common_config_dict["fingerprints_path"]
+    )
+
+
+def test_fingerprints_size(common_config, common_config_dict):
+    assert common_config.fingerprints_size == common_config_dict["fingerprints_size"]
+
+
+def test_fingerprints_max_uses(common_config, common_config_dict):
+    assert (
+        common_config.fingerprints_max_uses
+        == common_config_dict["fingerprints_max_uses"]
+    )
+
+
+def test_fingerprints_max_age(common_config, common_config_dict):
+    assert (
+        common_config.fingerprints_max_age == common_config_dict["fingerprints_max_age"]
+    )
+
+
+def test_storage_state_dir(common_config, common_config_dict):
+    assert (
+        str(common_config.storage_state_dir) == common_config_dict["storage_state_dir"]
+    )
+
+
+def test_browser_max_pages(common_config, common_config_dict):
+    assert common_config.browser_max_pages == common_config_dict["browser_max_pages"]
+
+
+def test_browser_max_uptime(common_config, common_config_dict):
+    assert common_config.browser_max_uptime == common_config_dict["browser_max_uptime"]
+
+
+def test_browser_max_rss(common_config, common_config_dict):
+    assert common_config.browser_max_rss == common_config_dict["browser_max_rss"]
+
+
+def test_health_check_interval(common_config, common_config_dict):
+    assert (
+        common_config.health_check_interval
+        == common_config_dict["health_check_interval"]
+    )
+
+
+def test_browser_drain_timeout(common_config, common_config_dict):
+    assert (
+        common_config.browser_drain_timeout
+        == common_config_dict["browser_drain_timeout"]
+    )
+
+
+def test_browser_idle_timeout(common_config, common_config_dict):
+    assert (
+        common_config.browser_idle_timeout == common_config_dict["browser_idle_timeout"]
+    )
+
+
+def test_browsers_per_engine(common_config, common_config_dict):
+    assert (
+        common_config.browsers_per_engine == common_config_dict["browsers_per_engine"]
+    )
+
+
+def test_browser_max_contexts(common_config, common_config_dict):
+    assert (
+        common_config.browser_max_contexts == common_config_dict["browser_max_contexts"]
+    )
+
+
+def test_browser_engines(common_config, common_config_dict):
+    assert common_config.browser_engines == common_config_dict["browser_engines"]
+
+
+def test_browser_server(common_config, common_config_dict):
+    assert common_config.browser_server == common_config_dict["browser_server"]
+
+
+def test_browser_server_dir(common_config, common_config_dict):
+    assert (
+        str(common_config.browser_server_dir)
+        == common_config_dict["browser_server_dir"]
+    )
+
+
+def test_browser_endpoint(common_config, common_config_dict):
+    assert common_config.browser_endpoint == common_config_dict["browser_endpoint"]
+
+
 def test_headless(common_config, common_config_dict):
     assert common_config.headless == common_config_dict["headless"]
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from octoscrape import config
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CONFIG = """
+common:
+  pool_size: 7
+scrapers:
+  Example:
+    name: example
+    url: https://example.com
+"""
+
+
+@pytest.fixture
+def unloaded(monkeypatch, tmp_path):
+    """Forget the loaded configuration; it is restored after the test."""
+
+    for name in ("raw_config", "common_config", "scrappers_configs"):
+        monkeypatch.delitem(vars(config), name, raising=False)
+    monkeypatch.delenv(config.CONFIG_ENV, raising=False)
+    path = tmp_path / "octoscrape.yaml"
+    path.write_text(CONFIG)
+    return path
+
+
+def test_config_path_default(monkeypatch):
+    monkeypatch.delenv(config.CONFIG_ENV, raising=False)
+    assert config.config_path() == Path("config.yaml")
+
+
+def test_config_loaded_on_first_access(monkeypatch, unloaded):
+    monkeypatch.setenv(config.CONFIG_ENV, str(unloaded))
+    assert "common_config" not in vars(config)
+
+    assert config.common_config.pool_size == 7
+    assert list(config.scrappers_configs) == ["Example"]
+    assert config.scrappers_configs["Example"].name == "example"
+
+
+def test_load_config_explicit_path(unloaded):
+    config.load_config(unloaded)
+
+    assert config.common_config.pool_size == 7
+    # worker processes load the same file
+    assert config.config_path() == unloaded.resolve()
+
+
+def test_load_config_missing_file(unloaded, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        config.load_config(tmp_path / "missing.yaml")
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        config.missing
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "octoscrape",
+        "octoscrape.config",
+        "octoscrape.browser_manager",
+        "octoscrape.scraper",
+    ],
+)
+def test_import_is_lazy(module, tmp_path):
+    # runs in a directory without config.yaml, so loading it would fail too
+    code = (
+        f"import sys, {module}; "
+        "heavy = ('playwright', 'camoufox', 'browserforge', 'yaml', 'httpx'); "
+        "print([m for m in heavy if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
@@ -66,6 +66,42 @@ def test_default_pool_size(default_scraper_config):
     assert default_scraper_config.pool_size == 1
 
 
+def test_default_browser(default_scraper_config):
+    assert default_scraper_config.browser == "camoufox"
+
+
+def test_default_engine(default_scraper_config):
+    assert default_scraper_config.engine == "browser"
+
+
+def test_default_max_connections_per_host(default_scraper_config):
+    assert default_scraper_config.max_connections_per_host == 6
+
+
+def test_default_block(default_scraper_config):
+    assert default_scraper_config.block == {}
+
+
+def test_default_cache(default_scraper_config):
+    assert default_scraper_config.cache is None
+
+
+def test_default_proxies(default_scraper_config):
+    assert default_scraper_config.proxies == []
+
+
+def test_default_proxies_file(default_scraper_config):
+    assert default_scraper_config.proxies_file is None
+
+
+def test_default_proxy_pool(default_scraper_config):
+    assert default_scraper_config.proxy_pool == {}
+
+
+def test_default_storage_state(default_scraper_config):
+    assert default_scraper_config.storage_state is None
+
+
 def test_default_proxy_availible(default_scraper_config):
     assert default_scraper_config.is_proxy_available == False
 
@@ -116,6 +152,45 @@ def test_pool_size(scraper_config, scraper_config_dict):
     assert scraper_config.pool_size == scraper_config_dict["pool_size"]
 
 
+def test_browser(scraper_config, scraper_config_dict):
+    assert scraper_config.browser == scraper_config_dict["browser"]
+
+
+def test_engine(scraper_config, scraper_config_dict):
+    assert scraper_config.engine == scraper_config_dict["engine"]
+
+
+def test_max_connections_per_host(scraper_config, scraper_config_dict):
+    assert (
+        scraper_config.max_connections_per_host
+        == scraper_config_dict["max_connections_per_host"]
+    )
+
+
+def test_block(scraper_config, scraper_config_dict):
+    assert scraper_config.block == scraper_config_dict["block"]
+
+
+def test_cache(scraper_config, scraper_config_dict):
+    assert scraper_config.cache == scraper_config_dict["cache"]
+
+
+def test_proxies(scraper_config, scraper_config_dict):
+    assert scraper_config.proxies == scraper_config_dict["proxies"]
+
+
+def test_proxies_file(scraper_config, scraper_config_dict):
+    assert str(scraper_config.proxies_file) == scraper_config_dict["proxies_file"]
+
+
+def test_proxy_pool(scraper_config, scraper_config_dict):
+    assert scraper_config.proxy_pool == scraper_config_dict["proxy_pool"]
+
+
+def test_storage_state(scraper_config, scraper_config_dict):
+    assert scraper_config.storage_state == scraper_config_dict["storage_state"]
+
+
 def test_is_proxy_availible(scraper_config):
     assert scraper_config.is_proxy_available == True
 
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from octoscrape.browser_manager import PagePool
+from octoscrape.config import ScraperConfig
+from octoscrape.fetch import BrowserFetcher, FetchResponse
+from octoscrape.fetch.http_fetcher import proxy_url
+
+
+def test_response_text_and_json():
+    response = FetchResponse(
+        "https://a.com",
+        200,
+        {"content-type": "application/json; charset=latin-1"},
+        '{"name": "caf\xe9"}'.encode("latin-1"),
+    )
+    assert response.ok
+    assert response.text() == '{"name": "caf\xe9"}'
+    assert response.json() == {"name": "caf\xe9"}
+    assert not FetchResponse("https://a.com", 404, {}, b"").ok
+
+
+def test_proxy_url():
+    assert proxy_url({"server": "http://proxy:8080"}) == "http://proxy:8080"
+    assert proxy_url({"server": "proxy:8080"}) == "http://proxy:8080"
+    assert (
+        proxy_url({"server": "socks5://p:1", "username": "u@x", "password": "p:w"})
+        == "socks5://u%40x:p%3Aw@p:1"
+    )
+
+
+class FakeResponse:
+    url = "https://a.com/final"
+    status = 200
+    headers = {"content-type": "text/html; charset=iso-8859-1", "x": "1"}
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+        self.visited = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url):
+        self.visited.append(url)
+        return FakeResponse()
+
+    async def unroute_all(self, behavior=None): ...
+
+    async def set_extra_http_headers(self, headers): ...
+
+    async def content(self):
+        return "<html>\xe9</html>"
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    def on(self, event, handler): ...
+
+    async def new_page(self):
+        self.pages.append(FakePage(self))
+        return self.pages[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_browser_fetcher():
+    context = FakeContext()
+    async with BrowserFetcher(context, owns_context=True) as fetcher:
+        response = await fetcher.fetch("https://a.com")
+
+    assert response.url == "https://a.com/final"
+    assert response.headers["x"] == "1"
+    assert response.text() == "<html>\xe9</html>"
+    assert context.pages[0].closed
+    assert context.closed
+
+
+@pytest.mark.asyncio
+async def test_browser_fetcher_reuses_pooled_page():
+    context = FakeContext()
+    async with BrowserFetcher(context, pages=PagePool(size=1)) as fetcher:
+        await fetcher.fetch("https://a.com/1")
+        await fetcher.fetch("https://a.com/2")
+
+    [page] = context.pages
+    assert page.visited == [
+        "https://a.com/1",
+        "about:blank",
+        "https://a.com/2",
+        "about:blank",
+    ]
+    assert not page.closed
+
+
+@pytest.mark.asyncio
+async def test_http_fetcher():
+    httpx = pytest.importorskip("httpx")
+    from octoscrape.fetch import HttpFetcher
+
+    running = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return httpx.Response(200, json={"path": request.url.path})
+
+    config = ScraperConfig({"max_connections_per_host": 2})
+    fetcher = HttpFetcher(config, transport=httpx.MockTransport(handler))
+    responses = await asyncio.gather(
+        *(fetcher.fetch(f"https://a.com/{i}") for i in range(6))
+    )
+    await fetcher.close()
+
+    assert [r.json()["path"] for r in responses] == [f"/{i}" for i in range(6)]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_http_fetcher_reports_to_proxy_pool():
+    httpx = pytest.importorskip("httpx")
+    from octoscrape.fetch import HttpFetcher
+    from octoscrape.proxy import proxy_pool_for
+
+    async def handler(request):
+        return httpx.Response(429 if request.url.path == "/banned" else 200)
+
+    config = ScraperConfig({"proxies": ["http://a:1"], "proxy_pool": {"max_bans": 1}})
+    fetcher = HttpFetcher(config, transport=httpx.MockTransport(handler))
+    await fetcher.fetch("https://a.com/ok")
+    stats = proxy_pool_for(config).stats()[0]
+    assert (stats.uses, stats.state) == (1, "active")
+    assert stats.latency is not None
+
+    await fetcher.fetch("https://a.com/banned")
+    await fetcher.close()
+    assert proxy_pool_for(config).stats()[0].state == "evicted"
@@ -0,0 +1,34 @@
+import pytest
+
+from octoscrape.frontier import BloomFilter
+
+
+def test_no_false_negatives():
+    seen = BloomFilter(1000)
+
+    assert all(seen.add(f"http://example.com/{n}") for n in range(1000))
+    assert all(f"http://example.com/{n}" in seen for n in range(1000))
+    assert not seen.add("http://example.com/0")
+    assert len(seen) == 1000
+
+
+def test_false_positive_rate():
+    seen = BloomFilter(10_000, error_rate=0.01)
+    for n in range(10_000):
+        seen.add(f"http://example.com/{n}")
+
+    false_positives = sum(f"http://other.com/{n}" in seen for n in range(10_000))
+    assert false_positives < 200
+
+
+def test_sizing():
+    # about 1.8 bytes per URL at 0.1%
+    assert 17_000_000 < BloomFilter(10_000_000, error_rate=0.001).nbytes < 19_000_000
+    assert BloomFilter(1000, error_rate=0.01).nbytes < BloomFilter(1000).nbytes
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(1000, error_rate=1.0)
@@ -0,0 +1,42 @@
+import pytest
+
+from octoscrape.frontier import canonicalize_url, host_of
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTP://Example.COM", "http://example.com/"),
+        ("https://example.com:443/a#top", "https://example.com/a"),
+        ("http://example.com:8080/a", "http://example.com:8080/a"),
+        ("http://example.com/a/./b/../c", "http://example.com/a/c"),
+        ("http://example.com/a/..", "http://example.com/"),
+        ("http://example.com/%7euser/%2f", "http://example.com/~user/%2F"),
+        ("http://example.com/?b=2&a=1&a=0", "http://example.com/?a=0&a=1&b=2"),
+        ("http://example.com/?utm_source=x&fbclid=y&q=1", "http://example.com/?q=1"),
+        ("http://example.com/?", "http://example.com/"),
+        ("http://user@Example.com/", "http://user@example.com/"),
+        ("http://bücher.de/", "http://xn--bcher-kva.de/"),
+        ("http://[::1]:80/", "http://[::1]/"),
+        ("http://example.com./", "http://example.com/"),
+    ],
+)
+def test_canonicalize(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_drop_params():
+    url = "http://example.com/?session=1&q=1&utm_medium=x"
+    assert canonicalize_url(url, drop_params={"session"}) == "http://example.com/?q=1"
+
+
+def test_invalid_url():
+    with pytest.raises(ValueError):
+        canonicalize_url("/relative/path")
+    with pytest.raises(ValueError):
+        canonicalize_url("http://example.com:port/")
+
+
+def test_host_of():
+    assert host_of("https://Shop.Example.com:8443/a") == "shop.example.com"
+    assert host_of("/relative") == ""
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from octoscrape.concurrency import AsyncPool
+from octoscrape.frontier import UrlFrontier
+
+A = "http://a.com"
+B = "http://b.com"
+
+
+def drain(frontier):
+    urls = []
+    while (url := frontier.pop()) is not None:
+        urls.append(url)
+    return urls
+
+
+def test_duplicates_dropped():
+    frontier = UrlFrontier(capacity=1000)
+
+    assert frontier.add(f"{A}/x?b=1&a=2")
+    assert not frontier.add("HTTP://A.com:80/x?a=2&b=1#frag")
+    assert not frontier.add("not a url")
+    assert frontier.add_many([f"{A}/x", f"{A}/y", f"{A}/y"]) == 2
+
+    stats = frontier.stats()
+    assert (stats.queued, stats.hosts, stats.seen, stats.duplicates) == (3, 1, 3, 2)
+    assert len(frontier) == 3
+
+
+def test_hosts_take_turns():
+    frontier = UrlFrontier(delay=0.0)
+    frontier.add_many([f"{A}/1", f"{A}/2", f"{A}/3", f"{B}/1"])
+
+    assert drain(frontier) == [f"{A}/1", f"{B}/1", f"{A}/2", f"{A}/3"]
+    assert frontier.stats().hosts == 0
+
+
+def test_politeness_delay():
+    frontier = UrlFrontier(delay=0.05, host_delays={"b.com": 0.0})
+    frontier.add_many([f"{A}/1", f"{A}/2", f"{B}/1", f"{B}/2"])
+
+    assert drain(frontier) == [f"{A}/1", f"{B}/1", f"{B}/2"]
+    time.sleep(0.06)
+    assert drain(frontier) == [f"{A}/2"]
+
+
+def test_delay_applies_after_last_url():
+    frontier = UrlFrontier(delay=0.05)
+    frontier.add(f"{A}/1")
+    assert frontier.pop() == f"{A}/1"
+
+    frontier.add(f"{A}/2")
+    assert frontier.pop() is None
+    time.sleep(0.06)
+    assert frontier.pop() == f"{A}/2"
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_delay():
+    frontier = UrlFrontier(delay=0.05)
+    frontier.add_many([f"{A}/1", f"{A}/2"])
+
+    assert await frontier.get() == f"{A}/1"
+    started = time.monotonic()
+    assert await asyncio.wait_for(frontier.get(), 1) == f"{A}/2"
+    assert time.monotonic() - started >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_get_woken_by_add_and_close():
+    frontier = UrlFrontier()
+
+    waiting = asyncio.create_task(frontier.get())
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    frontier.add(f"{A}/1")
+    assert await asyncio.wait_for(waiting, 1) == f"{A}/1"
+
+    waiting = asyncio.create_task(frontier.get())
+    await asyncio.sleep(0.01)
+    frontier.close()
+    assert await asyncio.wait_for(waiting, 1) is None
+    with pytest.raises(RuntimeError):
+        frontier.add(f"{B}/1")
+
+
+@pytest.mark.asyncio
+async def test_feed_pool():
+    frontier = UrlFrontier(delay=0.0)
+    fetched = []
+
+    async def crawl(url):
+        fetched.append(url)
+        if url.endswith("/"):
+            frontier.add_many([f"{url}1", f"{url}2", f"{A}/"])
+
+    pool = AsyncPool(concurrency=2, max_queued=2)
+    pool.register_job("crawl", crawl)
+    await pool.start()
+
+    frontier.add_many([f"{A}/", f"{B}/"])
+    feeder = asyncio.create_task(frontier.feed(pool, "crawl"))
+    await asyncio.sleep(0.05)
+    frontier.close()
+    assert await asyncio.wait_for(feeder, 1) == 6
+
+    await pool.drain()
+    await pool.stop()
+    assert sorted(fetched) == [f"{A}/", f"{A}/1", f"{A}/2", f"{B}/", f"{B}/1", f"{B}/2"]
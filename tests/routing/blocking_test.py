@@ -0,0 +1,78 @@
+import pytest
+
+from octoscrape.config import ScraperConfig
+from octoscrape.routing import BlockingHandler, BlockRules, Router, router_for
+
+
+def test_rules_match():
+    rules = BlockRules(
+        resource_types=["image"],
+        urls=["*.mp4", "https://example.com/ads/*"],
+        domains=["doubleclick.net"],
+    )
+
+    assert rules.matches("https://example.com/a.png", "image")
+    assert rules.matches("https://cdn.example.com/v/clip.mp4", "media")
+    assert rules.matches("https://example.com/ads/x/banner.js", "script")
+    assert rules.matches("https://ad.g.doubleclick.net/pixel", "xhr")
+    assert rules.matches("https://DOUBLECLICK.net/", "script")
+    assert not rules.matches("https://notdoubleclick.net/", "script")
+    assert not rules.matches("https://example.com/", "document")
+
+
+def test_rules_from_config():
+    assert not BlockRules.from_config({})
+    rules = BlockRules.from_config({"domains": [".example.com"], "stub": ["script"]})
+    assert rules
+    assert rules.domains == {"example.com"}
+    assert rules.stub == {"script"}
+
+
+@pytest.mark.asyncio
+async def test_handler_aborts_and_stubs(make_request, make_route):
+    handler = BlockingHandler(
+        BlockRules(resource_types=["image", "script"], stub=["script"])
+    )
+
+    route = make_route()
+    assert await handler.handle(route, make_request("https://a.com/x.png", "image"))
+    assert route.outcome == "abort"
+
+    route = make_route()
+    assert await handler.handle(route, make_request("https://a.com/x.js", "script"))
+    assert route.outcome == "fulfill"
+    assert route.fulfilled["content_type"] == "application/javascript"
+
+    route = make_route()
+    assert not await handler.handle(route, make_request("https://a.com/", "document"))
+    assert route.outcome is None
+
+    stats = handler.stats()
+    assert stats.aborted == {"image": 1}
+    assert stats.stubbed == {"script": 1}
+    assert stats.total == 2
+
+
+@pytest.mark.asyncio
+async def test_router_chain(make_request, make_route, fake_context):
+    router = Router([BlockingHandler(BlockRules(resource_types=["font"]))])
+    await router.install(fake_context)
+
+    route = make_route()
+    await fake_context.handler(route, make_request("https://a.com/f.woff", "font"))
+    assert route.outcome == "abort"
+
+    route = make_route()
+    await fake_context.handler(route, make_request("https://a.com/", "document"))
+    assert route.outcome == "fallback"
+
+    assert router.get(BlockingHandler).stats().total == 1
+
+
+def test_router_for_config():
+    assert router_for(ScraperConfig({})) is None
+
+    config = ScraperConfig({"block": {"resource_types": ["image"]}})
+    router = router_for(config)
+    assert router is router_for(config)
+    assert router.get(BlockingHandler).rules.resource_types == {"image"}
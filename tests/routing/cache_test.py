@@ -0,0 +1,131 @@
+import pytest
+
+from octoscrape.routing import CacheHandler, ResponseCache
+from octoscrape.routing.cache import freshness
+
+URL = "https://example.com/app.js"
+
+
+def test_freshness():
+    assert freshness({"cache-control": "max-age=60"}, None) == 60
+    assert freshness({"cache-control": "public, s-maxage=30, max-age=60"}, None) == 30
+    assert freshness({"cache-control": "no-store"}, 100) is None
+    assert freshness({"cache-control": "no-cache"}, 100) == 0
+    assert freshness({"vary": "*"}, 100) is None
+    assert freshness({"vary": "Accept-Encoding"}, 100) == 100
+    assert freshness({"vary": "accept-encoding, Cookie"}, 100) is None
+    assert freshness({"cache-control": "private, max-age=60"}, None) is None
+    assert (
+        freshness({"set-cookie": "session=1", "cache-control": "max-age=60"}, None)
+        is None
+    )
+    assert freshness({}, 100) == 100
+    assert freshness({"etag": '"v1"'}, None) == 0
+    assert freshness({}, None) is None
+    assert freshness({"expires": "Thu, 01 Jan 1970 00:00:00 GMT"}, None) == 0
+
+
+def test_cache_store_and_dedup(tmp_path):
+    cache = ResponseCache(tmp_path)
+    headers = {"content-type": "text/javascript", "content-encoding": "gzip"}
+    cache.put("GET", URL, 200, headers, b"body", ttl=60)
+    cache.put("GET", URL + "?v=2", 200, headers, b"body", ttl=60)
+
+    cached = cache.get("GET", URL)
+    assert cached.body == b"body"
+    assert cached.headers == {"content-type": "text/javascript"}
+    assert cache.get("GET", "https://example.com/other.js") is None
+
+    # both URLs share one stored body
+    assert cache.size == 4
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2  # one dir, one file
+
+
+def test_cache_same_body_stored_again(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.put("GET", URL, 200, {}, b"body", ttl=60)
+    cache.put("GET", URL, 200, {}, b"body", ttl=60)
+
+    assert cache.get("GET", URL).body == b"body"
+    assert cache.size == 4
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path, max_size=10)
+    cache.put("GET", "https://a/1", 200, {}, b"11111", ttl=60)
+    cache.put("GET", "https://a/2", 200, {}, b"22222", ttl=60)
+    cache.get("GET", "https://a/1")  # 1 is now more recent than 2
+    cache.put("GET", "https://a/3", 200, {}, b"33333", ttl=60)
+
+    assert cache.get("GET", "https://a/2") is None
+    assert cache.get("GET", "https://a/1") is not None
+    assert cache.get("GET", "https://a/3") is not None
+    assert cache.size == 10
+    assert cache.evicted == 1
+
+
+@pytest.mark.asyncio
+async def test_handler_hit_and_miss(tmp_path, server, make_request, make_response):
+    handler = CacheHandler(ResponseCache(tmp_path))
+    server.responses.append(
+        make_response(200, {"cache-control": "max-age=60"}, b"console.log(1)")
+    )
+
+    route = server.route()
+    assert await handler.handle(route, make_request(URL, "script"))
+    assert route.fulfilled["body"] == b"console.log(1)"
+
+    route = server.route()
+    assert await handler.handle(route, make_request(URL, "script"))
+    assert route.fulfilled["body"] == b"console.log(1)"
+    assert len(server.requests) == 1
+
+    stats = handler.stats()
+    assert (stats.hits, stats.misses, stats.stored) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_handler_revalidates(tmp_path, server, make_request, make_response):
+    handler = CacheHandler(ResponseCache(tmp_path))
+    server.responses.append(make_response(200, {"etag": '"v1"'}, b"data"))
+    server.responses.append(make_response(304, {}))
+
+    await handler.handle(server.route(), make_request(URL, "script"))
+    route = server.route()
+    await handler.handle(route, make_request(URL, "script"))
+
+    assert server.requests[1]["if-none-match"] == '"v1"'
+    assert route.fulfilled["body"] == b"data"
+    assert handler.stats().revalidated == 1
+
+
+@pytest.mark.asyncio
+async def test_handler_skips(tmp_path, server, make_request, make_response):
+    handler = CacheHandler(ResponseCache(tmp_path))
+
+    request = make_request(URL, "script", method="POST")
+    assert not await handler.handle(server.route(), request)
+    assert not await handler.handle(server.route(), make_request(URL, "document"))
+
+    server.responses.append(make_response(200, {"cache-control": "no-store"}, b"x"))
+    await handler.handle(server.route(), make_request(URL, "script"))
+    assert handler.stats().stored == 0
+
+
+@pytest.mark.asyncio
+async def test_handler_skips_private_requests(
+    tmp_path, server, make_request, make_response
+):
+    handler = CacheHandler(ResponseCache(tmp_path))
+
+    for headers in ({"cookie": "session=1"}, {"authorization": "Bearer t"}):
+        server.responses.append(
+            make_response(200, {"cache-control": "max-age=60"}, b"x")
+        )
+        route = server.route()
+        assert await handler.handle(route, make_request(URL, "script", headers=headers))
+        assert route.fulfilled["body"] == b"x"
+
+    assert handler.stats().stored == 0
+    assert handler.cache.get("GET", URL) is None
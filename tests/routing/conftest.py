@@ -0,0 +1,89 @@
+import pytest
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="document", method="GET", headers=None):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+        self.headers = headers or {}
+
+    async def all_headers(self):
+        return self.headers
+
+
+class FakeRoute:
+    def __init__(self):
+        self.outcome = None
+        self.fulfilled = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def fulfill(self, **kwargs):
+        self.outcome = "fulfill"
+        self.fulfilled = kwargs
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+@pytest.fixture(scope="function")
+def make_request():
+    return FakeRequest
+
+
+@pytest.fixture(scope="function")
+def make_route():
+    return FakeRoute
+
+
+@pytest.fixture(scope="function")
+def fake_context():
+    return FakeContext()
+
+
+class FakeResponse:
+    def __init__(self, status=200, headers=None, body=b""):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeServer:
+    """Answers route.fetch() with queued responses and records request headers."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+
+    def route(self):
+        server = self
+
+        class ServerRoute(FakeRoute):
+            async def fetch(self, headers=None):
+                server.requests.append(headers or {})
+                return server.responses.pop(0)
+
+        return ServerRoute()
+
+
+@pytest.fixture(scope="function")
+def make_response():
+    return FakeResponse
+
+
+@pytest.fixture(scope="function")
+def server():
+    return FakeServer()
@@ -28,3 +28,18 @@ async def test_config_read(browser_manager, context_creator_scraper):
         size = page.viewport_size
         assert size["width"] == common_config.max_window_width
         assert size["height"] == common_config.max_window_height
+
+
+@pytest.mark.asyncio
+async def test_lease_context_reused(browser_manager, context_creator_scraper):
+    async with browser_manager.create_browser():
+        browser = browser_manager.browser
+        async with context_creator_scraper._lease_context(browser) as context1:
+            page = await context1.new_page()
+        async with context_creator_scraper._lease_context(browser) as context2:
+            assert context2 is context1
+            assert page.is_closed()
+            size = (await context2.new_page()).viewport_size
+            assert size["width"] == common_config.max_window_width
+
+        await context_creator_scraper._context_pool.close()
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from octoscrape import config
+from octoscrape.scraper import IAsyncScraper, ShardedMultiRunner
+from octoscrape.scraper.sharded import assign_shards
+
+SHARD_CONFIG = """
+common:
+  pool_size: 2
+  stop_timeout: 5
+scrapers:
+  A: {name: a, scraper: ShardScraper}
+  B: {name: b, scraper: ShardScraper}
+  C: {name: c, scraper: ShardScraper}
+"""
+
+
+class ShardScraper(IAsyncScraper):
+    """Runs until stopped; importable by the spawned shard processes."""
+
+    async def async_start(self):
+        self._is_stopped = False
+        while not self._is_stopped:
+            await asyncio.sleep(0.01)
+
+    async def async_stop(self):
+        self._is_stopped = True
+
+
+def wait_for_status(runner, expected, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while (status := runner.status()) != expected:
+        assert time.monotonic() < deadline, status
+        time.sleep(0.05)
+
+
+def test_assign_shards_round_robin():
+    routes = assign_shards(["c", "a", "d", "b", "e"], 2)
+    assert routes == {"a": 0, "b": 1, "c": 0, "d": 1, "e": 0}
+
+
+def test_assign_shards_more_shards_than_keys():
+    routes = assign_shards(["a", "b"], 4)
+    assert routes == {"a": 0, "b": 1}
+
+
+def test_sharded_runner_validation():
+    with pytest.raises(ValueError):
+        ShardedMultiRunner(0)
+
+
+def test_sharded_runner_not_started():
+    runner = ShardedMultiRunner(2)
+    assert not runner.is_started
+
+    with pytest.raises(RuntimeError, match="was not started"):
+        runner.run_scrapers()
+    with pytest.raises(RuntimeError, match="was not started"):
+        runner.stop()
+
+
+@pytest.fixture
+def shard_config(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text(SHARD_CONFIG)
+    # restored after the test, as load_config() replaces them
+    monkeypatch.setenv(config.CONFIG_ENV, str(path))
+    for name in ("raw_config", "common_config", "scrappers_configs"):
+        monkeypatch.delitem(vars(config), name, raising=False)
+    config.load_config(path)
+
+
+def test_sharded_runner_processes(shard_config):
+    runner = ShardedMultiRunner(2)
+    runner.register([ShardScraper])
+    runner.start()
+    try:
+        assert runner.is_started
+
+        runner.run_scrapers()
+        wait_for_status(runner, {"A": True, "B": True, "C": True})
+
+        runner.stop_scrapers(["B"])
+        wait_for_status(runner, {"A": True, "B": False, "C": True})
+    finally:
+        runner.stop()
+
+    assert not runner.is_started